@@ -12,8 +12,9 @@ import confuse
 
 # project
 from src.chia_log.handlers.daily_stats.stats_manager import StatsManager
-from src.chia_log.log_consumer import create_log_consumer_from_config
+from src.chia_log.log_consumer import create_log_consumer_from_config, get_log_source_services
 from src.chia_log.log_handler import LogHandler
+from src.chia_log.queued_log_consumer import create_queued_log_consumer_from_config
 from src.util import is_win_platform
 from src.notifier.keep_alive_monitor import KeepAliveMonitor
 from src.notifier.notify_manager import NotifyManager
@@ -57,12 +58,18 @@ def init(config: confuse.core.Configuration):
 
     # Create log consumer based on provided configuration
     chia_logs_config = config["chia_logs"]
-    log_consumer = create_log_consumer_from_config(chia_logs_config)
+    state_dir = config["state_dir"].get()
+    log_consumer = create_log_consumer_from_config(
+        chia_logs_config, state_dir=Path(state_dir) if state_dir is not None else None
+    )
     if log_consumer is None:
         exit(0)
 
+    # Handlers process the logs on their own thread so that slow notifications don't hold up reading
+    log_consumer = create_queued_log_consumer_from_config(config["handler_queue"], log_consumer)
+
     # Keep a reference here so we can stop the thread
-    keep_alive_monitor = KeepAliveMonitor(config=config)
+    keep_alive_monitor = KeepAliveMonitor(config=config, sources=get_log_source_services(chia_logs_config))
 
     # Notify manager is responsible for the lifecycle of all notifiers
     notify_manager = NotifyManager(config=config, keep_alive_monitor=keep_alive_monitor)
@@ -80,6 +87,7 @@ def init(config: confuse.core.Configuration):
             log_consumer.stop()
             keep_alive_monitor.stop()
             stats_manager.stop()
+            notify_manager.stop()
             exit(0)
 
     signal.signal(signal.SIGINT, interrupt)
@@ -0,0 +1,74 @@
+"""Bulk analysis of historical chia logs.
+
+Chia rotates its debug.log into debug.log.1 ... debug.log.7 which easily add
+up to several GB. Instead of going through the line-by-line pipeline, files
+are memory-mapped, only the lines of the relevant loggers are decoded and
+parsed straight into columns which the stat accumulators summarize in bulk.
+
+Usage:
+    python -m src.chia_log.backfill ~/.chia/mainnet/log/debug.log*
+"""
+
+# std
+import argparse
+import re
+from pathlib import Path
+from typing import Iterable, List
+
+# project
+from .handlers.daily_stats import HarvesterActivityConsumer, StatAccumulator
+from .handlers.daily_stats.stat_accumulators.eligible_plots_stats import EligiblePlotsStats
+from .handlers.daily_stats.stat_accumulators.found_proof_stats import FoundProofStats
+from .handlers.daily_stats.stat_accumulators.number_plots_stats import NumberPlotsStats
+from .handlers.daily_stats.stat_accumulators.search_time_stats import SearchTimeStats
+from .mmap_log_reader import MmapLogReader
+from .parsers.harvester_activity_parser import HarvesterActivityColumns, HarvesterActivityParser
+
+
+def sort_rotated_logs(paths: Iterable[Path]) -> List[Path]:
+    """Order debug.log, debug.log.1, ... debug.log.7 from oldest to newest"""
+
+    def rotation_index(path: Path) -> int:
+        match = re.search(r"\.([0-9]+)$", path.name)
+        return int(match[1]) if match else 0
+
+    return sorted(paths, key=rotation_index, reverse=True)
+
+
+def backfill_harvester_activity(paths: Iterable[Path]) -> HarvesterActivityColumns:
+    """Parse the harvester activity from all given log files
+
+    :param paths: Log files in chronological order
+    :returns: Harvester activity of all files
+    """
+    parser = HarvesterActivityParser()
+    columns = HarvesterActivityColumns()
+    for path in paths:
+        with MmapLogReader(path) as reader:
+            for logs in reader.lines(parser.loggers):
+                columns.extend(parser.parse_columns(logs))
+
+    return columns
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize harvester activity from historical chia logs.")
+    parser.add_argument("paths", type=Path, nargs="+", help="debug.log files, rotated ones included")
+    args = parser.parse_args()
+
+    columns = backfill_harvester_activity(sort_rotated_logs(args.paths))
+    print(f"Parsed {len(columns)} harvester activity messages")
+    stat_accumulators: List[StatAccumulator] = [
+        FoundProofStats(),
+        SearchTimeStats(),
+        NumberPlotsStats(),
+        EligiblePlotsStats(),
+    ]
+    for stat_acc in stat_accumulators:
+        if isinstance(stat_acc, HarvesterActivityConsumer):
+            stat_acc.consume_columns(columns)
+        print(stat_acc.get_summary())
+
+
+if __name__ == "__main__":
+    main()
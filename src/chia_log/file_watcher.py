@@ -0,0 +1,112 @@
+"""Event-driven file watching for the local log consumer.
+
+On Linux we talk to inotify directly through libc so that the consumer
+only wakes up when the chia log is written, created, moved or deleted.
+Other platforms (or restricted sandboxes) fall back to polling.
+"""
+
+# std
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+from pathlib import Path
+from typing import Optional
+
+# Flags from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+
+_EVENT_HEADER = struct.Struct("iIII")
+_FILE_EVENTS = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+_DIRECTORY_EVENTS = IN_DELETE_SELF | IN_MOVE_SELF
+
+
+def _load_libc() -> Optional[ctypes.CDLL]:
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    except OSError:
+        return None
+    if not hasattr(libc, "inotify_init1") or not hasattr(libc, "inotify_add_watch"):
+        return None
+    return libc
+
+
+_libc = _load_libc()
+
+
+class InotifyWatcher:
+    """Watch a single file for writes and rotations.
+
+    The parent directory is watched instead of the file itself. That way
+    a single watch descriptor keeps working across log rotations, and we are
+    notified as soon as a new file with the same name is created.
+    """
+
+    def __init__(self, file_path: Path):
+        if _libc is None:
+            raise OSError("inotify is not supported on this platform")
+
+        self._file_name = os.fsencode(file_path.name)
+        self._fd = _libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"inotify_init1 failed: {os.strerror(errno)}")
+
+        directory = os.fsencode(str(file_path.parent))
+        if _libc.inotify_add_watch(self._fd, directory, _FILE_EVENTS | _DIRECTORY_EVENTS) < 0:
+            errno = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(errno, f"inotify_add_watch failed for {file_path.parent}: {os.strerror(errno)}")
+
+    @staticmethod
+    def is_supported() -> bool:
+        return _libc is not None
+
+    def wait(self, timeout: float) -> bool:
+        """Block until the watched file changed or the timeout expired.
+
+        :param timeout: Maximum time to block in seconds
+        :returns: True if any event concerning the watched file was received
+        """
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return False
+
+        try:
+            buffer = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return False
+
+        relevant = False
+        position = 0
+        while position + _EVENT_HEADER.size <= len(buffer):
+            _, mask, _, name_length = _EVENT_HEADER.unpack_from(buffer, position)
+            position += _EVENT_HEADER.size
+            name_end = position + name_length
+            name = buffer[position:name_end].rstrip(b"\0")
+            position = name_end
+
+            if mask & (IN_Q_OVERFLOW | _DIRECTORY_EVENTS):
+                # Events may have been lost, let the caller check the file
+                relevant = True
+            elif name == self._file_name:
+                relevant = True
+
+        return relevant
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
@@ -8,7 +8,7 @@ conditions. It delegates the task to ConditionCheckers.
 
 # std
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import List, Optional, Tuple
 import logging
 
 # lib
@@ -16,6 +16,7 @@ from confuse import ConfigView
 
 # project
 from .daily_stats.stats_manager import StatsManager
+from ..log_record import LogRecord
 from src.notifier import Event
 
 
@@ -27,9 +28,17 @@ class LogHandlerInterface(ABC):
     def config_name() -> str:
         pass
 
+    @staticmethod
+    @abstractmethod
+    def loggers() -> List[Tuple[str, str]]:
+        """Service and module names (without the chia./src. package prefix)
+        of the log lines this handler is interested in
+        """
+        pass
+
     def __init__(self, config: ConfigView):
         logging.debug(f"Initializing handler: {self.config_name()}")
 
     @abstractmethod
-    def handle(self, logs: str, stats_manager: Optional[StatsManager] = None) -> List[Event]:
+    def handle(self, records: List[LogRecord], stats_manager: Optional[StatsManager] = None) -> List[Event]:
         pass
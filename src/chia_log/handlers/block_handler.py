@@ -1,10 +1,11 @@
 # std
 import logging
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 # project
 from . import LogHandlerInterface
 from ..parsers.block_parser import BlockParser
+from ..log_record import LogRecord
 from .condition_checkers import BlockConditionChecker
 from .condition_checkers.found_blocks import FoundBlocks
 from .daily_stats.stats_manager import StatsManager
@@ -21,18 +22,22 @@ class BlockHandler(LogHandlerInterface):
     def config_name() -> str:
         return "block_handler"
 
+    @staticmethod
+    def loggers() -> List[Tuple[str, str]]:
+        return BlockParser.loggers
+
     def __init__(self, config: Optional[dict] = None):
         super().__init__(config)
         self._parser = BlockParser()
         self._cond_checkers: List[BlockConditionChecker] = [FoundBlocks()]
 
-    def handle(self, logs: str, stats_manager: Optional[StatsManager] = None) -> List[Event]:
+    def handle(self, records: List[LogRecord], stats_manager: Optional[StatsManager] = None) -> List[Event]:
         """Process incoming logs, check all conditions
         and return a list of notable events.
         """
 
         events = []
-        activity_messages = self._parser.parse(logs)
+        activity_messages = self._parser.parse(records)
         if stats_manager:
             stats_manager.consume_block_messages(activity_messages)
 
@@ -49,6 +49,7 @@ class NonSkippedSignagePoints(FinishedSignageConditionChecker):
                 priority=EventPriority.NORMAL,
                 service=EventService.FULL_NODE,
                 message=message,
+                realtime_only=True,
             )
 
         self._last_signage_point_timestamp = obj.timestamp
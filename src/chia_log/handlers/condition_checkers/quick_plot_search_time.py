@@ -23,7 +23,11 @@ class QuickPlotSearchTime(HarvesterConditionChecker):
             message = f"Seeking plots took too long: {obj.search_time_seconds} seconds!"
             logging.warning(message)
             return Event(
-                type=EventType.USER, priority=EventPriority.NORMAL, service=EventService.HARVESTER, message=message
+                type=EventType.USER,
+                priority=EventPriority.NORMAL,
+                service=EventService.HARVESTER,
+                message=message,
+                realtime_only=True,
             )
 
         return None
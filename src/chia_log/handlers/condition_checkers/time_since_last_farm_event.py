@@ -39,7 +39,11 @@ class TimeSinceLastFarmEvent(HarvesterConditionChecker):
             )
             logging.warning(message)
             event = Event(
-                type=EventType.USER, priority=EventPriority.NORMAL, service=EventService.HARVESTER, message=message
+                type=EventType.USER,
+                priority=EventPriority.NORMAL,
+                service=EventService.HARVESTER,
+                message=message,
+                realtime_only=True,
             )
         elif seconds_since_last > self._info_threshold:
             # This threshold seems to be surpassed multiple times per day
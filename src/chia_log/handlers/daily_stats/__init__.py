@@ -3,7 +3,7 @@ from abc import ABC, abstractmethod
 
 # project
 from ...parsers.finished_signage_point_parser import FinishedSignagePointMessage
-from ...parsers.harvester_activity_parser import HarvesterActivityMessage
+from ...parsers.harvester_activity_parser import HarvesterActivityColumns, HarvesterActivityMessage
 from ...parsers.wallet_added_coin_parser import WalletAddedCoinMessage
 from ...parsers.partial_parser import PartialMessage
 from ...parsers.block_parser import BlockMessage
@@ -20,6 +20,11 @@ class HarvesterActivityConsumer(ABC):
     def consume(self, obj: HarvesterActivityMessage):
         pass
 
+    @abstractmethod
+    def consume_columns(self, columns: HarvesterActivityColumns):
+        """Same as consume() for many messages at once, used when backfilling from historical logs"""
+        pass
+
 
 class PartialConsumer(ABC):
     @abstractmethod
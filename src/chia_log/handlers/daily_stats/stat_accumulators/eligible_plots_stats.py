@@ -2,7 +2,7 @@
 from datetime import datetime
 
 # project
-from .. import HarvesterActivityConsumer, HarvesterActivityMessage, StatAccumulator
+from .. import HarvesterActivityColumns, HarvesterActivityConsumer, HarvesterActivityMessage, StatAccumulator
 
 
 class EligiblePlotsStats(HarvesterActivityConsumer, StatAccumulator):
@@ -20,6 +20,10 @@ class EligiblePlotsStats(HarvesterActivityConsumer, StatAccumulator):
         self._eligible_plots_total += obj.eligible_plots_count
         self._eligible_events_total += 1
 
+    def consume_columns(self, columns: HarvesterActivityColumns):
+        self._eligible_plots_total += sum(columns.eligible_plots_count)
+        self._eligible_events_total += len(columns)
+
     def get_summary(self) -> str:
         if self._eligible_events_total == 0:
             return "Eligible plots 🥇: None"
@@ -2,7 +2,7 @@
 from datetime import datetime
 
 # project
-from .. import HarvesterActivityConsumer, HarvesterActivityMessage, StatAccumulator
+from .. import HarvesterActivityColumns, HarvesterActivityConsumer, HarvesterActivityMessage, StatAccumulator
 
 
 class FoundProofStats(HarvesterActivityConsumer, StatAccumulator):
@@ -17,6 +17,9 @@ class FoundProofStats(HarvesterActivityConsumer, StatAccumulator):
     def consume(self, obj: HarvesterActivityMessage):
         self._found_proofs_total += obj.found_proofs_count
 
+    def consume_columns(self, columns: HarvesterActivityColumns):
+        self._found_proofs_total += sum(columns.found_proofs_count)
+
     def get_summary(self) -> str:
         if self._found_proofs_total == 0:
             return "Proofs 🧾: None"
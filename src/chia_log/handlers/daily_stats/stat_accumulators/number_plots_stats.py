@@ -2,7 +2,7 @@
 from datetime import datetime
 
 # project
-from .. import HarvesterActivityConsumer, HarvesterActivityMessage, StatAccumulator
+from .. import HarvesterActivityColumns, HarvesterActivityConsumer, HarvesterActivityMessage, StatAccumulator
 
 
 class NumberPlotsStats(HarvesterActivityConsumer, StatAccumulator):
@@ -21,6 +21,13 @@ class NumberPlotsStats(HarvesterActivityConsumer, StatAccumulator):
             self._initial_plot_count = obj.total_plots_count
         self._current_plot_count = obj.total_plots_count
 
+    def consume_columns(self, columns: HarvesterActivityColumns):
+        if len(columns) == 0:
+            return
+        if self._initial_plot_count == 0:
+            self._initial_plot_count = next((count for count in columns.total_plots_count if count), 0)
+        self._current_plot_count = columns.total_plots_count[-1]
+
     def get_summary(self) -> str:
         new_plots = self._current_plot_count - self._initial_plot_count
         if new_plots > 0:
@@ -2,7 +2,7 @@
 from datetime import datetime
 
 # project
-from .. import HarvesterActivityConsumer, HarvesterActivityMessage, StatAccumulator
+from .. import HarvesterActivityColumns, HarvesterActivityConsumer, HarvesterActivityMessage, StatAccumulator
 
 
 class SearchTimeStats(HarvesterActivityConsumer, StatAccumulator):
@@ -28,6 +28,17 @@ class SearchTimeStats(HarvesterActivityConsumer, StatAccumulator):
         if obj.search_time_seconds > 15:
             self._over_15_seconds += 1
 
+    def consume_columns(self, columns: HarvesterActivityColumns):
+        count = len(columns)
+        if count == 0:
+            return
+        total_time_seconds = self._avg_time_seconds * self._num_measurements + sum(columns.search_time_seconds)
+        self._num_measurements += count
+        self._avg_time_seconds = total_time_seconds / self._num_measurements
+        over_5_seconds = [time for time in columns.search_time_seconds if time > 5]
+        self._over_5_seconds += len(over_5_seconds)
+        self._over_15_seconds += sum(1 for time in over_5_seconds if time > 15)
+
     def get_summary(self) -> str:
         pct_over_5seconds: float = 0
         pct_over_15seconds: float = 0
@@ -1,10 +1,11 @@
 # std
 import logging
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 # project
 from . import LogHandlerInterface
 from ..parsers.finished_signage_point_parser import FinishedSignagePointParser
+from ..log_record import LogRecord
 from .condition_checkers import FinishedSignageConditionChecker
 from .condition_checkers.non_skipped_signage_points import NonSkippedSignagePoints
 from .daily_stats.stats_manager import StatsManager
@@ -21,18 +22,22 @@ class FinishedSignagePointHandler(LogHandlerInterface):
     def config_name() -> str:
         return "finished_signage_point_handler"
 
+    @staticmethod
+    def loggers() -> List[Tuple[str, str]]:
+        return FinishedSignagePointParser.loggers
+
     def __init__(self, config: Optional[dict] = None):
         super().__init__(config)
         self._parser = FinishedSignagePointParser()
         self._cond_checkers: List[FinishedSignageConditionChecker] = [NonSkippedSignagePoints()]
 
-    def handle(self, logs: str, stats_manager: Optional[StatsManager] = None) -> List[Event]:
+    def handle(self, records: List[LogRecord], stats_manager: Optional[StatsManager] = None) -> List[Event]:
         """Process incoming logs, check all conditions
         and return a list of notable events.
         """
 
         events = []
-        signage_point_messages = self._parser.parse(logs)
+        signage_point_messages = self._parser.parse(records)
         if stats_manager:
             stats_manager.consume_signage_point_messages(signage_point_messages)
 
@@ -1,10 +1,11 @@
 # std
 import logging
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 # project
 from . import LogHandlerInterface
 from ..parsers.harvester_activity_parser import HarvesterActivityParser
+from ..log_record import LogRecord
 from .condition_checkers import HarvesterConditionChecker
 from .condition_checkers.non_decreasing_plots import NonDecreasingPlots
 from .condition_checkers.quick_plot_search_time import QuickPlotSearchTime
@@ -24,6 +25,10 @@ class HarvesterActivityHandler(LogHandlerInterface):
     def config_name() -> str:
         return "harvester_activity_handler"
 
+    @staticmethod
+    def loggers() -> List[Tuple[str, str]]:
+        return HarvesterActivityParser.loggers
+
     def __init__(self, config: Optional[dict] = None):
         super().__init__(config)
         self._parser = HarvesterActivityParser()
@@ -33,13 +38,13 @@ class HarvesterActivityHandler(LogHandlerInterface):
             QuickPlotSearchTime(),
         ]
 
-    def handle(self, logs: str, stats_manager: Optional[StatsManager] = None) -> List[Event]:
+    def handle(self, records: List[LogRecord], stats_manager: Optional[StatsManager] = None) -> List[Event]:
         """Process incoming logs, check all conditions
         and return a list of notable events.
         """
 
         events = []
-        activity_messages = self._parser.parse(logs)
+        activity_messages = self._parser.parse(records)
         if stats_manager:
             stats_manager.consume_harvester_messages(activity_messages)
 
@@ -1,9 +1,10 @@
 # std
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 # project
 from . import LogHandlerInterface
 from ..parsers.partial_parser import PartialParser
+from ..log_record import LogRecord
 from .condition_checkers import PartialConditionChecker
 from .daily_stats.stats_manager import StatsManager
 from src.notifier import Event
@@ -19,18 +20,22 @@ class PartialHandler(LogHandlerInterface):
     def config_name() -> str:
         return "partial_handler"
 
+    @staticmethod
+    def loggers() -> List[Tuple[str, str]]:
+        return PartialParser.loggers
+
     def __init__(self, config: Optional[dict] = None):
         super().__init__(config)
         self._parser = PartialParser()
         self._cond_checkers: List[PartialConditionChecker] = []
 
-    def handle(self, logs: str, stats_manager: Optional[StatsManager] = None) -> List[Event]:
+    def handle(self, records: List[LogRecord], stats_manager: Optional[StatsManager] = None) -> List[Event]:
         """Process incoming logs, check all conditions
         and return a list of notable events.
         """
 
         events = []
-        activity_messages = self._parser.parse(logs)
+        activity_messages = self._parser.parse(records)
         if stats_manager:
             stats_manager.consume_partial_messages(activity_messages)
 
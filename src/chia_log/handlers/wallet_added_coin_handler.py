@@ -1,6 +1,6 @@
 # std
 import logging
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 # lib
 from confuse import ConfigView
@@ -8,6 +8,7 @@ from confuse import ConfigView
 # project
 from . import LogHandlerInterface
 from ..parsers.wallet_added_coin_parser import WalletAddedCoinParser
+from ..log_record import LogRecord
 from .daily_stats.stats_manager import StatsManager
 from src.notifier import Event, EventService, EventType, EventPriority
 
@@ -21,15 +22,19 @@ class WalletAddedCoinHandler(LogHandlerInterface):
     def config_name() -> str:
         return "wallet_added_coin_handler"
 
+    @staticmethod
+    def loggers() -> List[Tuple[str, str]]:
+        return WalletAddedCoinParser.loggers
+
     def __init__(self, config: ConfigView):
         super().__init__(config)
         self._parser = WalletAddedCoinParser()
         self.min_mojos_amount = config["min_mojos_amount"].get(int)
         logging.info(f"Filtering transaction with mojos less than {self.min_mojos_amount}")
 
-    def handle(self, logs: str, stats_manager: Optional[StatsManager] = None) -> List[Event]:
+    def handle(self, records: List[LogRecord], stats_manager: Optional[StatsManager] = None) -> List[Event]:
         events = []
-        added_coin_messages = self._parser.parse(logs)
+        added_coin_messages = self._parser.parse(records)
         if stats_manager:
             stats_manager.consume_wallet_messages(added_coin_messages)
 
@@ -1,7 +1,7 @@
 # std
 import datetime
 import logging
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 # lib
 from confuse import ConfigView
@@ -9,6 +9,7 @@ from confuse import ConfigView
 # project
 from . import LogHandlerInterface
 from ..parsers.wallet_peak_parser import WalletPeakParser
+from ..log_record import LogRecord
 from .daily_stats.stats_manager import StatsManager
 from src.notifier import Event, EventService, EventType, EventPriority
 
@@ -22,15 +23,19 @@ class WalletPeakHandler(LogHandlerInterface):
     def config_name() -> str:
         return "wallet_peak_handler"
 
+    @staticmethod
+    def loggers() -> List[Tuple[str, str]]:
+        return WalletPeakParser.loggers
+
     def __init__(self, config: ConfigView):
         super().__init__(config)
         self._parser = WalletPeakParser()
         self.max_drift = config["max_drift_seconds"].get(int)
         logging.info(f"Allowing wallet processing drift of {self.max_drift}s.")
 
-    def handle(self, logs: str, stats_manager: Optional[StatsManager] = None) -> List[Event]:
+    def handle(self, records: List[LogRecord], stats_manager: Optional[StatsManager] = None) -> List[Event]:
         events = []
-        peak_messages = self._parser.parse(logs)
+        peak_messages = self._parser.parse(records)
 
         for peak in peak_messages:
             drift = peak.log_time - peak.peak_time
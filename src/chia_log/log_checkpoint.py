@@ -0,0 +1,136 @@
+"""Persistent position of a log consumer in the log file.
+
+The checkpoint lets chiadog continue where it stopped after a restart (or
+crash) instead of skipping everything that was logged in between. Besides
+the byte offset it identifies the file by its inode and a fingerprint of
+its first bytes, so that a rotated (renamed) or replaced file is detected.
+"""
+
+# std
+import hashlib
+import json
+import logging
+import os
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from time import monotonic
+from typing import BinaryIO, Optional
+
+# Chia log lines start with a timestamp, so the head of the file tells files apart
+FINGERPRINT_SIZE = 1024
+
+
+def fingerprint(f: BinaryIO, size: int = FINGERPRINT_SIZE) -> str:
+    """Hash the first bytes of a file without moving its position"""
+    position = f.tell()
+    try:
+        f.seek(0)
+        return fingerprint_bytes(f.read(size))
+    finally:
+        f.seek(position)
+
+
+def fingerprint_bytes(head: bytes) -> str:
+    """Hash the first bytes of a file that were read already"""
+    return hashlib.sha256(head).hexdigest()
+
+
+@dataclass
+class LogCheckpoint:
+    """All complete lines before the offset have been consumed"""
+
+    inode: int
+    offset: int
+    fingerprint: str
+    # Number of bytes the fingerprint was taken of, fewer for young files
+    fingerprint_size: int
+
+    @staticmethod
+    def of(f: BinaryIO, offset: int) -> "LogCheckpoint":
+        file_stat = os.fstat(f.fileno())
+        fingerprint_size = min(file_stat.st_size, FINGERPRINT_SIZE)
+        return LogCheckpoint(
+            inode=file_stat.st_ino,
+            offset=offset,
+            fingerprint=fingerprint(f, fingerprint_size),
+            fingerprint_size=fingerprint_size,
+        )
+
+    def matches(self, f: BinaryIO) -> bool:
+        """Whether the checkpoint was taken of this file (possibly since renamed)"""
+        file_stat = os.fstat(f.fileno())
+        return (
+            file_stat.st_ino == self.inode
+            and file_stat.st_size >= self.offset
+            and fingerprint(f, self.fingerprint_size) == self.fingerprint
+        )
+
+
+class LogCheckpointStore:
+    """Saves checkpoints to a file in the state directory
+
+    Consumers update the checkpoint after every batch but it's only written
+    to disk every few seconds. Each write goes to a temporary file which is
+    synced and then renamed over the previous one, so a crash leaves either
+    the old or the new checkpoint behind, never a partial one. After a crash
+    at most the last few seconds of logs are consumed again.
+    """
+
+    flush_interval_seconds = 5
+
+    def __init__(self, path: Path):
+        self._path = path
+        self._checkpoint: Optional[LogCheckpoint] = None
+        self._is_dirty = False
+        self._last_flush_time = monotonic()
+
+    def load(self) -> Optional[LogCheckpoint]:
+        try:
+            with open(self._path, encoding="UTF-8") as f:
+                self._checkpoint = LogCheckpoint(**json.load(f))
+        except FileNotFoundError:
+            return None
+        except (ValueError, TypeError) as e:
+            logging.warning(f"Ignoring invalid checkpoint {self._path}: {e}")
+            return None
+
+        return self._checkpoint
+
+    def update(self, checkpoint: LogCheckpoint):
+        self._checkpoint = checkpoint
+        self._is_dirty = True
+        self.flush_if_due()
+
+    def flush_if_due(self):
+        if monotonic() - self._last_flush_time >= self.flush_interval_seconds:
+            self.flush()
+
+    def flush(self):
+        if not self._is_dirty or self._checkpoint is None:
+            return
+
+        temp_path = self._path.with_name(self._path.name + ".tmp")
+        try:
+            with open(temp_path, "w", encoding="UTF-8") as f:
+                json.dump(asdict(self._checkpoint), f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self._path)
+            self._sync_directory()
+        except OSError as e:
+            logging.warning(f"Failed to save checkpoint {self._path}: {e}")
+            return
+        finally:
+            self._last_flush_time = monotonic()
+
+        self._is_dirty = False
+
+    def _sync_directory(self):
+        # Persist the rename itself, not supported on Windows
+        if not hasattr(os, "O_DIRECTORY"):
+            return
+        fd = os.open(self._path.parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
@@ -7,22 +7,36 @@ The latter has not been implemented yet. Feel free to add it.
 """
 
 # std
+import asyncio
+import base64
+import hashlib
+import shlex
 import logging
+import os
 from abc import ABC, abstractmethod
+from concurrent.futures import Future
+from dataclasses import replace
+from datetime import datetime
+from functools import partial
 from pathlib import Path, PurePosixPath, PureWindowsPath, PurePath
 from tempfile import mkdtemp
-from threading import Thread
-from time import sleep
-from typing import List, Tuple
+from threading import Event, Lock, Thread
+from time import monotonic, sleep
+from typing import BinaryIO, Dict, Iterable, List, Optional, Tuple
 
 # project
-from src.util import OS
+from src.chia_log.file_watcher import InotifyWatcher
+from src.chia_log.log_checkpoint import FINGERPRINT_SIZE, LogCheckpoint, LogCheckpointStore, fingerprint_bytes
+from src.chia_log.log_record import LogRecord, parse_log_records
+from src.chia_log.mmap_log_reader import MmapLogReader
+from src.chia_log.network_event_loop import NetworkEventLoop
+from src.chia_log.ssh_session import SshSession, SshSessionManager, SshSessionState
+from src.util import OS, prepare_state_dir
 
 # lib
 import paramiko
 import confuse
 from confuse import ConfigView
-from paramiko.channel import ChannelStdinFile, ChannelStderrFile, ChannelFile
 from pygtail import Pygtail  # type: ignore
 from retry import retry
 
@@ -31,6 +45,7 @@ from retry import retry
 file_log_consumer_template = {
     "enable": bool,
     "file_path": confuse.Path(),
+    "watch_mode": confuse.Choice(["auto", "inotify", "polling"], default="auto"),
 }
 network_log_consumer_template = {
     "enable": bool,
@@ -38,6 +53,23 @@ network_log_consumer_template = {
     "remote_host": str,
     "remote_user": str,
     "remote_port": int,
+    "remote_filter": confuse.TypeTemplate(bool, default=False),
+    "compression": confuse.TypeTemplate(bool, default=False),
+}
+sftp_log_consumer_template = {
+    "enable": bool,
+    # Paths on the remote host are never expanded locally
+    "remote_file_path": str,
+    "remote_host": str,
+    "remote_user": str,
+    "remote_port": int,
+    "compression": confuse.TypeTemplate(bool, default=False),
+}
+# Entries of the 'sources' list are always enabled
+log_consumer_templates = {
+    "file_log_consumer": {key: value for key, value in file_log_consumer_template.items() if key != "enable"},
+    "network_log_consumer": {key: value for key, value in network_log_consumer_template.items() if key != "enable"},
+    "sftp_log_consumer": {key: value for key, value in sftp_log_consumer_template.items() if key != "enable"},
 }
 
 
@@ -45,16 +77,44 @@ class LogConsumerSubscriber(ABC):
     """Interface for log consumer subscribers (i.e. handlers)"""
 
     @abstractmethod
-    def consume_logs(self, logs: str):
-        """This method will be called when new logs are available"""
+    def consume_logs(self, records: List[LogRecord]):
+        """This method will be called when new logs are available
+
+        :param records: One or more log records (a batch)
+        """
         pass
 
+    def loggers(self) -> Optional[List[Tuple[str, str]]]:
+        """Loggers (pairs of service and module) whose records are consumed
+
+        Consumers may use this to skip the logs of everything else early.
+        None means that the subscriber is interested in all logs.
+        """
+        return None
+
 
 class LogConsumer(ABC):
-    """Abstract class providing common interface for log consumers"""
+    """Abstract class providing common interface for log consumers
+
+    Consumers deliver logs in batches: everything that is available in one
+    read is tokenized into log records once and passed to the subscribers
+    together. Batches are bounded in size so that a busy log doesn't delay
+    the handlers.
+
+    After a restart, consumers that know where they stopped first catch up
+    with the backlog of logs as fast as possible. Subscribers can check
+    is_catching_up to tell historical logs from live ones.
+    """
+
+    # Upper bound for the size of a single batch
+    max_batch_bytes = 256 * 1024
 
     def __init__(self):
         self._subscribers: List[LogConsumerSubscriber] = []
+        self._has_subscribers = Event()
+        self._is_catching_up = False
+        self._catch_up_start_time = 0.0
+        self._last_timestamp: Optional[datetime] = None
 
     @abstractmethod
     def stop(self):
@@ -62,20 +122,129 @@ class LogConsumer(ABC):
 
     def subscribe(self, subscriber: LogConsumerSubscriber):
         self._subscribers.append(subscriber)
+        self._has_subscribers.set()
+
+    @property
+    def is_catching_up(self) -> bool:
+        """Whether the logs currently delivered were written while chiadog wasn't running"""
+        return self._is_catching_up
+
+    @property
+    def lag_seconds(self) -> Optional[float]:
+        """Age of the newest log record delivered so far, None before the first one"""
+        last_timestamp = self._last_timestamp
+        if last_timestamp is None:
+            return None
+        return max(0.0, (datetime.now(last_timestamp.tzinfo) - last_timestamp).total_seconds())
+
+    @property
+    def lag_bytes(self) -> Optional[int]:
+        """Size of the logs that have been written but not delivered yet, None if unknown"""
+        return None
+
+    def _start_catch_up(self, backlog_bytes: Optional[int] = None):
+        self._is_catching_up = True
+        self._catch_up_start_time = monotonic()
+        backlog = f"{backlog_bytes / 2**20:.1f} MiB of " if backlog_bytes is not None else ""
+        logging.info(f"Catching up with {backlog}logs written while chiadog wasn't running")
+
+    def _finish_catch_up(self):
+        self._is_catching_up = False
+        logging.info(f"Caught up with the logs in {monotonic() - self._catch_up_start_time:.1f} seconds")
 
-    def _notify_subscribers(self, logs: str):
+    def ingest_file(self, path: Path, offset: int = 0):
+        """Feed a whole log file (e.g. a rotated debug.log.1) to the subscribers
+
+        The file is memory-mapped and only the lines of loggers that some
+        subscriber consumes are decoded.
+
+        :param path: Log file
+        :param offset: Byte offset to start at, must be at the beginning of a line
+        """
+        logging.debug(f"Ingesting {path} from byte offset {offset}")
+        with MmapLogReader(path.expanduser(), offset) as reader:
+            for logs in reader.lines(self._loggers()):
+                self._notify_subscribers(logs)
+
+    def _loggers(self) -> Optional[List[Tuple[str, str]]]:
+        """Loggers consumed by any of the subscribers, None if some subscriber consumes everything"""
+        loggers: List[Tuple[str, str]] = []
         for subscriber in self._subscribers:
-            subscriber.consume_logs(logs)
+            subscriber_loggers = subscriber.loggers()
+            if subscriber_loggers is None:
+                return None
+            loggers.extend(subscriber_loggers)
+        return loggers
+
+    def _notify_subscribers(self, logs: str, offset: Optional[int] = None):
+        records = parse_log_records(logs, offset)
+        if not records:
+            return
+        self._last_timestamp = records[-1].timestamp
+        for subscriber in self._subscribers:
+            subscriber.consume_logs(records)
+
+    def _notify_subscribers_batched(self, log_lines: Iterable[str]):
+        """Join log lines to batches of at most max_batch_bytes and
+        notify subscribers once per batch.
+        """
+        batch: List[str] = []
+        batch_size = 0
+        for log_line in log_lines:
+            batch.append(log_line)
+            batch_size += len(log_line)
+            if batch_size >= self.max_batch_bytes:
+                self._notify_subscribers("".join(batch))
+                batch = []
+                batch_size = 0
+        if batch:
+            self._notify_subscribers("".join(batch))
 
 
 class FileLogConsumer(LogConsumer):
-    def __init__(self, log_path: Path):
+    """Follow a local log file.
+
+    On Linux the consumer is woken up by inotify whenever the log file is
+    written or rotated and keeps a single file handle open between reads.
+    Everywhere else it falls back to polling the file once per second.
+
+    With a state directory, the position in the log file is persisted and
+    consumption continues from there after a restart, including the part
+    of the last file that was rotated away in between. Without one (or on
+    the first start), only logs written from now on are consumed.
+    """
+
+    def __init__(self, log_path: Path, watch_mode: str = "auto", state_dir: Optional[Path] = None):
         super().__init__()
-        self._expanded_log_path = str(log_path.expanduser())
-        self._offset_path = mkdtemp() / Path("debug.log.offset")
-        logging.debug(f"Using temporary directory {self._offset_path} for FileLogConsumer")
+        self._log_path = log_path.expanduser()
+        self._expanded_log_path = str(self._log_path)
+        self._use_inotify = watch_mode != "polling" and InotifyWatcher.is_supported()
+        if watch_mode == "inotify" and not self._use_inotify:
+            logging.warning("inotify is not supported on this platform, falling back to polling the log file")
+        logging.debug(f"Following {self._expanded_log_path} using {'inotify' if self._use_inotify else 'polling'}")
+
+        self._checkpoint_store: Optional[LogCheckpointStore] = None
+        # Where Pygtail keeps its offset when polling
+        self._offset_path: Optional[Path] = None
+        self._state_dir = prepare_state_dir(state_dir, "logs will be consumed from the end")
+        if self._state_dir is not None:
+            # Separate state for each followed log file
+            state_name = f"{self._log_path.name}-{hashlib.sha1(self._expanded_log_path.encode()).hexdigest()[:8]}"
+            self._offset_path = self._state_dir / f"{state_name}.offset"
+            self._checkpoint_store = LogCheckpointStore(self._state_dir / f"{state_name}.checkpoint")
+        elif not self._use_inotify:
+            self._offset_path = mkdtemp() / Path("debug.log.offset")
+        if self._offset_path is not None:
+            logging.debug(f"Using {self._offset_path.parent} for the state of FileLogConsumer")
+        self._log_file: Optional[BinaryIO] = None
+        # Last checkpoint of the open log file
+        self._checkpoint: Optional[LogCheckpoint] = None
+        self._partial_line = b""
+        # Offset in the log file after the last line delivered to the subscribers
+        self._consumed_offset = 0
+
         self._is_running = True
-        self._thread = Thread(target=self._consume_loop)
+        self._thread = Thread(target=self._watch_loop if self._use_inotify else self._consume_loop)
         self._thread.start()
         self._log_size = 0
 
@@ -83,124 +252,842 @@ class FileLogConsumer(LogConsumer):
         logging.info("Stopping")
 
         # Cleanup the temporary file
-        if self._offset_path.exists():
+        if self._state_dir is None and self._offset_path is not None and self._offset_path.exists():
             logging.debug(f"Deleting {self._offset_path}")
             self._offset_path.unlink()
 
         self._is_running = False
+        self._has_subscribers.set()
+
+    def _wait_for_subscribers(self) -> bool:
+        """Don't consume anything before there is someone to deliver it to
+
+        :returns: False if stopped while waiting
+        """
+        self._has_subscribers.wait()
+        return self._is_running
+
+    @property
+    def lag_bytes(self) -> Optional[int]:
+        log_file = self._log_file
+        if log_file is None:
+            # Pygtail doesn't tell
+            return None
+        try:
+            return max(0, os.fstat(log_file.fileno()).st_size - self._consumed_offset)
+        except (OSError, ValueError):
+            # Closed in between
+            return None
 
     @retry((FileNotFoundError, PermissionError), delay=2)
     def _consume_loop(self):
+        if not self._wait_for_subscribers():
+            return
+        assert self._offset_path is not None
+        # Pygtail continues from the persisted offset, everything until there is a backlog
+        if self._offset_path.exists() and not self._is_catching_up:
+            self._start_catch_up()
         while self._is_running:
-            sleep(1)  # throttle polling for new logs
-            for log_line in Pygtail(self._expanded_log_path, read_from_end=True, offset_file=self._offset_path):
-                self._notify_subscribers(log_line)
+            if not self._is_catching_up:
+                sleep(1)  # throttle polling for new logs
+            # Pygtail persists the offset (and follows rotation) on its own
+            self._notify_subscribers_batched(
+                Pygtail(self._expanded_log_path, read_from_end=True, offset_file=self._offset_path)
+            )
+            if self._is_catching_up:
+                self._finish_catch_up()
 
+    @retry((FileNotFoundError, PermissionError), delay=2)
+    def _watch_loop(self):
+        if not self._wait_for_subscribers():
+            return
+        watcher = InotifyWatcher(self._log_path)
+        try:
+            self._resume_from_checkpoint()
+            while self._is_running:
+                self._read_new_lines()
+                self._check_rotation()
+                # The timeout only bounds how long stop() takes to be noticed
+                watcher.wait(timeout=1)
+                if self._checkpoint_store is not None:
+                    self._checkpoint_store.flush_if_due()
+        finally:
+            watcher.close()
+            self._close_log_file()
+            if self._checkpoint_store is not None:
+                self._checkpoint_store.flush()
 
-class NetworkLogConsumer(LogConsumer):
-    """Consume logs over SSH from a remote harvester"""
+    def _resume_from_checkpoint(self):
+        """Open the log file at the position of the last checkpoint
 
-    def __init__(
-        self, remote_log_path: PurePath, remote_user: str, remote_host: str, remote_port: int, remote_platform: OS
-    ):
-        super().__init__()
+        If the log file got rotated in the meantime, the rest of the rotated
+        file is consumed first and the new log file is consumed from the start.
+        """
+        checkpoint = self._checkpoint_store.load() if self._checkpoint_store is not None else None
+        if checkpoint is None:
+            self._open_log_file(from_end=True)
+            return
 
-        self._remote_user = remote_user
-        self._remote_host = remote_host
-        self._remote_port = remote_port
-        self._remote_log_path = remote_log_path
-        self._remote_platform = remote_platform
-        self._log_size = 0
+        self._open_log_file(from_end=False)
+        assert self._log_file is not None
+        log_size = os.fstat(self._log_file.fileno()).st_size
+        if checkpoint.matches(self._log_file):
+            logging.info(f"Continuing from byte offset {checkpoint.offset} in {self._expanded_log_path}")
+            self._log_file.seek(checkpoint.offset)
+            self._consumed_offset = checkpoint.offset
+            self._checkpoint = checkpoint
+            if log_size > checkpoint.offset:
+                self._start_catch_up(log_size - checkpoint.offset)
+            return
+
+        rotated_log_path = self._log_path.with_name(self._log_path.name + ".1")
+        if self._is_checkpointed_file(rotated_log_path, checkpoint):
+            logging.info(f"Log file was rotated, continuing from byte offset {checkpoint.offset} in {rotated_log_path}")
+            self._start_catch_up(rotated_log_path.stat().st_size - checkpoint.offset + log_size)
+            self.ingest_file(rotated_log_path, checkpoint.offset)
+        else:
+            logging.warning("Couldn't find the last consumed log file, logs since the last run may be missing")
+        logging.info(f"Continuing from the start of {self._expanded_log_path}")
+        if log_size > 0 and not self._is_catching_up:
+            self._start_catch_up(log_size)
+
+    @staticmethod
+    def _is_checkpointed_file(path: Path, checkpoint: LogCheckpoint) -> bool:
+        try:
+            with open(path, "rb") as f:
+                return checkpoint.matches(f)
+        except FileNotFoundError:
+            return False
 
-        self._ssh_client = paramiko.client.SSHClient()
-        self._ssh_client.load_system_host_keys()
-        self._ssh_client.connect(hostname=self._remote_host, username=self._remote_user, port=self._remote_port)
+    def _open_log_file(self, from_end: bool):
+        self._log_file = open(self._expanded_log_path, "rb")
+        self._checkpoint = None
+        self._partial_line = b""
+        if from_end:
+            self._log_file.seek(0, os.SEEK_END)
+        self._consumed_offset = self._log_file.tell()
 
-        # Start thread
+    def _reopen_log_file(self):
+        try:
+            self._open_log_file(from_end=False)
+        except FileNotFoundError:
+            # Vanished again in between, we'll be woken up once it's recreated
+            return
+        self._read_new_lines()
+
+    def _close_log_file(self):
+        if self._log_file is not None:
+            self._log_file.close()
+            self._log_file = None
+
+    def _read_new_lines(self):
+        """Read everything appended since the last call and notify
+        subscribers in batches of complete lines. An incomplete trailing
+        line is kept back until the rest of it has been written.
+        """
+        if self._log_file is None:
+            return
+
+        while True:
+            offset = self._log_file.tell() - len(self._partial_line)
+            data = self._log_file.read(self.max_batch_bytes)
+            if not data:
+                if self._is_catching_up:
+                    self._finish_catch_up()
+                return
+
+            data = self._partial_line + data
+            end = data.rfind(b"\n") + 1
+            self._partial_line = data[end:]
+            if end > 0:
+                self._notify_subscribers(data[:end].decode("utf-8", errors="replace"), offset)
+                self._consumed_offset = offset + end
+                if self._checkpoint_store is not None:
+                    self._update_checkpoint(offset + end)
+
+    def _update_checkpoint(self, offset: int):
+        assert self._log_file is not None and self._checkpoint_store is not None
+        checkpoint = self._checkpoint
+        if checkpoint is not None and checkpoint.fingerprint_size == FINGERPRINT_SIZE:
+            # Same file, the fingerprint can only change while the file is young
+            checkpoint = replace(checkpoint, offset=offset)
+        else:
+            checkpoint = LogCheckpoint.of(self._log_file, offset)
+        self._checkpoint = checkpoint
+        self._checkpoint_store.update(checkpoint)
+
+    def _check_rotation(self):
+        """Detect rotation (the path points to a new file) and truncation
+        and reopen the log file from the start if either happened.
+        """
+        try:
+            path_stat = os.stat(self._expanded_log_path)
+        except FileNotFoundError:
+            # Rotated away and the new file has not been created yet
+            return
+
+        if self._log_file is None:
+            self._reopen_log_file()
+            return
+
+        file_stat = os.fstat(self._log_file.fileno())
+        if (path_stat.st_ino, path_stat.st_dev) != (file_stat.st_ino, file_stat.st_dev):
+            logging.debug(f"Detected rotation of {self._expanded_log_path}")
+            # Drain whatever was written to the old file before it got rotated away
+            self._read_new_lines()
+            self._close_log_file()
+            self._reopen_log_file()
+        elif path_stat.st_size < self._log_file.tell():
+            logging.debug(f"Detected truncation of {self._expanded_log_path}")
+            self._log_file.seek(0)
+            self._checkpoint = None
+            self._partial_line = b""
+            self._consumed_offset = 0
+            self._read_new_lines()
+
+
+class RemoteLogConsumer(LogConsumer):
+    """Consume logs of a remote host on the (shared) network event loop
+
+    Following starts with the first subscriber and runs until stopped,
+    reconnecting with backoff whenever the session is lost.
+
+    Without an event loop to share, the consumer has the loop and the
+    session to itself and closes both when stopped. Otherwise that's up
+    to whoever shares them, e.g. the MultiLogConsumer.
+    """
+
+    def __init__(self, session: SshSession, event_loop: Optional[NetworkEventLoop] = None):
+        super().__init__()
+        self._session = session
+        self._owns_event_loop = event_loop is None
+        self._event_loop = event_loop if event_loop is not None else NetworkEventLoop()
+        self._future: Optional[Future] = None
         self._is_running = True
-        self._thread = Thread(target=self._consume_loop)
-        self._thread.start()
+
+    @property
+    def connection_state(self) -> SshSessionState:
+        return self._session.state
+
+    @property
+    def reconnect_count(self) -> int:
+        return self._session.reconnect_count
+
+    def subscribe(self, subscriber: LogConsumerSubscriber):
+        super().subscribe(subscriber)
+        # Started by the first subscriber, there's no one to deliver the logs to before
+        if self._future is None and self._is_running:
+            self._future = self._event_loop.run(self._follow())
 
     def stop(self):
         logging.info("Stopping")
         self._is_running = False
+        if self._future is not None:
+            self._future.cancel()
+        if self._owns_event_loop:
+            self._event_loop.stop()
+            self._session.close()
 
-    def _consume_loop(self):
+    @abstractmethod
+    async def _follow(self):
+        """Deliver the remote logs to the subscribers until stopped"""
+        pass
+
+    async def _wait_before_reconnect(self, reason: str):
+        delay = self._session.backoff_seconds()
+        logging.warning(f"{reason}, retrying in {delay:.1f} seconds")
+        await asyncio.sleep(delay)
+
+
+class NetworkLogConsumer(RemoteLogConsumer):
+    """Consume logs over SSH from a remote harvester
+
+    Instead of a thread per harvester, the remote output is read on an event
+    loop that can be shared by the consumers of many harvesters. It's read in
+    chunks of whatever arrived and split into lines here. Reading only resumes
+    after the subscribers are done with the previous chunk, so a slow handler
+    throttles the remote end rather than piling up logs in memory.
+
+    The remote follow script announces which file it follows from which
+    offset. When the connection drops, the consumer reconnects with backoff
+    and resumes right after the last complete line it received.
+    """
+
+    def __init__(
+        self,
+        remote_log_path: PurePath,
+        session: SshSession,
+        remote_platform: OS,
+        event_loop: Optional[NetworkEventLoop] = None,
+    ):
+        super().__init__(session, event_loop)
+
+        self._remote_log_path = remote_log_path
+        self._remote_platform = remote_platform
+        self._partial_line = b""
+        # Identity of the followed file and offset after the last complete line, unknown before the first marker
+        self._file_id = ""
+        self._offset = 0
+        # Transfer statistics, lines can only be dropped remotely with a remote filter
+        self.bytes_received = 0
+        self.remote_lines_dropped = 0
+        self.remote_bytes_dropped = 0
+
+    def _log_transfer_stats(self):
         logging.info(
-            f"Consuming remote log file {self._remote_log_path}"
-            + f" from {self._remote_host}:{self._remote_port} ({self._remote_platform})"
+            f"Received {self.bytes_received / 2**20:.1f} MiB of logs from {self._session}, "
+            f"{self.remote_lines_dropped} lines ({self.remote_bytes_dropped / 2**20:.1f} MiB) were filtered remotely"
         )
 
+    def stop(self):
+        super().stop()
+        if self._future is not None:
+            self._log_transfer_stats()
+
+    @abstractmethod
+    def _follow_command(self) -> str:
+        """Command that follows the remote log file, resuming from _file_id and _offset if known"""
+        pass
+
+    async def _follow(self):
+        logging.info(
+            f"Consuming remote log file {self._remote_log_path} from {self._session} ({self._remote_platform})"
+        )
+        while self._is_running:
+            try:
+                if not self._session.is_connected:
+                    # Connecting takes a few round trips (or the connect timeout), don't hold up other hosts
+                    await self._event_loop.run_blocking(self._session.connect)
+                # Opening the channel takes a round trip as well
+                channel = await self._event_loop.run_blocking(
+                    partial(self._session.exec_command, self._follow_command())
+                )
+            except (paramiko.SSHException, OSError) as e:
+                await self._wait_before_reconnect(f"Can't follow {self._remote_log_path} on {self._session}: {e}")
+                continue
+
+            try:
+                await NetworkEventLoop.read_chunks(channel, self.max_batch_bytes, self._consume_chunk)
+            finally:
+                channel.close()
+            # Whatever is left of an incomplete line is sent again after resuming
+            self._partial_line = b""
+            if not self._session.is_connected:
+                self._session.disconnect()
+            self._log_transfer_stats()
+            await self._wait_before_reconnect(f"Stopped receiving logs from {self._session}")
+
+    def _consume_chunk(self, chunk: bytes):
+        self.bytes_received += len(chunk)
+        data = self._partial_line + chunk
+        self._partial_line = b""
+        marker_start = data.find(_MARKER_PREFIX)
+        while marker_start >= 0:
+            marker_end = data.find(b"\n", marker_start) + 1
+            if marker_end == 0:
+                # The rest of the marker arrives with the next chunk
+                break
+            self._consume_lines(data[:marker_start])
+            self._consume_marker(data[marker_start:marker_end])
+            data = data[marker_end:]
+            marker_start = data.find(_MARKER_PREFIX)
+        self._consume_lines(data)
+
+    def _consume_lines(self, data: bytes):
+        end = data.rfind(b"\n") + 1
+        self._partial_line = data[end:]
+        if len(self._partial_line) > self.max_batch_bytes:
+            # Not a chia log line, don't let it grow without bounds
+            logging.warning(f"Dropping a line of more than {self.max_batch_bytes} bytes from {self._session}")
+            self._offset += len(self._partial_line)
+            self._partial_line = b""
+        if end > 0:
+            self._offset += end
+            self._notify_subscribers(data[:end].decode("utf-8", errors="replace"))
+
+    def _consume_marker(self, marker: bytes):
+        try:
+            prefixed_kind, first, second = marker.decode().rstrip("#\r\n").split()
+            kind = prefixed_kind.partition(":")[2]
+            if kind == "follow":
+                file_id, offset = first, int(second)
+            elif kind == "dropped":
+                lines, size = int(first), int(second)
+            else:
+                raise ValueError(f"Unknown kind {kind}")
+        except ValueError:
+            logging.warning(f"Ignoring invalid marker from {self._session}: {marker!r}")
+            return
+
+        if kind == "follow":
+            if file_id != self._file_id and self._file_id:
+                logging.debug(f"Log file {self._remote_log_path} on {self._session} was rotated")
+            # An incomplete last line of the previous file will never be completed
+            self._partial_line = b""
+            self._file_id = file_id
+            self._offset = offset
+        else:
+            self._offset += size
+            self.remote_lines_dropped += lines
+            self.remote_bytes_dropped += size
+
+
+# Lines of their own sent by the remote follow scripts:
+#   #chiadog:follow <file id> <offset>#  started following a file at the offset
+#   #chiadog:dropped <lines> <bytes>#    that many lines were filtered out remotely
+_MARKER_PREFIX = b"#chiadog:"
+
+# Follows the log file like tail -F. Once the inode at the path changed, the
+# old tail gets a moment to drain the rotated file before it's stopped and the
+# new file is followed from the start. Exits once tail died, i.e. the channel
+# was closed. The filter is applied to the output of the whole loop, so that
+# $! is the PID of tail itself.
+_POSIX_FOLLOW_SCRIPT = """
+f={path}; i={file_id}; o={offset}
+a=awk; awk -W interactive 'BEGIN {{}}' 2>/dev/null && a='awk -W interactive'
+while :; do
+    set -- $(ls -i "$f" 2>/dev/null)
+    if [ -z "$1" ]; then sleep 1; continue; fi
+    s=$(($(wc -c < "$f")))
+    if [ -z "$i" ]; then o=$s; elif [ "$1" != "$i" ] || [ "$s" -lt "$o" ]; then o=0; fi
+    i=$1
+    echo "{marker}$i $o#"
+    tail -c +$((o + 1)) -f "$f" &
+    t=$!
+    while sleep {check_seconds}; do
+        kill -0 $t 2>/dev/null || exit
+        set -- $(ls -i "$f" 2>/dev/null)
+        [ "$1" = "$i" ] || break
+    done
+    sleep {drain_seconds}
+    kill $t
+    o=0
+done{filter}
+"""
+
+
+# Passes the lines that match the pattern p and reports runs of dropped lines
+# right before the next line that's passed, so that offsets stay correct.
+# Markers of the follow script are passed as they are, dropped lines before
+# a follow marker belong to the previous file and don't count any more.
+# Byte semantics for length() with LC_ALL=C. mawk only passes lines on as
+# they arrive in interactive mode, $a is set up by the follow script.
+_POSIX_FILTER = """ | LC_ALL=C $a -v p={pattern} '
+index($0, "{marker}follow ") == 1 {{ n = 0; b = 0; print; fflush(); next }}
+$0 ~ p {{ if (n) {{ print "{marker}dropped " n " " b "#"; n = 0; b = 0 }} print; fflush(); next }}
+{{ n++; b += length($0) + 1 }}'"""
+
+
+def _remote_filter_pattern(loggers: Iterable[Tuple[str, str]]) -> str:
+    """POSIX extended regex for the non-DEBUG lines of the given loggers, see mmap_log_reader._loggers_regex"""
+
+    def escape(name: str) -> str:
+        # Bracket expressions work the same in every awk, backslash escapes don't
+        return "".join(c if c.isalnum() or c == "_" else f"[{c}]" for c in name)
+
+    alternatives = "|".join(
+        f"{escape(service)} (chia|src)[.]{escape(module)}" for service, module in sorted(set(loggers))
+    )
+    return f" ({alternatives}) *: (INFO|WARNING|ERROR|CRITICAL)"
+
 
 class PosixNetworkLogConsumer(NetworkLogConsumer):
-    """Consume logs over SSH from a remote Linux/MacOS harvester"""
+    """Consume logs over SSH from a remote Linux/MacOS harvester
+
+    With the remote filter enabled, only lines of the loggers consumed by
+    the subscribers are sent over the connection, everything else (e.g.
+    DEBUG logs) is dropped on the harvester by awk.
+    """
+
+    # How often the remote script checks whether the log file was rotated
+    rotation_check_seconds = 5
+    # How long the rotated file is still followed for what was written to it last
+    rotation_drain_seconds = 2
 
     def __init__(
-        self, remote_log_path: PurePath, remote_user: str, remote_host: str, remote_port: int, remote_platform: OS
+        self,
+        remote_log_path: PurePath,
+        session: SshSession,
+        remote_platform: OS,
+        event_loop: Optional[NetworkEventLoop] = None,
+        remote_filter: bool = False,
     ):
         logging.info("Enabled Posix network log consumer.")
-        super(PosixNetworkLogConsumer, self).__init__(
-            remote_log_path, remote_user, remote_host, remote_port, remote_platform
-        )
+        self._remote_filter = remote_filter
+        super(PosixNetworkLogConsumer, self).__init__(remote_log_path, session, remote_platform, event_loop)
 
-    def _consume_loop(self):
-        super(PosixNetworkLogConsumer, self)._consume_loop()
+    def _follow_command(self) -> str:
+        remote_filter = ""
+        loggers = self._loggers() if self._remote_filter else None
+        if loggers:
+            remote_filter = _POSIX_FILTER.format(
+                pattern=shlex.quote(_remote_filter_pattern(loggers)), marker=_MARKER_PREFIX.decode()
+            )
+        script = _POSIX_FOLLOW_SCRIPT.format(
+            path=shlex.quote(str(self._remote_log_path)),
+            file_id=shlex.quote(self._file_id),
+            offset=self._offset,
+            marker=_MARKER_PREFIX.decode() + "follow ",
+            check_seconds=self.rotation_check_seconds,
+            drain_seconds=self.rotation_drain_seconds,
+            filter=remote_filter,
+        )
+        # The login shell of the remote user isn't necessarily POSIX compatible
+        return f"sh -c {shlex.quote(script)}"
 
-        stdin, stdout, stderr = self._ssh_client.exec_command(f"tail -F {self._remote_log_path}")
 
-        while self._is_running:
-            log_line = stdout.readline()
-            self._notify_subscribers(log_line)
+# Follows the log file like tail -F from a single long-lived PowerShell process.
+# New bytes are copied to stdout as they are. Once the file at the path got
+# shorter than what was read of it, it has been rotated or truncated: the rest
+# of the old file is drained and the file is reopened from the start. Files are
+# told apart by their NTFS file index. Creation times can't be trusted, a file
+# recreated right after renaming its predecessor away (like chia rotates its
+# logs) inherits the creation time of the old file ("file tunneling").
+_WINDOWS_FOLLOW_SCRIPT = """
+Add-Type -Namespace Chiadog -Name Native -MemberDefinition @'
+[StructLayout(LayoutKind.Sequential)]
+public struct ByHandleFileInformation {{
+    public uint FileAttributes;
+    public uint CreationTimeLow, CreationTimeHigh;
+    public uint LastAccessTimeLow, LastAccessTimeHigh;
+    public uint LastWriteTimeLow, LastWriteTimeHigh;
+    public uint VolumeSerialNumber;
+    public uint FileSizeHigh, FileSizeLow;
+    public uint NumberOfLinks;
+    public uint FileIndexHigh, FileIndexLow;
+}}
+[DllImport("kernel32.dll", SetLastError = true)]
+public static extern bool GetFileInformationByHandle(
+    Microsoft.Win32.SafeHandles.SafeFileHandle handle, out ByHandleFileInformation info);
+'@
+$path = '{path}'
+$id = '{file_id}'
+$offset = {offset}
+$out = [Console]::OpenStandardOutput()
+$stream = $null
+while ($true) {{
+    if ($stream -eq $null) {{
+        try {{
+            $stream = [IO.File]::Open($path, 'Open', 'Read', 'ReadWrite, Delete')
+        }} catch {{
+            Start-Sleep -Seconds 1
+            continue
+        }}
+        $info = New-Object Chiadog.Native+ByHandleFileInformation
+        if (-not [Chiadog.Native]::GetFileInformationByHandle($stream.SafeFileHandle, [ref]$info)) {{
+            $stream.Close()
+            $stream = $null
+            Start-Sleep -Seconds 1
+            continue
+        }}
+        $newId = '{{0}}-{{1}}-{{2}}' -f $info.VolumeSerialNumber, $info.FileIndexHigh, $info.FileIndexLow
+        if ($id -eq '') {{
+            $offset = $stream.Length
+        }} elseif ($newId -ne $id -or $stream.Length -lt $offset) {{
+            $offset = 0
+        }}
+        $id = $newId
+        $stream.Seek($offset, 'Begin') | Out-Null
+        $marker = [Text.Encoding]::ASCII.GetBytes("{marker}$id $offset#`n")
+        $out.Write($marker, 0, $marker.Length)
+    }}
+    $stream.CopyTo($out)
+    $out.Flush()
+    $item = Get-Item -LiteralPath $path -ErrorAction SilentlyContinue
+    if ($item -eq $null -or $item.Length -lt $stream.Position) {{
+        $stream.CopyTo($out)
+        $stream.Close()
+        $stream = $null
+        $offset = 0
+    }}
+    Start-Sleep -Milliseconds 500
+}}
+"""
 
 
 class WindowsNetworkLogConsumer(NetworkLogConsumer):
-    """Consume logs over SSH from a remote Windows harvester"""
+    """Consume logs over SSH from a remote Windows harvester
+
+    A single PowerShell script follows the log file and reports rotation
+    in band, so following a harvester costs one channel and one process.
+    """
 
     def __init__(
-        self, remote_log_path: PurePath, remote_user: str, remote_host: str, remote_port: int, remote_platform: OS
+        self,
+        remote_log_path: PurePath,
+        session: SshSession,
+        remote_platform: OS,
+        event_loop: Optional[NetworkEventLoop] = None,
     ):
         logging.info("Enabled Windows network log consumer.")
-        super(WindowsNetworkLogConsumer, self).__init__(
-            remote_log_path, remote_user, remote_host, remote_port, remote_platform
+        super(WindowsNetworkLogConsumer, self).__init__(remote_log_path, session, remote_platform, event_loop)
+
+    def _follow_command(self) -> str:
+        script = _WINDOWS_FOLLOW_SCRIPT.format(
+            path=str(self._remote_log_path).replace("'", "''"),
+            file_id=self._file_id.replace("'", "''"),
+            offset=self._offset,
+            marker=_MARKER_PREFIX.decode() + "follow ",
         )
+        # Passed encoded to get around quoting rules of the remote shell
+        encoded_script = base64.b64encode(script.encode("utf-16-le")).decode()
+        return f"powershell.exe -NoProfile -NonInteractive -EncodedCommand {encoded_script}"
 
-    def _consume_loop(self):
-        super(WindowsNetworkLogConsumer, self)._consume_loop()
 
-        stdin, stdout, stderr = self._read_log()
+class SftpLogConsumer(RemoteLogConsumer):
+    """Poll a remote log file over SFTP and read whatever was appended
+
+    An alternative to following the log file with a remote command that
+    works the same for Linux, MacOS and Windows harvesters, as long as they
+    run an SFTP server. Once a second the size of the file is checked and
+    only the new byte range is read, in large pipelined blocks, on a worker
+    thread of the shared event loop.
+
+    The position is kept in a checkpoint. SFTP doesn't tell inodes, so the
+    file is identified by a fingerprint of its first bytes. Consumption
+    continues where it stopped after a lost connection and, with a state
+    directory, after a restart. Rotation is detected by the file getting
+    shorter than the position or its first bytes changing. The rest of the
+    rotated file is read from <path>.1 before the new file is read from the
+    start.
+    """
+
+    poll_interval_seconds = 1.0
+
+    def __init__(
+        self,
+        remote_log_path: str,
+        session: SshSession,
+        state_dir: Optional[Path] = None,
+        event_loop: Optional[NetworkEventLoop] = None,
+    ):
+        super().__init__(session, event_loop)
+        # SFTP paths are relative to the home directory
+        self._remote_log_path = remote_log_path[2:] if remote_log_path.startswith("~/") else remote_log_path
+        self._rotated_log_path = self._remote_log_path + ".1"
+        self._checkpoint: Optional[LogCheckpoint] = None
+        self._lag_bytes: Optional[int] = None
+        self._checkpoint_store: Optional[LogCheckpointStore] = None
+        state_dir = prepare_state_dir(state_dir, "logs will be consumed from the end")
+        if state_dir is not None:
+            state_key = hashlib.sha1(f"{session}:{self._remote_log_path}".encode()).hexdigest()[:8]
+            self._checkpoint_store = LogCheckpointStore(state_dir / f"{session.host}-{state_key}.checkpoint")
+
+    def stop(self):
+        super().stop()
+        if self._checkpoint_store is not None:
+            self._checkpoint_store.flush()
+
+    @property
+    def lag_bytes(self) -> Optional[int]:
+        return self._lag_bytes
+
+    async def _follow(self):
+        logging.info(f"Polling remote log file {self._remote_log_path} on {self._session} over SFTP")
+        if self._checkpoint_store is not None:
+            self._checkpoint = self._checkpoint_store.load()
+            if self._checkpoint is not None:
+                logging.info(f"Continuing from byte offset {self._checkpoint.offset} in {self._remote_log_path}")
+                self._start_catch_up()
 
         while self._is_running:
-            if self._has_rotated(self._remote_log_path):
-                sleep(1)
-                stdin, stdout, stderr = self._read_log()
+            try:
+                sftp = await self._event_loop.run_blocking(self._session.open_sftp)
+            except (paramiko.SSHException, OSError) as e:
+                await self._wait_before_reconnect(f"Can't open SFTP session on {self._session}: {e}")
+                continue
+
+            try:
+                while self._is_running:
+                    await self._event_loop.run_blocking(partial(self._poll, sftp))
+                    if self._checkpoint_store is not None:
+                        self._checkpoint_store.flush_if_due()
+                    await asyncio.sleep(self.poll_interval_seconds)
+            except (paramiko.SSHException, OSError) as e:
+                if not self._session.is_connected:
+                    self._session.disconnect()
+                await self._wait_before_reconnect(f"Can't read {self._remote_log_path} on {self._session}: {e}")
+            finally:
+                sftp.close()
+
+    def _poll(self, sftp: paramiko.SFTPClient):
+        try:
+            f = sftp.open(self._remote_log_path, "rb")
+        except FileNotFoundError:
+            # Rotated away and the new file has not been created yet
+            return
+
+        with f:
+            size = f.stat().st_size or 0
+            if self._checkpoint is None:
+                logging.info(f"Reading new logs from the end of {self._remote_log_path}")
+                self._update_checkpoint(f, size, size)
+                return
 
-            log_line = stdout.readline()
-            self._notify_subscribers(log_line)
+            if not self._is_checkpointed_file(f, size):
+                logging.debug(f"Detected rotation of {self._remote_log_path} on {self._session}")
+                self._read_rotated_file(sftp)
+                self._update_checkpoint(f, size, 0)
 
-    def _read_log(self) -> Tuple[ChannelStdinFile, ChannelFile, ChannelStderrFile]:
-        stdin, stdout, stderr = self._ssh_client.exec_command(
-            f"powershell.exe Get-Content {self._remote_log_path} -Wait -Tail 1"
+            self._read(f, size)
+
+    def _is_checkpointed_file(self, f: paramiko.SFTPFile, size: int) -> bool:
+        assert self._checkpoint is not None
+        return (
+            size >= self._checkpoint.offset
+            and self._fingerprint(f, self._checkpoint.fingerprint_size) == self._checkpoint.fingerprint
         )
 
-        return stdin, stdout, stderr
+    def _read_rotated_file(self, sftp: paramiko.SFTPClient):
+        """Read the rest of the file rotated away since the last poll"""
+        try:
+            with sftp.open(self._rotated_log_path, "rb") as f:
+                size = f.stat().st_size or 0
+                if self._is_checkpointed_file(f, size):
+                    self._read(f, size)
+                    return
+        except FileNotFoundError:
+            pass
+        logging.warning(f"Couldn't find the rest of {self._remote_log_path} after rotation, some logs may be missing")
+
+    def _read(self, f: paramiko.SFTPFile, size: int):
+        """Deliver the complete lines between the checkpoint and the given size"""
+        assert self._checkpoint is not None
+        offset = self._checkpoint.offset
+        while offset < size and self._is_running:
+            self._lag_bytes = size - offset
+            length = min(self.max_batch_bytes, size - offset)
+            # Split into smaller requests that are sent without waiting for each other
+            data = b"".join(f.readv([(offset, length)]))
+            end = data.rfind(b"\n") + 1
+            if end == 0:
+                if length < self.max_batch_bytes:
+                    # Incomplete last line, read again once it's complete
+                    break
+                logging.warning(f"Dropping a line of more than {self.max_batch_bytes} bytes from {self._session}")
+                end = len(data)
+            else:
+                self._notify_subscribers(data[:end].decode("utf-8", errors="replace"), offset)
+            offset += end
+            self._update_checkpoint(f, size, offset)
+
+        self._lag_bytes = size - offset
+        if self._is_catching_up:
+            self._finish_catch_up()
+
+    @staticmethod
+    def _fingerprint(f: paramiko.SFTPFile, size: int) -> str:
+        return fingerprint_bytes(b"".join(f.readv([(0, size)])) if size > 0 else b"")
+
+    def _update_checkpoint(self, f: paramiko.SFTPFile, size: int, offset: int):
+        checkpoint = self._checkpoint
+        if checkpoint is not None and offset > 0 and checkpoint.fingerprint_size == min(size, FINGERPRINT_SIZE):
+            # Same file, the fingerprint can only change while the file is young
+            checkpoint = replace(checkpoint, offset=offset)
+        else:
+            fingerprint_size = min(size, FINGERPRINT_SIZE)
+            checkpoint = LogCheckpoint(
+                inode=0,
+                offset=offset,
+                fingerprint=self._fingerprint(f, fingerprint_size),
+                fingerprint_size=fingerprint_size,
+            )
+        self._checkpoint = checkpoint
+        if self._checkpoint_store is not None:
+            self._checkpoint_store.update(checkpoint)
+
+
+class MultiLogConsumer(LogConsumer):
+    """Merge the logs of several named sources (e.g. the full node and
+    each harvester of a farm) into a single stream.
+
+    Every source has its own consumer. Their records are tagged with the
+    name of the source and handed to the subscribers one batch at a time,
+    so subscribers are never called concurrently.
+
+    The event loop and SSH sessions shared by the remote sources are
+    stopped and closed after the consumers.
+    """
+
+    def __init__(
+        self,
+        consumers: Dict[str, LogConsumer],
+        event_loop: Optional[NetworkEventLoop] = None,
+        session_manager: Optional[SshSessionManager] = None,
+    ):
+        super().__init__()
+        self._consumers = consumers
+        self._event_loop = event_loop
+        self._session_manager = session_manager
+        self._delivery_lock = Lock()
+        self._delivering_consumer: Optional[LogConsumer] = None
+
+    def stop(self):
+        for consumer in self._consumers.values():
+            consumer.stop()
+        if self._event_loop is not None:
+            self._event_loop.stop()
+        if self._session_manager is not None:
+            self._session_manager.close()
+
+    def subscribe(self, subscriber: LogConsumerSubscriber):
+        is_first_subscriber = not self._subscribers
+        super().subscribe(subscriber)
+        # Sources start consuming once subscribed to
+        if is_first_subscriber:
+            for name, consumer in self._consumers.items():
+                consumer.subscribe(_SourceSubscriber(self, name, consumer))
+
+    @property
+    def is_catching_up(self) -> bool:
+        # Subscribers ask while handling a batch, answer for the source it came from
+        if self._delivering_consumer is not None:
+            return self._delivering_consumer.is_catching_up
+        return any(consumer.is_catching_up for consumer in self._consumers.values())
+
+    @property
+    def lag_seconds(self) -> Optional[float]:
+        lags = [consumer.lag_seconds for consumer in self._consumers.values()]
+        return max((lag for lag in lags if lag is not None), default=None)
 
-    def _has_rotated(self, path: PurePath) -> bool:
-        stdin, stdout, stderr = self._ssh_client.exec_command(f"powershell.exe Write-Host(Get-Item {str(path)}).length")
+    @property
+    def lag_bytes(self) -> Optional[int]:
+        lags = [consumer.lag_bytes for consumer in self._consumers.values()]
+        known_lags = [lag for lag in lags if lag is not None]
+        return sum(known_lags) if known_lags else None
 
-        old_size = self._log_size
-        self._log_size = int(stdout.readline())
+    def _deliver(self, consumer: LogConsumer, records: List[LogRecord]):
+        with self._delivery_lock:
+            self._delivering_consumer = consumer
+            try:
+                for subscriber in self._subscribers:
+                    subscriber.consume_logs(records)
+            finally:
+                self._delivering_consumer = None
 
-        return old_size > self._log_size
 
+class _SourceSubscriber(LogConsumerSubscriber):
+    """Forwards the records of one source to the MultiLogConsumer"""
 
-def get_host_info(host: str, user: str, path: str, port: int) -> Tuple[OS, PurePath]:
-    client = paramiko.client.SSHClient()
-    client.load_system_host_keys()
-    client.connect(hostname=host, username=user, port=port)
+    def __init__(self, multi_consumer: MultiLogConsumer, name: str, consumer: LogConsumer):
+        self._multi_consumer = multi_consumer
+        self._name = name
+        self._consumer = consumer
 
-    stdin, stdout, stderr = client.exec_command("uname -a")
-    fout: str = stdout.readline().lower()
-    ferr: str = stderr.readline().lower()
+    def consume_logs(self, records: List[LogRecord]):
+        for record in records:
+            record.source = self._name
+        self._multi_consumer._deliver(self._consumer, records)
+
+    def loggers(self) -> Optional[List[Tuple[str, str]]]:
+        return self._multi_consumer._loggers()
+
+
+def get_host_info(session: SshSession, path: str) -> Tuple[OS, PurePath]:
+    channel = session.exec_command("uname -a")
+    fout: str = channel.makefile("r").readline().lower()
+    ferr: str = channel.makefile_stderr("r").readline().lower()
+    channel.close()
 
     if "linux" in fout:
         return OS.LINUX, PurePosixPath(path)
@@ -214,9 +1101,31 @@ def get_host_info(host: str, user: str, path: str, port: int) -> Tuple[OS, PureP
     return OS.LINUX, PurePosixPath(path)
 
 
-def create_log_consumer_from_config(config: ConfigView) -> LogConsumer:
+def get_log_source_names(config: ConfigView) -> List[str]:
+    """Names of the configured log sources, empty if only a single consumer is configured"""
+    if not config["sources"].exists():
+        return []
+    return [source_config["name"].get(str) for source_config in config["sources"].sequence()]
+
+
+def get_log_source_services(config: ConfigView) -> Dict[str, Optional[List[str]]]:
+    """Services expected to run on each log source, None where they aren't configured"""
+    if not config["sources"].exists():
+        return {}
+    return {
+        source_config["name"].get(str): source_config["monitored_services"].get(confuse.Optional(confuse.StrSeq()))
+        for source_config in config["sources"].sequence()
+    }
+
+
+def create_log_consumer_from_config(config: ConfigView, state_dir: Optional[Path] = None) -> LogConsumer:
+    if get_log_source_names(config):
+        return create_multi_log_consumer_from_config(config["sources"], state_dir)
+
     enabled_consumer = None
     for consumer in config.keys():
+        if consumer == "sources":
+            continue
         if config[consumer]["enable"].get(bool):
             if enabled_consumer:
                 logging.error("Detected multiple enabled consumers. This is unsupported configuration!")
@@ -226,18 +1135,52 @@ def create_log_consumer_from_config(config: ConfigView) -> LogConsumer:
         logging.critical("Couldn't find enabled log consumer in config.yaml")
         exit(1)
 
-    enabled_consumer_config = config[enabled_consumer]
+    if enabled_consumer not in log_consumer_templates:
+        logging.critical("Unknown log consumer type enabled, typo?")
+        exit(1)
+
+    # Validate config against template
+    valid_config = config[enabled_consumer].get(log_consumer_templates[enabled_consumer])
+    return _create_log_consumer(enabled_consumer, valid_config, state_dir)
+
 
-    if enabled_consumer == "file_log_consumer":
-        # Validate config against template
-        valid_config = enabled_consumer_config.get(file_log_consumer_template)
+def create_multi_log_consumer_from_config(config: ConfigView, state_dir: Optional[Path] = None) -> LogConsumer:
+    consumers: Dict[str, LogConsumer] = {}
+    # Remote logs of all sources are followed on the same thread, one connection per host
+    event_loop = NetworkEventLoop()
+    session_manager = SshSessionManager()
+    for source_config in config.sequence():
+        name = source_config["name"].get(str)
+        if name in consumers:
+            logging.critical(f"Detected multiple log sources named {name}, names must be unique!")
+            exit(1)
+
+        consumer_types = [key for key in source_config.keys() if key not in ("name", "monitored_services")]
+        if len(consumer_types) != 1 or consumer_types[0] not in log_consumer_templates:
+            logging.critical(f"Log source {name} needs exactly one of: {', '.join(log_consumer_templates)}")
+            exit(1)
+
+        consumer_type = consumer_types[0]
+        valid_config = source_config[consumer_type].get(log_consumer_templates[consumer_type])
+        logging.info(f"Adding log source {name}")
+        consumers[name] = _create_log_consumer(consumer_type, valid_config, state_dir, event_loop, session_manager)
+
+    return MultiLogConsumer(consumers, event_loop, session_manager)
+
+
+def _create_log_consumer(
+    consumer_type: str,
+    valid_config: dict,
+    state_dir: Optional[Path],
+    event_loop: Optional[NetworkEventLoop] = None,
+    session_manager: Optional[SshSessionManager] = None,
+) -> LogConsumer:
+    if consumer_type == "file_log_consumer":
         log_path = valid_config["file_path"]
         logging.info(f"Consuming logs locally from {log_path}")
-        return FileLogConsumer(log_path=log_path)
+        return FileLogConsumer(log_path=log_path, watch_mode=valid_config["watch_mode"], state_dir=state_dir)
 
-    if enabled_consumer == "network_log_consumer":
-        # Validate config against template
-        valid_config = enabled_consumer_config.get(network_log_consumer_template)
+    if consumer_type == "network_log_consumer":
         remote_port = valid_config["remote_port"]
         remote_user = valid_config["remote_user"]
         remote_host = valid_config["remote_host"]
@@ -245,24 +1188,36 @@ def create_log_consumer_from_config(config: ConfigView) -> LogConsumer:
 
         logging.info(f"Consuming logs remotely from {remote_user}@{remote_host}:{remote_port}:{remote_path}")
 
-        platform, path = get_host_info(remote_host, remote_user, remote_path, remote_port)
+        if session_manager is None:
+            session_manager = SshSessionManager()
+        session = session_manager.session(remote_host, remote_user, remote_port, valid_config["compression"])
+        platform, path = get_host_info(session, remote_path)
 
         if platform == OS.WINDOWS:
             return WindowsNetworkLogConsumer(
-                remote_log_path=path,
-                remote_host=valid_config["remote_host"],
-                remote_user=valid_config["remote_user"],
-                remote_port=remote_port,
-                remote_platform=platform,
+                remote_log_path=path, session=session, remote_platform=platform, event_loop=event_loop
             )
         else:
             return PosixNetworkLogConsumer(
                 remote_log_path=path,
-                remote_host=valid_config["remote_host"],
-                remote_user=valid_config["remote_user"],
-                remote_port=remote_port,
+                session=session,
                 remote_platform=platform,
+                event_loop=event_loop,
+                remote_filter=valid_config["remote_filter"],
             )
 
+    if consumer_type == "sftp_log_consumer":
+        remote_path = valid_config["remote_file_path"]
+        if session_manager is None:
+            session_manager = SshSessionManager()
+        session = session_manager.session(
+            valid_config["remote_host"],
+            valid_config["remote_user"],
+            valid_config["remote_port"],
+            valid_config["compression"],
+        )
+        logging.info(f"Consuming logs remotely over SFTP from {session}:{remote_path}")
+        return SftpLogConsumer(remote_log_path=remote_path, session=session, state_dir=state_dir, event_loop=event_loop)
+
     logging.critical("Unknown log consumer type enabled, typo?")
     exit(1)
@@ -0,0 +1,50 @@
+# std
+from typing import Dict, Generic, Iterable, List, Tuple, TypeVar
+
+# project
+from .log_record import LogRecord
+
+T = TypeVar("T")
+
+
+class LogDispatcher(Generic[T]):
+    """Routes each log record to the targets (i.e. handlers) registered for
+    its service and module, so that targets never have to look at records
+    they aren't interested in.
+    """
+
+    def __init__(self):
+        self._routes: Dict[Tuple[str, str], List[T]] = {}
+
+    def register(self, target: T, loggers: Iterable[Tuple[str, str]]):
+        """Register a target for log records from the given loggers
+
+        :param target: Receiver of the routed log records
+        :param loggers: Pairs of service and module name without the chia./src. package prefix
+        """
+        for logger in loggers:
+            targets = self._routes.setdefault(logger, [])
+            if target not in targets:
+                targets.append(target)
+
+    def loggers(self) -> List[Tuple[str, str]]:
+        """All loggers that have at least one target registered"""
+        return list(self._routes)
+
+    def dispatch(self, records: List[LogRecord]) -> Dict[T, List[LogRecord]]:
+        """Split a batch of log records by target
+
+        :param records: Log records in the order they were logged
+        :returns: Records for each target that received at least one record
+        """
+        routed: Dict[T, List[LogRecord]] = {}
+        for record in records:
+            targets = self._routes.get((record.service, record.module))
+            if targets:
+                for target in targets:
+                    if target in routed:
+                        routed[target].append(record)
+                    else:
+                        routed[target] = [record]
+
+        return routed
@@ -1,5 +1,6 @@
 # std
-from typing import Optional, List, Type, Dict
+from itertools import groupby
+from typing import Optional, List, Tuple, Type, Dict
 import logging
 
 # lib
@@ -15,7 +16,9 @@ from src.chia_log.handlers.finished_signage_point_handler import FinishedSignage
 from src.chia_log.handlers.wallet_added_coin_handler import WalletAddedCoinHandler
 from src.chia_log.handlers.wallet_peak_handler import WalletPeakHandler
 from src.chia_log.log_consumer import LogConsumerSubscriber, LogConsumer
-from src.notifier import EventService
+from src.chia_log.log_dispatcher import LogDispatcher
+from src.chia_log.log_record import LogRecord
+from src.notifier import Event, EventService
 from src.notifier.notify_manager import NotifyManager
 
 
@@ -31,6 +34,9 @@ class LogHandler(LogConsumerSubscriber):
     1. Create a parser for a new part of the log stream
     2. Create a handler for analysing the parsed information
     3. Add the new handler to the list of handlers below
+
+    Handlers keep state between batches (e.g. the time of the last farming
+    event), so each log source gets its own set of handlers.
     """
 
     def __init__(
@@ -46,20 +52,67 @@ class LogHandler(LogConsumerSubscriber):
             EventService.FULL_NODE: [BlockHandler, FinishedSignagePointHandler],
             EventService.FARMER: [PartialHandler],
         }
+        self._config = config
+        self._log_consumer = log_consumer
         self._notify_manager = notify_manager
         self._stats_manager = stats_manager
 
-        self._active_handlers = []
+        self._handler_types: List[Type[LogHandlerInterface]] = []
         for service, service_handlers in self.services.items():
             if service.name in config["monitored_services"].get(list):
                 logging.info(f"Enabled service monitoring: {service.name}")
-                for handler in service_handlers:
-                    self._active_handlers.append(handler(config["handlers"][handler.config_name()]))
+                self._handler_types.extend(service_handlers)
             else:
                 logging.debug(f"Disabled service monitoring: {service.name}")
+
+        # Handlers of each log source, None if there is only a single source
+        self._active_handlers: Dict[Optional[str], List[LogHandlerInterface]] = {}
+        self._dispatchers: Dict[Optional[str], LogDispatcher[LogHandlerInterface]] = {}
+        self._create_handlers(source=None)
         log_consumer.subscribe(self)
 
-    def consume_logs(self, logs: str):
-        for handler in self._active_handlers:
-            events = handler.handle(logs, self._stats_manager)
-            self._notify_manager.process_events(events)
+    def _create_handlers(self, source: Optional[str]):
+        self._active_handlers[source] = []
+        self._dispatchers[source] = LogDispatcher()
+        for handler_type in self._handler_types:
+            handler = handler_type(self._config["handlers"][handler_type.config_name()])
+            self._active_handlers[source].append(handler)
+            self._dispatchers[source].register(handler, handler.loggers())
+
+    def loggers(self) -> List[Tuple[str, str]]:
+        return self._dispatchers[None].loggers()
+
+    def consume_logs(self, records: List[LogRecord]):
+        # Collect events from all handlers so notifiers are invoked once per batch of logs
+        events = []
+        for source, source_records in groupby(records, key=lambda record: record.source):
+            events.extend(self._handle(source, list(source_records)))
+
+        # Historical logs still count towards the stats, but e.g. a harvester that
+        # is "working again" after a gap hours ago is no news anymore
+        if self._log_consumer.is_catching_up:
+            live_events = [event for event in events if not event.realtime_only]
+            if len(live_events) < len(events):
+                logging.debug(f"Suppressed {len(events) - len(live_events)} outdated events while catching up")
+            events = live_events
+        self._notify_manager.process_events(events)
+
+    def _handle(self, source: Optional[str], records: List[LogRecord]) -> List[Event]:
+        if source not in self._active_handlers:
+            logging.debug(f"Creating handlers for log source {source}")
+            self._create_handlers(source)
+
+        # Each handler only sees the records of the services and modules it registered for
+        routed_records = self._dispatchers[source].dispatch(records)
+
+        events = []
+        for handler in self._active_handlers[source]:
+            if handler in routed_records:
+                events.extend(handler.handle(routed_records[handler], self._stats_manager))
+
+        if source is not None:
+            for event in events:
+                event.source = source
+                if event.message:
+                    event.message = f"[{source}] {event.message}"
+        return events
@@ -0,0 +1,93 @@
+"""Structured representation of a single chia log line.
+
+Log lines are tokenized once when they are received from a log consumer.
+Handlers and parsers work on the resulting records and only need to look
+at the message body, the common prefix has already been taken care of.
+"""
+
+# std
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional
+
+# project
+from .timestamp import parse_timestamp
+
+# <timestamp> [hostname] <service> <chia|src>.<module>: <LEVEL> <message>
+# The hostname is optional. Trying it first and backtracking is cheap because
+# the service must be followed by the chia/src package prefix.
+_PREFIX_REGEX = re.compile(
+    r"([0-9:.T\-\+]+) (?:([-0-9a-zA-Z.]+) )?([a-z_]+) (?:chia|src)\.([a-z_.]+)\s*: ([A-Z]+)\s*(.*)"
+)
+
+# DEBUG lines are never parsed, so they're skipped before running any regex.
+# The level is part of the prefix, only the beginning of the line is searched.
+_DEBUG_MARKER = ": DEBUG"
+_PREFIX_WINDOW = 160
+
+
+@dataclass
+class LogRecord:
+    """A single (possibly multi-line) log message"""
+
+    timestamp: datetime
+    hostname: Optional[str]
+    service: str  # e.g. harvester
+    module: str  # without package prefix, e.g. harvester.harvester
+    level: str
+    message: str
+    offset: Optional[int] = None  # byte offset of the line in its source, if known
+    source: Optional[str] = None  # name of the log source if there are several
+
+
+def parse_log_records(logs: str, offset: Optional[int] = None) -> List[LogRecord]:
+    """Tokenize a bunch of logs into records
+
+    Lines without prefix are continuation lines of a multi-line message and are
+    appended to the message of the previous record. DEBUG messages are skipped.
+
+    :param logs: String of logs - can be multi-line
+    :param offset: Byte offset of the logs in their source, if known
+    :returns: A list of records - can be empty
+    """
+    records: List[LogRecord] = []
+    current: Optional[LogRecord] = None
+    position = offset
+    for line in logs.split("\n"):
+        line_offset = position
+        if position is not None:
+            position += (len(line) if line.isascii() else len(line.encode("utf-8"))) + 1
+        if line.endswith("\r"):
+            line = line[:-1]
+        if not line:
+            continue
+
+        if line.find(_DEBUG_MARKER, 0, _PREFIX_WINDOW) >= 0:
+            current = None
+            continue
+
+        match = _PREFIX_REGEX.match(line)
+        if match is None:
+            if current is not None:
+                current.message += "\n" + line
+            continue
+
+        try:
+            timestamp = parse_timestamp(match.group(1))
+        except ValueError:
+            current = None
+            continue
+
+        current = LogRecord(
+            timestamp=timestamp,
+            hostname=match.group(2),
+            service=match.group(3),
+            module=match.group(4),
+            level=match.group(5),
+            message=match.group(6),
+            offset=line_offset,
+        )
+        records.append(current)
+
+    return records
@@ -0,0 +1,147 @@
+"""Memory-mapped reading of large chia log files.
+
+Rotated logs (debug.log.1 ... debug.log.7) are read in one go instead of
+being followed. Mapping them into memory lets the OS page them in on demand
+and lets us scan for line boundaries and loggers on the raw bytes. Only the
+lines that are actually needed are copied and decoded into Python strings.
+"""
+
+# std
+import mmap
+import os
+import re
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Pattern, Set, Tuple
+
+# Lines that start a new log message, see log_record._PREFIX_REGEX
+_PREFIX_REGEX = re.compile(rb"[0-9:.T\-+]+ (?:[-0-9a-zA-Z.]+ )?[a-z_]+ (?:chia|src)\.")
+
+
+def _loggers_regex(loggers: Set[Tuple[str, str]]) -> Pattern[bytes]:
+    # Starting with a literal space lets the regex engine skip quickly to candidate lines.
+    # DEBUG lines are dropped right away, they are never parsed.
+    alternatives = "|".join(
+        re.escape(f"{service} ") + r"(?:chia|src)\." + re.escape(module) for service, module in sorted(loggers)
+    )
+    return re.compile(rb" (?:" + alternatives.encode() + rb")\s*: (?!DEBUG)")
+
+
+class MmapLogReader:
+    """Read a whole log file, or everything after the given byte offset, through a memory map
+
+    Use as a context manager, the file is unmapped and closed on exit.
+    """
+
+    # Approximate upper bound for the size of the chunks that are yielded
+    chunk_size = 4 * 1024 * 1024
+
+    def __init__(self, path: Path, offset: int = 0):
+        self._file = open(path, "rb")
+        self._offset = offset
+        self._mmap: Optional[mmap.mmap] = None
+        # Empty files can't be mapped
+        if self.size > 0:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __enter__(self) -> "MmapLogReader":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+    @property
+    def size(self) -> int:
+        return os.fstat(self._file.fileno()).st_size
+
+    def chunks(self) -> Iterator[memoryview]:
+        """Zero-copy chunks of complete lines
+
+        Each chunk is only valid until the next one is requested and must not be
+        retained, decode or copy whatever is needed before moving on.
+
+        :returns: Chunks of at most chunk_size bytes unless a single line is larger
+        """
+        if self._mmap is None:
+            return
+
+        view = memoryview(self._mmap)
+        try:
+            start = self._offset
+            while start < len(view):
+                end = self._mmap.rfind(b"\n", start, start + self.chunk_size) + 1
+                if end <= start:
+                    # Line longer than a chunk or the last line without newline
+                    end = self._mmap.find(b"\n", start + self.chunk_size) + 1 or len(view)
+                chunk = view[start:end]
+                try:
+                    yield chunk
+                finally:
+                    chunk.release()
+                start = end
+        finally:
+            view.release()
+
+    def lines(self, loggers: Optional[Iterable[Tuple[str, str]]] = None) -> Iterator[str]:
+        """Decode the lines of the given loggers
+
+        Lines of other loggers (and DEBUG lines) are skipped without being decoded.
+        Continuation lines of multi-line messages are kept with their first line.
+
+        :param loggers: Pairs of service and module name without the chia./src. package prefix,
+                        None to decode all lines
+        :returns: Batches of complete lines of at most chunk_size bytes (unless a single line is larger)
+        """
+        if self._mmap is None:
+            return
+        if loggers is None:
+            for chunk in self.chunks():
+                yield str(chunk, "utf-8", errors="replace")
+            return
+        enabled = set(loggers)
+        if not enabled:
+            # An empty alternation would match the lines of every logger
+            return
+
+        mm = self._mmap
+        batch: List[bytes] = []
+        batch_size = 0
+        line_end = 0
+        for match in _loggers_regex(enabled).finditer(mm, self._offset):
+            if match.start() < line_end:
+                # Already included as part of the previous message
+                continue
+            line_start = mm.rfind(b"\n", self._offset, match.start()) + 1 or self._offset
+            # Only the timestamp and optional hostname may precede the service
+            first_space = mm.find(b" ", line_start, match.start())
+            if first_space >= 0 and mm.find(b" ", first_space + 1, match.start()) >= 0:
+                continue
+
+            line_end = self._message_end(match.end())
+            line = mm[line_start:line_end]
+            batch.append(line if line.endswith(b"\n") else line + b"\n")
+            batch_size += line_end - line_start
+            if batch_size >= self.chunk_size:
+                yield b"".join(batch).decode("utf-8", errors="replace")
+                batch = []
+                batch_size = 0
+
+        if batch:
+            yield b"".join(batch).decode("utf-8", errors="replace")
+
+    def _message_end(self, position: int) -> int:
+        """Find the end of the message at the given position, including continuation lines"""
+        assert self._mmap is not None
+        mm = self._mmap
+        while True:
+            line_end = mm.find(b"\n", position) + 1
+            if line_end == 0:
+                return len(mm)
+            if line_end == len(mm) or _PREFIX_REGEX.match(mm, line_end):
+                return line_end
+            position = line_end
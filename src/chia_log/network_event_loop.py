@@ -0,0 +1,110 @@
+"""A single asyncio event loop shared by the network log consumers.
+
+Following the logs of a remote host is mostly waiting for the next bytes to
+arrive. Instead of parking an OS thread per host in a blocking read, all
+hosts are followed by coroutines on one event loop in one background thread.
+"""
+
+# std
+import asyncio
+import logging
+import socket
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from threading import Lock, Thread
+from typing import Any, Callable, Coroutine, Optional, Union
+
+# lib
+from paramiko import Channel
+
+# Anything with a selectable file descriptor and a non-blocking recv
+ByteChannel = Union[Channel, socket.socket]
+
+
+class NetworkEventLoop:
+    """Runs coroutines on an event loop in a background thread
+
+    The thread is started with the first coroutine. It's a daemon thread,
+    coroutines are stopped by cancelling the future returned by run() or
+    all at once by stop().
+    """
+
+    # Threads for calls that can't be made without blocking, e.g. connecting
+    max_blocking_workers = 4
+    # How long stop() waits for cancelled coroutines to finish
+    stop_timeout_seconds = 5
+
+    def __init__(self):
+        # The proactor loop (default on Windows) can't wait for paramiko channels
+        self._loop = asyncio.SelectorEventLoop()
+        self._executor = ThreadPoolExecutor(self.max_blocking_workers)
+        self._thread: Optional[Thread] = None
+        self._lock = Lock()
+
+    def run(self, coroutine: Coroutine) -> Future:
+        with self._lock:
+            if self._thread is None:
+                self._thread = Thread(target=self._loop.run_forever, name="NetworkEventLoop", daemon=True)
+                self._thread.start()
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+
+    async def run_blocking(self, function: Callable[[], Any]) -> Any:
+        """Call the function on a worker thread and wait for its result without blocking the loop"""
+        return await self._loop.run_in_executor(self._executor, function)
+
+    def stop(self):
+        """Cancel the coroutines that are still running, wait for them and stop the thread"""
+        with self._lock:
+            if self._thread is not None:
+                try:
+                    asyncio.run_coroutine_threadsafe(self._cancel_tasks(), self._loop).result(self.stop_timeout_seconds)
+                except FutureTimeoutError:
+                    logging.warning("Gave up waiting for the network log consumers to stop")
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._thread.join()
+                self._thread = None
+        self._executor.shutdown(wait=False)
+
+    @staticmethod
+    async def _cancel_tasks():
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    @staticmethod
+    async def read_chunks(channel: ByteChannel, read_size: int, on_chunk: Callable[[bytes], None]):
+        """Hand everything received on the channel to on_chunk until the remote end closes it
+
+        Chunks are read as soon as the channel becomes readable, each one is
+        whatever arrived in the meantime up to read_size bytes. Remote stderr
+        is only logged, it's read so it can't fill up the channel.
+        """
+        loop = asyncio.get_running_loop()
+        readable = asyncio.Event()
+        channel.setblocking(False)
+        fd = channel.fileno()
+        loop.add_reader(fd, readable.set)
+        try:
+            while True:
+                await readable.wait()
+                readable.clear()
+                if isinstance(channel, Channel):
+                    NetworkEventLoop._drain_stderr(channel, read_size)
+                try:
+                    chunk = channel.recv(read_size)
+                except (BlockingIOError, socket.timeout):
+                    # Woken up without anything to read after all
+                    continue
+                if not chunk:
+                    logging.debug("Remote end closed the channel")
+                    return
+                on_chunk(chunk)
+        finally:
+            loop.remove_reader(fd)
+
+    @staticmethod
+    def _drain_stderr(channel: Channel, read_size: int):
+        while channel.recv_stderr_ready():
+            output = channel.recv_stderr(read_size)
+            logging.debug(f"Remote stderr: {output.decode('utf-8', errors='replace').rstrip()}")
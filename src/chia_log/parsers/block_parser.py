@@ -5,14 +5,16 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import List
 
-# lib
-from dateutil import parser as dateutil_parser
+# project
+from ..log_record import LogRecord
 
 
-@dataclass
+@dataclass(frozen=True)
 class BlockMessage:
     """Parsed information from full node logs"""
 
+    __slots__ = ("timestamp", "blocks_count")
+
     timestamp: datetime
     blocks_count: int
 
@@ -24,22 +26,24 @@ class BlockParser:
     The chia config.yaml is usually under ~/.chia/mainnet/config/config.yaml
     """
 
+    loggers = [("full_node", "full_node.full_node")]
+
     def __init__(self):
         logging.debug("Enabled parser for block found stats.")
-        self._regex = re.compile(
-            r"([0-9:.]*) (?:[-0-9a-zA-Z.]+ )?full_node (?:src|chia).full_node.full_node\s*: INFO\s* ((?:🍀 ️|.)\s*Farmed unfinished_block)"
-        )
+        self._regex = re.compile(r"(?:🍀 ️|.)\s*Farmed unfinished_block")
 
-    def parse(self, logs: str) -> List[BlockMessage]:
+    def parse(self, records: List[LogRecord]) -> List[BlockMessage]:
         """Parses all farmer activity messages from a bunch of logs
 
-        :param logs: String of logs - can be multi-line
+        :param records: Log records
         :returns: A list of parsed messages - can be empty
         """
 
         parsed_messages = []
-        matches = self._regex.findall(logs)
-        for match in matches:
-            parsed_messages.append(BlockMessage(timestamp=dateutil_parser.parse(match[0]), blocks_count=1))
+        for record in records:
+            if record.level != "INFO" or (record.service, record.module) not in self.loggers:
+                continue
+            if self._regex.match(record.message):
+                parsed_messages.append(BlockMessage(timestamp=record.timestamp, blocks_count=1))
 
         return parsed_messages
@@ -5,14 +5,16 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import List
 
-# lib
-from dateutil import parser as dateutil_parser
+# project
+from ..log_record import LogRecord
 
 
-@dataclass
+@dataclass(frozen=True)
 class FinishedSignagePointMessage:
     """Parsed information from full node logs"""
 
+    __slots__ = ("timestamp", "signage_point")
+
     timestamp: datetime
     signage_point: int
 
@@ -24,26 +26,28 @@ class FinishedSignagePointParser:
     The chia config.yaml is usually under ~/.chia/mainnet/config/config.yaml
     """
 
+    loggers = [("full_node", "full_node.full_node")]
+
     def __init__(self):
         logging.debug("Enabled parser for finished signage points.")
         # Doing some "smart" tricks with this expression to also match the 64th signage point
         # with the same regex expression. See test examples to see how they differ.
-        self._regex = re.compile(
-            r"([0-9:.]*) (?:[-0-9a-zA-Z.]+ )?full_node (?:src|chia).full_node.full_node(?:\s?): INFO\s*(?:⏲️|.)[a-z A-Z,]* ([0-9]*)\/64"
-        )
+        self._regex = re.compile(r"(?:⏲️|.)[a-z A-Z,]* ([0-9]*)\/64")
 
-    def parse(self, logs: str) -> List[FinishedSignagePointMessage]:
+    def parse(self, records: List[LogRecord]) -> List[FinishedSignagePointMessage]:
         """Parses all harvester activity messages from a bunch of logs
 
-        :param logs: String of logs - can be multi-line
+        :param records: Log records
         :returns: A list of parsed messages - can be empty
         """
 
         parsed_messages = []
-        matches = self._regex.findall(logs)
-        for match in matches:
-            parsed_messages.append(
-                FinishedSignagePointMessage(timestamp=dateutil_parser.parse(match[0]), signage_point=int(match[1]))
-            )
+        for record in records:
+            if record.level != "INFO" or (record.service, record.module) not in self.loggers:
+                continue
+            match = self._regex.match(record.message)
+            if match is None:
+                continue
+            parsed_messages.append(FinishedSignagePointMessage(timestamp=record.timestamp, signage_point=int(match[1])))
 
         return parsed_messages
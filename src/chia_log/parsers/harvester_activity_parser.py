@@ -1,18 +1,30 @@
 # std
 import re
 import logging
-from dataclasses import dataclass
+import sys
+from array import array
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import List
 
-# lib
-from dateutil import parser as dateutil_parser
+# project
+from ..log_record import LogRecord
+from ..timestamp import parse_timestamp
 
 
-@dataclass
+@dataclass(frozen=True)
 class HarvesterActivityMessage:
     """Parsed information from harvester logs"""
 
+    __slots__ = (
+        "timestamp",
+        "eligible_plots_count",
+        "challenge_hash",
+        "found_proofs_count",
+        "search_time_seconds",
+        "total_plots_count",
+    )
+
     timestamp: datetime
     eligible_plots_count: int
     challenge_hash: str
@@ -21,6 +33,32 @@ class HarvesterActivityMessage:
     total_plots_count: int
 
 
+@dataclass
+class HarvesterActivityColumns:
+    """Harvester activity of a whole log file in columns instead of a message object per line
+
+    The columns are typed arrays which can be aggregated in bulk and wrapped
+    without copying (e.g. numpy.frombuffer) for further analysis. Timestamps are
+    microseconds since the epoch, timestamps without UTC offset are local time.
+    """
+
+    timestamps: array = field(default_factory=lambda: array("q"))
+    eligible_plots_count: array = field(default_factory=lambda: array("q"))
+    found_proofs_count: array = field(default_factory=lambda: array("q"))
+    search_time_seconds: array = field(default_factory=lambda: array("d"))
+    total_plots_count: array = field(default_factory=lambda: array("q"))
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def extend(self, other: "HarvesterActivityColumns"):
+        self.timestamps.extend(other.timestamps)
+        self.eligible_plots_count.extend(other.eligible_plots_count)
+        self.found_proofs_count.extend(other.found_proofs_count)
+        self.search_time_seconds.extend(other.search_time_seconds)
+        self.total_plots_count.extend(other.total_plots_count)
+
+
 class HarvesterActivityParser:
     """This class can parse info log messages from the chia harvester
 
@@ -28,29 +66,40 @@ class HarvesterActivityParser:
     The chia config.yaml is usually under ~/.chia/mainnet/config/config.yaml
     """
 
+    loggers = [("harvester", "harvester.harvester")]
+
     def __init__(self):
         logging.debug("Enabled parser for harvester activity - eligible plot events.")
         self._regex = re.compile(
-            r"([0-9:.]*) (?:[-0-9a-zA-Z.]+ )?harvester (?:src|chia).harvester.harvester(?:\s?): INFO\s*([0-9]+) plots were "
-            r"eligible for farming ([0-9a-z.]*) Found ([0-9]) proofs. Time: ([0-9.]*) s. "
+            r"([0-9]+) plots were eligible for farming ([0-9a-z.]*) Found ([0-9]) proofs. Time: ([0-9.]*) s. "
             r"Total ([0-9]*) plots"
         )
+        # Used for bulk parsing of raw logs. Starting with a literal lets the regex engine skip
+        # through all the unrelated lines quickly, the timestamp is looked up afterwards.
+        self._line_regex = re.compile(
+            r" harvester (?:chia|src)\.harvester\.harvester\s*: INFO\s*" + self._regex.pattern
+        )
 
-    def parse(self, logs: str) -> List[HarvesterActivityMessage]:
+    def parse(self, records: List[LogRecord]) -> List[HarvesterActivityMessage]:
         """Parses all harvester activity messages from a bunch of logs
 
-        :param logs: String of logs - can be multi-line
+        :param records: Log records
         :returns: A list of parsed messages - can be empty
         """
 
         parsed_messages = []
-        matches = self._regex.findall(logs)
-        for match in matches:
+        for record in records:
+            if record.level != "INFO" or (record.service, record.module) not in self.loggers:
+                continue
+            match = self._regex.match(record.message)
+            if match is None:
+                continue
             parsed_messages.append(
                 HarvesterActivityMessage(
-                    timestamp=dateutil_parser.parse(match[0]),
+                    timestamp=record.timestamp,
                     eligible_plots_count=int(match[1]),
-                    challenge_hash=match[2],
+                    # The same challenge is logged for every signage point, keep a single copy
+                    challenge_hash=sys.intern(match[2]),
                     found_proofs_count=int(match[3]),
                     search_time_seconds=float(match[4]),
                     total_plots_count=int(match[5]),
@@ -58,3 +107,32 @@ class HarvesterActivityParser:
             )
 
         return parsed_messages
+
+    def parse_columns(self, logs: str) -> HarvesterActivityColumns:
+        """Parses all harvester activity messages from raw logs into columns
+
+        This is meant for backfilling from (large) historical log files where
+        creating a message object for every line would be too slow.
+
+        :param logs: String of logs - can be multi-line
+        :returns: Columns with one entry per parsed message - can be empty
+        """
+
+        columns = HarvesterActivityColumns()
+        for match in self._line_regex.finditer(logs):
+            line_start = logs.rfind("\n", 0, match.start()) + 1
+            # Only the timestamp and optional hostname may precede the service
+            if logs.count(" ", line_start, match.start()) > 1:
+                continue
+            timestamp_end = logs.find(" ", line_start, match.start() + 1)
+            try:
+                timestamp = parse_timestamp(logs[line_start:timestamp_end])
+            except ValueError:
+                continue
+            columns.timestamps.append(round(timestamp.timestamp() * 1_000_000))
+            columns.eligible_plots_count.append(int(match[1]))
+            columns.found_proofs_count.append(int(match[3]))
+            columns.search_time_seconds.append(float(match[4]))
+            columns.total_plots_count.append(int(match[5]))
+
+        return columns
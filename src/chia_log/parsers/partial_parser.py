@@ -5,14 +5,16 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import List
 
-# lib
-from dateutil import parser as dateutil_parser
+# project
+from ..log_record import LogRecord
 
 
-@dataclass
+@dataclass(frozen=True)
 class PartialMessage:
     """Parsed information from full node logs"""
 
+    __slots__ = ("timestamp", "partials_count")
+
     timestamp: datetime
     partials_count: int
 
@@ -24,20 +26,24 @@ class PartialParser:
     The chia config.yaml is usually under ~/.chia/mainnet/config/config.yaml
     """
 
+    loggers = [("farmer", "farmer.farmer")]
+
     def __init__(self):
         logging.debug("Enabled parser for partial submitting stats.")
-        self._regex = re.compile(r"([0-9:.]*) (?:[-0-9a-zA-Z.]+ )?farmer (?:src|chia).farmer.farmer\s*: INFO\s* (Submitting partial)")
+        self._regex = re.compile(r"Submitting partial")
 
-    def parse(self, logs: str) -> List[PartialMessage]:
+    def parse(self, records: List[LogRecord]) -> List[PartialMessage]:
         """Parses all farmer activity messages from a bunch of logs
 
-        :param logs: String of logs - can be multi-line
+        :param records: Log records
         :returns: A list of parsed messages - can be empty
         """
 
         parsed_messages = []
-        matches = self._regex.findall(logs)
-        for match in matches:
-            parsed_messages.append(PartialMessage(timestamp=dateutil_parser.parse(match[0]), partials_count=1))
+        for record in records:
+            if record.level != "INFO" or (record.service, record.module) not in self.loggers:
+                continue
+            if self._regex.match(record.message):
+                parsed_messages.append(PartialMessage(timestamp=record.timestamp, partials_count=1))
 
         return parsed_messages
@@ -5,12 +5,14 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import List
 
-# lib
-from dateutil import parser as dateutil_parser
+# project
+from ..log_record import LogRecord
 
 
-@dataclass
+@dataclass(frozen=True)
 class WalletAddedCoinMessage:
+    __slots__ = ("timestamp", "amount_mojos")
+
     timestamp: datetime
     amount_mojos: int
 
@@ -22,26 +24,31 @@ class WalletAddedCoinParser:
     The chia config.yaml is usually under ~/.chia/mainnet/config/config.yaml
     """
 
+    loggers = [("wallet", "wallet.wallet_state_manager"), ("wallet", "wallet.wallet_node")]
+
     def __init__(self):
         logging.debug("Enabled parser for wallet activity - added coins.")
         self._regex = re.compile(
-            r"([0-9:.]*) (?:[-0-9a-zA-Z.]+ )?wallet (?:src|chia).wallet.wallet_(?:state_manager|node)(?:\s*)?: "
-            r"INFO\s*(?:Adding|Adding record to state manager|request) coin: (?:.*)'?amount'?: ([0-9]*)(\s})?,"
+            r"(?:Adding|Adding record to state manager|request) coin: (?:.*)'?amount'?: ([0-9]*)(\s})?,"
         )
 
-    def parse(self, logs: str) -> List[WalletAddedCoinMessage]:
+    def parse(self, records: List[LogRecord]) -> List[WalletAddedCoinMessage]:
         """Parses all harvester activity messages from a bunch of logs
 
-        :param logs: String of logs - can be multi-line
+        :param records: Log records
         :returns: A list of parsed messages - can be empty
         """
 
         parsed_messages = []
-        matches = self._regex.findall(logs)
-        for match in matches:
+        for record in records:
+            if record.level != "INFO" or (record.service, record.module) not in self.loggers:
+                continue
+            match = self._regex.match(record.message)
+            if match is None:
+                continue
             parsed_messages.append(
                 WalletAddedCoinMessage(
-                    timestamp=dateutil_parser.parse(match[0]),
+                    timestamp=record.timestamp,
                     amount_mojos=int(match[1]),
                 )
             )
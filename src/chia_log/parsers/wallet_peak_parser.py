@@ -1,14 +1,18 @@
 # std
 import re
 import logging
-import dateutil.parser
 from dataclasses import dataclass
 import datetime
 from typing import List
 
+# project
+from ..log_record import LogRecord
 
-@dataclass
+
+@dataclass(frozen=True)
 class WalletPeakMessage:
+    __slots__ = ("peak", "peak_time", "log_time")
+
     peak: int  # Wallet peak at logline
     peak_time: datetime.datetime  # peak datetime
     log_time: datetime.datetime  # log line datetime
@@ -24,27 +28,29 @@ class WalletPeakParser:
     2023-01-31T12:56:41.725 wallet chia.wallet.wallet_blockchain: INFO     Peak set to: 3183522 timestamp: 1675162567
     """
 
+    loggers = [("wallet", "wallet.wallet_blockchain")]
+
     def __init__(self):
         logging.debug("Enabled parser for wallet activity - peak age.")
-        self._regex = re.compile(
-            r"([0-9:.T\-\+]*)"
-            r" (?:[-0-9a-zA-Z.]+ )?wallet (?:src|chia)\.wallet\.wallet_blockchain(?:\s*)?: INFO\s+"
-            r"Peak set to: ([0-9]+) timestamp: ([0-9]+)"
-        )
+        self._regex = re.compile(r"Peak set to: ([0-9]+) timestamp: ([0-9]+)")
 
-    def parse(self, logs: str) -> List[WalletPeakMessage]:
+    def parse(self, records: List[LogRecord]) -> List[WalletPeakMessage]:
         """Parses wallet peak activity messages from a bunch of logs
 
-        :param logs: String of logs - can be multi-line
+        :param records: Log records
         :returns: A list of parsed messages - can be empty
         """
 
         parsed_messages = []
-        matches = self._regex.findall(logs)
-        for match in matches:
+        for record in records:
+            if record.level != "INFO" or (record.service, record.module) not in self.loggers:
+                continue
+            match = self._regex.match(record.message)
+            if match is None:
+                continue
             peak = int(match[1])
 
-            log_time = dateutil.parser.parse(match[0])
+            log_time = record.timestamp
             # The log_time may or may not be TZ aware based on Chia version.
             # Peak timestamps are always UTC but we need a TZ aware time if the log time is TZ aware
             if log_time.tzinfo is None or log_time.tzinfo.utcoffset(log_time) is None:
@@ -0,0 +1,188 @@
+"""Decouples reading logs from handling them.
+
+Handlers run notifiers, which make network requests. Without a queue in
+between, a slow notifier would hold up reading the logs (and for network
+consumers, make the remote end buffer them).
+"""
+
+# std
+import logging
+from collections import deque
+from dataclasses import dataclass
+from threading import Condition, Thread
+from time import monotonic
+from typing import Deque, List, Optional, Tuple
+
+# lib
+import confuse
+from confuse import ConfigView
+
+# project
+from src.chia_log.log_consumer import LogConsumer, LogConsumerSubscriber
+from src.chia_log.log_record import LogRecord
+
+queued_log_consumer_template = {
+    "enable": bool,
+    "max_batches": confuse.Integer(),
+    "when_full": confuse.Choice(["block", "drop_oldest"]),
+}
+
+
+@dataclass(frozen=True)
+class QueueStats:
+    """Snapshot of the queue, rates are per second since the previous snapshot"""
+
+    depth: int
+    max_depth: int
+    enqueued: int
+    dequeued: int
+    dropped: int
+    enqueue_rate: float
+    dequeue_rate: float
+
+
+class QueuedLogConsumer(LogConsumer, LogConsumerSubscriber):
+    """Hands the batches of another consumer to its subscribers on a worker thread
+
+    Batches wait in a bounded queue. When it's full, reading either blocks
+    until the subscribers caught up or the oldest batch is dropped to make
+    room, depending on the policy.
+
+    Subscribers asking for is_catching_up get the answer that was valid
+    when the batch at hand was read.
+    """
+
+    # Stats are logged at most this often
+    stats_interval_seconds = 600
+
+    def __init__(self, log_consumer: LogConsumer, max_batches: int = 100, drop_oldest: bool = False):
+        super().__init__()
+        self._log_consumer = log_consumer
+        self._max_batches = max_batches
+        self._drop_oldest = drop_oldest
+        self._queue: Deque[Tuple[List[LogRecord], bool]] = deque()
+        self._condition = Condition()
+        self._delivering_catching_up = False
+
+        self._max_depth = 0
+        self._enqueued = 0
+        self._dequeued = 0
+        self._dropped = 0
+        self._last_stats: Tuple[float, int, int] = (monotonic(), 0, 0)
+        self._last_stats_log_time = monotonic()
+        self._last_logged_dropped = 0
+
+        self._is_running = True
+        self._thread = Thread(target=self._deliver_loop, name="QueuedLogConsumer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        # Release the wrapped consumer first in case it's blocked on a full queue
+        with self._condition:
+            self._is_running = False
+            if self._queue:
+                logging.debug(f"Discarding {len(self._queue)} queued batches of logs")
+            self._queue.clear()
+            self._condition.notify_all()
+        self._log_consumer.stop()
+
+    def subscribe(self, subscriber: LogConsumerSubscriber):
+        is_first_subscriber = not self._subscribers
+        super().subscribe(subscriber)
+        # The wrapped consumer starts consuming once subscribed to
+        if is_first_subscriber:
+            self._log_consumer.subscribe(self)
+
+    @property
+    def is_catching_up(self) -> bool:
+        return self._delivering_catching_up
+
+    @property
+    def lag_bytes(self) -> Optional[int]:
+        return self._log_consumer.lag_bytes
+
+    def loggers(self) -> Optional[List[Tuple[str, str]]]:
+        return self._loggers()
+
+    def consume_logs(self, records: List[LogRecord]):
+        # Called while the wrapped consumer delivers, it knows whether this batch is historical
+        batch = (records, self._log_consumer.is_catching_up)
+        with self._condition:
+            while self._is_running and len(self._queue) >= self._max_batches:
+                if self._drop_oldest:
+                    self._queue.popleft()
+                    self._dropped += 1
+                else:
+                    self._condition.wait()
+            if not self._is_running:
+                return
+            self._queue.append(batch)
+            self._enqueued += 1
+            self._max_depth = max(self._max_depth, len(self._queue))
+            self._condition.notify_all()
+
+    def stats(self) -> QueueStats:
+        with self._condition:
+            now = monotonic()
+            last_time, last_enqueued, last_dequeued = self._last_stats
+            elapsed = max(now - last_time, 1e-9)
+            stats = QueueStats(
+                depth=len(self._queue),
+                max_depth=self._max_depth,
+                enqueued=self._enqueued,
+                dequeued=self._dequeued,
+                dropped=self._dropped,
+                enqueue_rate=(self._enqueued - last_enqueued) / elapsed,
+                dequeue_rate=(self._dequeued - last_dequeued) / elapsed,
+            )
+            self._last_stats = (now, self._enqueued, self._dequeued)
+            return stats
+
+    def _deliver_loop(self):
+        while True:
+            with self._condition:
+                while self._is_running and not self._queue:
+                    self._condition.wait()
+                if not self._is_running:
+                    return
+                records, is_catching_up = self._queue.popleft()
+                self._dequeued += 1
+                self._condition.notify_all()
+
+            self._delivering_catching_up = is_catching_up
+            self._last_timestamp = records[-1].timestamp
+            for subscriber in self._subscribers:
+                try:
+                    subscriber.consume_logs(records)
+                except Exception:
+                    # Keep delivering, otherwise reading would wait for room in the queue forever
+                    logging.exception(f"Failed to handle a batch of {len(records)} log records")
+            self._log_stats_if_due()
+
+    def _log_stats_if_due(self):
+        if monotonic() - self._last_stats_log_time < self.stats_interval_seconds:
+            return
+        self._last_stats_log_time = monotonic()
+        stats = self.stats()
+        message = (
+            f"Log queue: {stats.depth} batches queued (max {stats.max_depth}), "
+            f"{stats.enqueue_rate:.1f} in/s, {stats.dequeue_rate:.1f} out/s, {stats.dropped} dropped"
+        )
+        if stats.dropped > self._last_logged_dropped:
+            logging.warning(message + ", handlers can't keep up with the logs")
+        else:
+            logging.debug(message)
+        self._last_logged_dropped = stats.dropped
+
+
+def create_queued_log_consumer_from_config(config: ConfigView, log_consumer: LogConsumer) -> LogConsumer:
+    valid_config = config.get(queued_log_consumer_template)
+    if not valid_config["enable"]:
+        return log_consumer
+
+    drop_oldest = valid_config["when_full"] == "drop_oldest"
+    logging.debug(
+        f"Queueing up to {valid_config['max_batches']} batches of logs for the handlers, "
+        f"{'dropping the oldest' if drop_oldest else 'blocking'} when full"
+    )
+    return QueuedLogConsumer(log_consumer, max_batches=valid_config["max_batches"], drop_oldest=drop_oldest)
@@ -0,0 +1,181 @@
+"""SSH connections to remote harvesters.
+
+Everything chiadog does on a remote host (probing the platform, following
+or reading the log file) goes through a single paramiko transport per host, which is
+kept alive and reconnected whenever it drops.
+"""
+
+# std
+import logging
+import random
+from enum import Enum
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+# lib
+import paramiko
+from paramiko import Channel
+
+
+class SshSessionState(Enum):
+    DISCONNECTED = "DISCONNECTED"
+    CONNECTING = "CONNECTING"
+    CONNECTED = "CONNECTED"
+
+
+class SshSession:
+    """Connection to a single remote host
+
+    Keepalives are sent on idle connections so that a dead connection (or
+    a NAT that forgot about it) is noticed and the channels on it see EOF.
+    Whoever notices can reconnect after waiting backoff_seconds(), which
+    grows exponentially with consecutive failures and is jittered so that
+    many harvesters don't reconnect in lockstep after an outage.
+
+    Compression trades CPU time for bandwidth, it pays off for verbose
+    logs over slow links.
+    """
+
+    keepalive_seconds = 15
+    connect_timeout_seconds = 10
+    min_backoff_seconds = 1.0
+    max_backoff_seconds = 300.0
+
+    def __init__(self, host: str, user: str, port: int, compress: bool = False):
+        self.host = host
+        self.user = user
+        self.port = port
+        self.compress = compress
+        self.state = SshSessionState.DISCONNECTED
+        # Successful connections after the first one
+        self.reconnect_count = 0
+        self._client: Optional[paramiko.client.SSHClient] = None
+        self._has_connected = False
+        self._consecutive_failures = 0
+        self._lock = Lock()
+
+    def __str__(self) -> str:
+        return f"{self.user}@{self.host}:{self.port}"
+
+    @property
+    def is_connected(self) -> bool:
+        if self.state != SshSessionState.CONNECTED or self._client is None:
+            return False
+        transport = self._client.get_transport()
+        return transport is not None and transport.is_active()
+
+    def connect(self):
+        """Connect unless already connected, blocks until done
+
+        :raises paramiko.SSHException, OSError: If connecting failed
+        """
+        with self._lock:
+            if self.is_connected:
+                return
+            self._close_client()
+            self.state = SshSessionState.CONNECTING
+            logging.info(f"Connecting to {self}")
+            try:
+                self._client = self._create_client()
+            except (paramiko.SSHException, OSError):
+                self.state = SshSessionState.DISCONNECTED
+                self._consecutive_failures += 1
+                raise
+
+            if self._has_connected:
+                self.reconnect_count += 1
+            self._has_connected = True
+            self._consecutive_failures = 0
+            self.state = SshSessionState.CONNECTED
+
+    def _create_client(self) -> paramiko.client.SSHClient:
+        client = paramiko.client.SSHClient()
+        client.load_system_host_keys()
+        client.connect(
+            hostname=self.host,
+            username=self.user,
+            port=self.port,
+            timeout=self.connect_timeout_seconds,
+            compress=self.compress,
+        )
+        transport = client.get_transport()
+        assert transport is not None
+        transport.set_keepalive(self.keepalive_seconds)
+        return client
+
+    def exec_command(self, command: str) -> Channel:
+        """Run a command on the remote host, connecting first if needed
+
+        :returns: Channel with the output of the command
+        :raises paramiko.SSHException, OSError: If the command couldn't be started
+        """
+        self.connect()
+        assert self._client is not None
+        try:
+            stdin, stdout, stderr = self._client.exec_command(command)
+        except (paramiko.SSHException, OSError):
+            self.disconnect()
+            raise
+        return stdout.channel
+
+    def open_sftp(self) -> paramiko.SFTPClient:
+        """Open an SFTP session on the connection, connecting first if needed
+
+        :raises paramiko.SSHException, OSError: If the SFTP session couldn't be opened
+        """
+        self.connect()
+        assert self._client is not None
+        try:
+            return self._client.open_sftp()
+        except (paramiko.SSHException, OSError):
+            self.disconnect()
+            raise
+
+    def disconnect(self):
+        """Close the connection after it failed, the next command reconnects"""
+        with self._lock:
+            self._close_client()
+            if self.state == SshSessionState.CONNECTED:
+                logging.warning(f"Lost connection to {self}")
+                self._consecutive_failures += 1
+            self.state = SshSessionState.DISCONNECTED
+
+    def backoff_seconds(self) -> float:
+        """How long to wait before trying to reconnect"""
+        exponent = min(max(self._consecutive_failures - 1, 0), 16)
+        delay = min(self.max_backoff_seconds, self.min_backoff_seconds * 2**exponent)
+        return random.uniform(delay / 2, delay)
+
+    def close(self):
+        with self._lock:
+            self._close_client()
+            self.state = SshSessionState.DISCONNECTED
+
+    def _close_client(self):
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+
+class SshSessionManager:
+    """Hands out one session per remote host, user and compression setting"""
+
+    def __init__(self):
+        self._sessions: Dict[Tuple[str, str, int, bool], SshSession] = {}
+        self._lock = Lock()
+
+    def session(self, host: str, user: str, port: int, compress: bool = False) -> SshSession:
+        with self._lock:
+            key = (host, user, port, compress)
+            if key not in self._sessions:
+                self._sessions[key] = SshSession(host, user, port, compress)
+            return self._sessions[key]
+
+    @property
+    def sessions(self) -> List[SshSession]:
+        with self._lock:
+            return list(self._sessions.values())
+
+    def close(self):
+        for session in self.sessions:
+            session.close()
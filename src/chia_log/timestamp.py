@@ -0,0 +1,31 @@
+"""Fast parsing of chia log timestamps.
+
+Chia writes timestamps in a fixed ISO 8601 layout, e.g. 2023-02-05T17:29:29.434,
+optionally followed by an UTC offset (+02:00). Older versions only logged the
+time of the day (17:29:29.434). Both are handled by the C implemented
+fromisoformat functions which are orders of magnitude faster than dateutil.
+Anything unexpected is still handed to dateutil.
+"""
+
+# std
+from datetime import date, datetime, time
+
+# lib
+from dateutil import parser as dateutil_parser
+
+
+def parse_timestamp(value: str) -> datetime:
+    """Parse a timestamp from the chia logs
+
+    The result is TZ aware only if the timestamp includes an UTC offset.
+    Timestamps without date are assumed to be from today (like dateutil does).
+
+    :param value: Timestamp as found in the logs
+    :returns: Parsed datetime
+    """
+    try:
+        if len(value) > 10 and value[10] == "T":
+            return datetime.fromisoformat(value)
+        return datetime.combine(date.today(), time.fromisoformat(value))
+    except ValueError:
+        return dateutil_parser.parse(value)
@@ -5,7 +5,7 @@
 # std
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import List
+from typing import List, Optional
 from enum import Enum
 import logging
 
@@ -13,6 +13,10 @@ import logging
 import confuse
 from confuse import ConfigView
 
+# project
+from .http_connection_pool import HttpConnectionPool
+from .rate_limiter import RateLimit
+
 
 class EventPriority(Enum):
     """Event priority dictates how urgently
@@ -65,6 +69,11 @@ class Event:
     priority: EventPriority
     service: EventService
     message: str
+    # Only worth notifying about while it's happening, i.e. not
+    # when catching up with logs written while chiadog was down
+    realtime_only: bool = False
+    # Name of the log source the event originates from if there are several
+    source: Optional[str] = None
 
 
 class Notifier(ABC):
@@ -74,10 +83,20 @@ class Notifier(ABC):
     Pushover, E-mail, Slack, WhatsApp, etc
     """
 
+    # Documented limits of the service, None if there's none to worry about
+    default_rate_limit: Optional[RateLimit] = None
+    # Longest message the service accepts, events are only merged up to this
+    max_message_length: Optional[int] = None
+    # Whether the events given at once are sent in a single notification,
+    # so that they're either all delivered or none of them
+    combine_events = False
+
     def __init__(self, title_prefix: str, config: ConfigView):
         self._title_prefix = title_prefix
         self._config = config
         self._conn_timeout_seconds = 10
+        # Replaced by the pool shared by all notifiers when managed by the NotifyManager
+        self._http_pool = HttpConnectionPool(timeout_seconds=self._conn_timeout_seconds)
         self._notification_types = [EventType.USER]
         self._notification_services = [EventService.HARVESTER, EventService.FARMER, EventService.FULL_NODE]
 
@@ -98,6 +117,27 @@ class Notifier(ABC):
         if increasing_plot_events:
             self._notification_types.append(EventType.PLOTINCREASE)
 
+        self.rate_limit = self.default_rate_limit
+        try:
+            rate_limit = config["rate_limit"].get(dict)
+            per_minute = float(rate_limit["per_minute"])
+            if per_minute <= 0:
+                raise ValueError("per_minute must be positive")
+            self.rate_limit = RateLimit(per_minute=per_minute, burst=int(rate_limit["burst"]))
+        except confuse.exceptions.NotFoundError:
+            pass
+        except (KeyError, ValueError) as e:
+            logging.error(f"Invalid rate_limit in config.yaml, using default: {e}")
+
+        # Similar events within the window are summarized in one notification
+        self.digest_window_seconds = 0.0
+        self.digest_high_priority = False
+        try:
+            self.digest_window_seconds = config["digest_window_seconds"].get(confuse.Number())
+            self.digest_high_priority = config["digest_high_priority"].get(bool)
+        except confuse.exceptions.NotFoundError:
+            pass
+
     def get_title_for_event(self, event):
         icon = ""
         if event.priority == EventPriority.HIGH:
@@ -109,6 +149,17 @@ class Notifier(ABC):
 
         return f"{icon} {self._title_prefix} {event.service.name}"
 
+    def use_http_pool(self, http_pool: HttpConnectionPool):
+        self._http_pool = http_pool
+
+    def close(self):
+        """Release connections or processes kept between notifications"""
+        pass
+
+    def is_subscribed(self, event_type: EventType, service: EventService) -> bool:
+        """Whether the notifier is configured to receive such events"""
+        return event_type in self._notification_types and service in self._notification_services
+
     @abstractmethod
     def send_events_to_user(self, events: List[Event]) -> bool:
         """Implementation specific to the integration"""
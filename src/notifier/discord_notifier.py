@@ -1,5 +1,4 @@
 # std
-import http.client
 import logging
 import urllib.parse
 from typing import List
@@ -9,9 +8,14 @@ from confuse import ConfigView
 
 # project
 from . import Notifier, Event, EventPriority
+from .rate_limiter import RateLimit, RateLimitedError
 
 
 class DiscordNotifier(Notifier):
+    # Webhooks allow 5 requests per 2 seconds and 30 per minute per channel
+    default_rate_limit = RateLimit(per_minute=30, burst=5)
+    max_message_length = 1900
+
     def __init__(self, title_prefix: str, config: ConfigView):
         logging.info("Initializing Discord notifier.")
         super().__init__(title_prefix, config)
@@ -28,11 +32,9 @@ class DiscordNotifier(Notifier):
                 content = f"**{self.get_title_for_event(event)}**\n{event.message}"
                 if event.priority == EventPriority.HIGH:
                     content += "\n@here"
-                o = urllib.parse.urlparse(self.webhook_url)
-                conn = http.client.HTTPSConnection(o.netloc, timeout=self._conn_timeout_seconds)
-                conn.request(
+                response = self._http_pool.request(
                     "POST",
-                    o.path,
+                    self.webhook_url,
                     urllib.parse.urlencode(
                         {
                             "username": "chiadog",
@@ -41,10 +43,10 @@ class DiscordNotifier(Notifier):
                     ),
                     {"Content-type": "application/x-www-form-urlencoded"},
                 )
-                response = conn.getresponse()
+                if response.getcode() == 429:
+                    raise RateLimitedError(response.retry_after_seconds())
                 if response.getcode() != 204:
                     logging.warning(f"Problem sending event to user, code: {response.getcode()}")
                     errors = True
-                conn.close()
 
         return not errors
@@ -0,0 +1,80 @@
+"""Merging events that pile up into fewer notifications."""
+
+# std
+import re
+from dataclasses import replace
+from typing import Dict, List, Optional, Tuple
+
+# project
+from . import Event, EventPriority, EventService, EventType
+
+# Events that can be merged into one notification
+EventGroup = Tuple[EventType, EventService, EventPriority, Optional[str], bool]
+
+# Numbers in messages, e.g. durations or plot counts
+_NUMBER = re.compile(r"-?\d+(?:\.\d+)?")
+# Stands in for the numbers of a message
+_PLACEHOLDER = "\x00"
+
+
+def group_events(events: List[Event]) -> Dict[EventGroup, List[Event]]:
+    """Group events of the same type, service, priority and source, in order of appearance"""
+    groups: Dict[EventGroup, List[Event]] = {}
+    for event in events:
+        key = (event.type, event.service, event.priority, event.source, event.realtime_only)
+        groups.setdefault(key, []).append(event)
+    return groups
+
+
+def coalesce_events(events: List[Event], max_message_length: Optional[int] = None) -> List[Event]:
+    """Join the messages of similar events, one per line
+
+    :param max_message_length: Longest message the notifier can send, a joined
+        message is split before exceeding it
+    :returns: As few events as possible with all the messages
+    """
+    coalesced: List[Event] = []
+    for group in group_events(events).values():
+        messages: List[str] = []
+        for event in group:
+            joined = "\n".join(messages + [event.message])
+            if messages and max_message_length is not None and len(joined) > max_message_length:
+                coalesced.append(replace(group[0], message="\n".join(messages)))
+                messages = []
+            messages.append(event.message)
+        coalesced.append(replace(group[0], message="\n".join(messages)))
+    return coalesced
+
+
+def digest_events(events: List[Event]) -> List[Event]:
+    """Summarize similar events in one event each
+
+    Messages that only differ in their numbers (e.g. "Seeking plots took
+    too long: 31.2 seconds!") become a single line with the range of each
+    number and how often it occurred. Other messages are kept as they are.
+    """
+    digested: List[Event] = []
+    for group in group_events(events).values():
+        if len(group) == 1:
+            digested.append(group[0])
+            continue
+
+        # Keyed by the message without its numbers
+        numbers: Dict[str, List[List[str]]] = {}
+        for event in group:
+            numbers.setdefault(_NUMBER.sub(_PLACEHOLDER, event.message), []).append(_NUMBER.findall(event.message))
+        lines = [_summarize(template, occurrences) for template, occurrences in numbers.items()]
+        digested.append(replace(group[0], message="\n".join(lines)))
+    return digested
+
+
+def _summarize(template: str, occurrences: List[List[str]]) -> str:
+    """Fill in the range of each number, followed by the count"""
+    ranges = []
+    for values in zip(*occurrences):
+        low = min(values, key=float)
+        high = max(values, key=float)
+        ranges.append(low if float(low) == float(high) else f"{low} to {high}")
+    parts = template.split(_PLACEHOLDER)
+    line = parts[0] + "".join(value + part for value, part in zip(ranges, parts[1:]))
+    return line if len(occurrences) == 1 else f"{line} ({len(occurrences)} times)"
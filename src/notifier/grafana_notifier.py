@@ -1,11 +1,9 @@
 # std
-import http.client
 import logging
 import json
 import urllib.parse
 import re
 from datetime import datetime, timedelta
-from http.client import HTTPConnection, HTTPResponse
 from typing import List, Tuple
 from urllib.parse import ParseResult
 
@@ -14,6 +12,7 @@ from confuse import ConfigView
 
 # project
 from . import Notifier, Event
+from .http_connection_pool import HttpResponse
 
 
 class GrafanaNotifier(Notifier):
@@ -93,7 +92,7 @@ class GrafanaNotifier(Notifier):
             logging.warning(f"Problem sending event to user, code: {response.getcode()}")
             return False
         else:
-            result = json.loads(response.read().decode("utf-8"))
+            result = json.loads(response.body.decode("utf-8"))
             if event.message.find("Your harvester appears to be offline") >= 0:
                 self._offline_annotation_id = result["id"]
                 self._offline_duration = duration
@@ -110,33 +109,20 @@ class GrafanaNotifier(Notifier):
 
         return self._get_milliseconds(now), self._get_milliseconds(now), 0
 
-    def _get_connection(self, endpoint: ParseResult) -> HTTPConnection:
+    def _send_request(self, method: str, endpoint: ParseResult, payload: dict) -> HttpResponse:
         if endpoint.scheme == "http":
-            conn = http.client.HTTPConnection(endpoint.netloc, timeout=self._conn_timeout_seconds)
             logging.warning("The HTTP protocol is insecure. Consider using HTTPS to connect to Grafana.")
-        elif endpoint.scheme == "https":
-            conn = http.client.HTTPSConnection(endpoint.netloc, timeout=self._conn_timeout_seconds)
-        else:
-            raise ValueError(f"Expected an HTTP or HTTPS URL, instead got {endpoint.scheme} which is unsupported")
-
-        return conn
-
-    def _send_request(self, method: str, endpoint: ParseResult, payload: dict) -> HTTPResponse:
         request_body = json.dumps(payload)
-        conn = self._get_connection(endpoint)
-        conn.request(
-            method=method,
-            url=endpoint.path,
-            body=request_body,
-            headers={
+        return self._http_pool.request(
+            method,
+            endpoint.geturl(),
+            request_body,
+            {
                 "Content-Type": "application/json",
                 "Accept": "application/json",
                 "Authorization": f"Bearer {self._api_token}",
             },
         )
-        response = conn.getresponse()
-
-        return response
 
     @staticmethod
     def _get_milliseconds(time: datetime) -> int:
@@ -0,0 +1,177 @@
+"""Keep-alive HTTP connections for the notifiers.
+
+Opening a connection per notification costs a TCP and TLS handshake each
+time. Bursts of events (e.g. many plots disappearing at once) are sent
+over the same connection instead, and services used by several notifiers
+share them.
+"""
+
+# std
+import http.client
+import json
+import logging
+import select
+import socket
+import time
+import urllib.parse
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from http.client import HTTPConnection, HTTPMessage
+from threading import Lock
+from typing import Deque, Dict, Optional, Tuple, Union
+
+# Connections are kept per scheme and host (including the port)
+PoolKey = Tuple[str, str]
+
+
+@dataclass
+class HttpResponse:
+    """Response read in full, so that the connection can be reused right away"""
+
+    status: int
+    headers: HTTPMessage
+    body: bytes
+
+    def getcode(self) -> int:
+        return self.status
+
+    def retry_after_seconds(self) -> Optional[float]:
+        """How long to wait after being rate limited, if the server said so"""
+        retry_after = self.headers.get("Retry-After")
+        if retry_after is not None:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+            try:
+                return max((parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds(), 0.0)
+            except (TypeError, ValueError):
+                pass
+        # Telegram and Discord tell in the body (as well)
+        try:
+            body = json.loads(self.body.decode("UTF-8"))
+        except ValueError:
+            return None
+        if not isinstance(body, dict):
+            return None
+        retry_after = body.get("retry_after", body.get("parameters", {}).get("retry_after"))
+        return float(retry_after) if isinstance(retry_after, (int, float)) else None
+
+
+class HttpConnectionPool:
+    """Hands out idle connections per host and opens new ones as needed
+
+    Idle connections are dropped once the server probably closed them
+    (after idle_timeout_seconds) or if it evidently did. A request that
+    fails on a reused connection because the server closed it in the
+    meantime is retried once on a fresh connection.
+
+    Thread-safe, concurrent requests to the same host use separate connections.
+    """
+
+    max_idle_per_host = 4
+    # Lower than the keep-alive timeout of common servers
+    idle_timeout_seconds = 30.0
+
+    def __init__(self, timeout_seconds: float = 10):
+        self._timeout_seconds = timeout_seconds
+        self._idle: Dict[PoolKey, Deque[Tuple[HTTPConnection, float]]] = {}
+        self._lock = Lock()
+        self.connections_opened = 0
+        self.requests_sent = 0
+
+    def request(
+        self, method: str, url: str, body: Union[str, bytes, None] = None, headers: Optional[Dict[str, str]] = None
+    ) -> HttpResponse:
+        """Send a request and read the response
+
+        :raises http.client.HTTPException, OSError: If the request failed
+        """
+        endpoint = urllib.parse.urlsplit(url)
+        key = (endpoint.scheme, endpoint.netloc)
+        path = endpoint.path or "/"
+        if endpoint.query:
+            path += "?" + endpoint.query
+
+        conn = self._take_idle(key)
+        if conn is not None:
+            try:
+                return self._send(key, conn, method, path, body, headers)
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError) as e:
+                logging.debug(f"Reused connection to {endpoint.netloc} was closed ({e}), reconnecting")
+        return self._send(key, self._connect(key), method, path, body, headers)
+
+    def close(self):
+        with self._lock:
+            idle = [conn for connections in self._idle.values() for conn, _ in connections]
+            self._idle.clear()
+        for conn in idle:
+            conn.close()
+
+    def _send(
+        self,
+        key: PoolKey,
+        conn: HTTPConnection,
+        method: str,
+        path: str,
+        body: Union[str, bytes, None],
+        headers: Optional[Dict[str, str]],
+    ) -> HttpResponse:
+        try:
+            conn.request(method, path, body, headers or {})
+            response = conn.getresponse()
+            result = HttpResponse(status=response.status, headers=response.headers, body=response.read())
+        except Exception:
+            conn.close()
+            raise
+        with self._lock:
+            self.requests_sent += 1
+        self._put_idle(key, conn)
+        return result
+
+    def _connect(self, key: PoolKey) -> HTTPConnection:
+        scheme, netloc = key
+        if scheme == "http":
+            conn = http.client.HTTPConnection(netloc, timeout=self._timeout_seconds)
+        elif scheme == "https":
+            conn = http.client.HTTPSConnection(netloc, timeout=self._timeout_seconds)
+        else:
+            raise ValueError(f"Expected an HTTP or HTTPS URL, instead got {scheme} which is unsupported")
+        with self._lock:
+            self.connections_opened += 1
+        return conn
+
+    def _take_idle(self, key: PoolKey) -> Optional[HTTPConnection]:
+        while True:
+            with self._lock:
+                connections = self._idle.get(key)
+                if not connections:
+                    return None
+                conn, idle_since = connections.pop()
+            if time.monotonic() - idle_since < self.idle_timeout_seconds and not self._is_dropped(conn):
+                return conn
+            conn.close()
+
+    def _put_idle(self, key: PoolKey, conn: HTTPConnection):
+        with self._lock:
+            connections = self._idle.setdefault(key, deque())
+            connections.append((conn, time.monotonic()))
+            excess = len(connections) - self.max_idle_per_host
+            surplus = [connections.popleft()[0] for _ in range(max(excess, 0))]
+        for surplus_conn in surplus:
+            surplus_conn.close()
+
+    @staticmethod
+    def _is_dropped(conn: HTTPConnection) -> bool:
+        """Whether the server closed an idle connection (or sent something unexpected)"""
+        sock = conn.sock
+        if not isinstance(sock, socket.socket):
+            # Not connected (yet), it connects on the next request
+            return False
+        try:
+            readable, _, _ = select.select([sock], [], [], 0)
+        except (OSError, ValueError):
+            return True
+        return bool(readable)
@@ -1,5 +1,4 @@
 # std
-import http.client
 import logging
 import json
 from typing import List
@@ -26,11 +25,10 @@ class IftttNotifier(Notifier):
         errors = False
         for event in events:
             if event.type in self._notification_types and event.service in self._notification_services:
-                conn = http.client.HTTPSConnection("maker.ifttt.com:443", timeout=self._conn_timeout_seconds)
                 request_body = json.dumps({"Message": event.message, "Title": self.get_title_for_event(event)})
-                conn.request(
+                response = self._http_pool.request(
                     "POST",
-                    f"/trigger/{self.webhook_name}/json/with/key/{self.token}",
+                    f"https://maker.ifttt.com/trigger/{self.webhook_name}/json/with/key/{self.token}",
                     request_body,
                     headers={
                         "Content-Type": "application/json",
@@ -38,10 +36,8 @@ class IftttNotifier(Notifier):
                         "API-Key": f"{self.token}",
                     },
                 )
-                response = conn.getresponse()
                 if response.getcode() != 200:
                     logging.warning(f"Problem sending event to user, code: {response.getcode()}")
                     errors = True
-                conn.close()
 
         return not errors
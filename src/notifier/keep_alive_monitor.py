@@ -4,7 +4,7 @@ import urllib.request
 from datetime import datetime
 from threading import Thread
 from time import sleep
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 
 # lib
 from confuse import ConfigView
@@ -25,20 +25,30 @@ class KeepAliveMonitor:
     that provides a second layer of redundancy. E.g. if this monitoring
     thread crashes and stops responding, the remote service will stop
     receiving keep-alive ping events and can notify the user.
+
+    With several log sources, each service is monitored per source from
+    the first keep-alive event of that source on, since not every machine
+    of a farm runs every service. Services configured for a source are
+    monitored from the start, so the source is reported even if it's
+    already down at startup.
     """
 
-    def __init__(self, config: ConfigView):
+    def __init__(self, config: ConfigView, sources: Optional[Dict[str, Optional[List[str]]]] = None):
         self._notify_manager = None
         # Outside init we only need the keepalive specific config
         self.config = config["keep_alive_monitor"]
 
-        self._last_keep_alive: Dict[EventService, datetime] = {}
+        # Keyed by log source (None if there's only one) and service
+        self._last_keep_alive: Dict[Tuple[Optional[str], EventService], datetime] = {}
         self._last_keep_alive_threshold_seconds: Dict[EventService, int] = {}
         # Check period will be inferred from minimum threshold of all services.
         self._check_period = float("inf")
 
         # Enable all monitored_services for keepalive monitoring
-        self._set_services([EventService(service_name) for service_name in config["monitored_services"].get(list)])
+        self._set_services(
+            [EventService(service_name) for service_name in config["monitored_services"].get(list)],
+            sources=sources,
+        )
 
         # Start thread
         self._is_running = True
@@ -67,16 +77,18 @@ class KeepAliveMonitor:
             self._ping_remote()
 
             events = []
-            for service in self._last_keep_alive.keys():
-                seconds_since_last = (datetime.now() - self._last_keep_alive[service]).seconds
+            for key in list(self._last_keep_alive.keys()):
+                source, service = key
+                seconds_since_last = (datetime.now() - self._last_keep_alive[key]).seconds
                 threshold = self._last_keep_alive_threshold_seconds[service]
+                name = service.name if source is None else f"{service.name} ({source})"
                 logging.debug(
-                    f"Keep-alive check for {service}: "
+                    f"Keep-alive check for {name}: "
                     + f"Last activity {seconds_since_last}s ago (notify threshold {threshold}s)"
                 )
                 if seconds_since_last >= threshold:
                     message = (
-                        f"Your {service.name} is unhealthy! "
+                        f"Your {name} is unhealthy! "
                         + f"No healthy events received for {seconds_since_last} seconds."
                         + "\n(This check can be adjusted.)"
                     )
@@ -87,6 +99,7 @@ class KeepAliveMonitor:
                             priority=EventPriority.HIGH,
                             service=service,
                             message=message,
+                            source=source,
                         )
                     )
             if len(events):
@@ -101,7 +114,8 @@ class KeepAliveMonitor:
         for event in events:
             if event.type == EventType.KEEPALIVE:
                 logging.debug(f"Received keep-alive event from {event.service.name}")
-                self._last_keep_alive[event.service] = datetime.now()
+                if event.service in self._last_keep_alive_threshold_seconds:
+                    self._last_keep_alive[(event.source, event.service)] = datetime.now()
 
     def _ping_remote(self):
         """Ping a remote watchdog that monitors that chiadog is alive
@@ -115,19 +129,38 @@ class KeepAliveMonitor:
             except Exception as e:  # pragma: no cover
                 logging.error(f"Failed to ping keep-alive: {e}")
 
-    def _set_services(self, services: List[EventService]) -> None:
-        """Set the services monitored for keepalive and the service check period."""
+    def _set_services(
+        self, services: List[EventService], sources: Optional[Dict[str, Optional[List[str]]]] = None
+    ) -> None:
+        """Set the services monitored for keepalive and the service check period.
+
+        :param sources: Services expected on each log source, None for those that are monitored
+            from their first keep-alive event on
+        """
+        # Services expected from the start, keyed by None if there's only one source
+        expected_services: Dict[Optional[str], Optional[List[EventService]]] = {None: services}
+        if sources:
+            expected_services = {
+                name: [EventService(service_name) for service_name in source_services]
+                if source_services is not None
+                else None
+                for name, source_services in sources.items()
+            }
         for service in services:
             # TODO: This check will become obsolete once all services emit keepalive events
             if service in [EventService.HARVESTER, EventService.WALLET]:
                 threshold = self.config["notify_threshold_seconds"][service.name].get(int)
-                self._last_keep_alive[service] = datetime.now()
+                for source, source_services in expected_services.items():
+                    if source_services is not None and service in source_services:
+                        self._last_keep_alive[(source, service)] = datetime.now()
                 self._last_keep_alive_threshold_seconds[service] = threshold
                 logging.info(f"Keepalive monitor started for {service.name} with a threshold of {threshold}s")
             else:  # pragma: no cover
                 logging.debug(f"Keepalive not yet implemented for {service.name}, not enabling it.")
 
-        if len(self._last_keep_alive) < 1 and self.config["enable_remote_ping"].get(bool):  # pragma: no cover
+        if len(self._last_keep_alive_threshold_seconds) < 1 and self.config["enable_remote_ping"].get(
+            bool
+        ):  # pragma: no cover
             logging.warning(
                 "monitored_services did not have any service enabled that supports keep-alive. "
                 + "Your external keep-alive service will never be pinged."
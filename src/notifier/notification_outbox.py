@@ -0,0 +1,170 @@
+"""Events that couldn't be sent yet, kept for another attempt.
+
+A notifier failing to send (e.g. during a network outage) would otherwise
+lose its events, including high priority alerts like an unhealthy
+harvester. The outbox is an SQLite database in the state directory, so
+pending events are retried after a restart, too.
+"""
+
+# std
+import hashlib
+import json
+import logging
+import random
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock
+from typing import List, Optional
+
+# lib
+import confuse
+
+# project
+from . import Event, EventPriority, EventService, EventType
+
+notification_outbox_template = {
+    "enable": bool,
+    "ttl_minutes": confuse.Number(),
+}
+
+
+@dataclass(frozen=True)
+class OutboxEntry:
+    id: int
+    event: Event
+    attempts: int
+
+
+def serialize_event(event: Event) -> str:
+    return json.dumps(
+        {
+            "type": event.type.name,
+            "priority": event.priority.name,
+            "service": event.service.name,
+            "message": event.message,
+            "realtime_only": event.realtime_only,
+            "source": event.source,
+        },
+        sort_keys=True,
+    )
+
+
+def deserialize_event(text: str) -> Event:
+    fields = json.loads(text)
+    return Event(
+        type=EventType[fields["type"]],
+        priority=EventPriority[fields["priority"]],
+        service=EventService[fields["service"]],
+        message=fields["message"],
+        realtime_only=fields["realtime_only"],
+        source=fields["source"],
+    )
+
+
+class NotificationOutbox:
+    """Pending events of a single notifier
+
+    Each failed attempt postpones the next one exponentially, jittered so
+    that the notifiers don't all retry at the same moment after an outage.
+    Events that are still pending after the TTL are given up on.
+
+    An event that is already pending isn't added again. Events are removed
+    once sent, so a crash in between means they're sent twice rather than
+    not at all.
+    """
+
+    min_backoff_seconds = 10.0
+    max_backoff_seconds = 3600.0
+
+    def __init__(self, path: Optional[Path] = None, ttl_seconds: float = 24 * 3600):
+        """
+        :param path: Database file, kept in memory only if None
+        :param ttl_seconds: Events older than this aren't retried anymore
+        """
+        self._ttl_seconds = ttl_seconds
+        self._lock = Lock()
+        self._db = sqlite3.connect(str(path) if path is not None else ":memory:", check_same_thread=False)
+        with self._db:
+            self._db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS outbox (
+                    id INTEGER PRIMARY KEY,
+                    event_key TEXT UNIQUE NOT NULL,
+                    event TEXT NOT NULL,
+                    created REAL NOT NULL,
+                    attempts INTEGER NOT NULL,
+                    next_attempt REAL NOT NULL
+                )
+                """
+            )
+        pending = len(self)
+        if pending:
+            logging.info(f"Retrying {pending} events that couldn't be sent before")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM outbox").fetchone()[0]
+
+    def add(self, events: List[Event]):
+        """Keep events whose first attempt failed"""
+        now = time.time()
+        with self._lock, self._db:
+            for event in events:
+                text = serialize_event(event)
+                self._db.execute(
+                    "INSERT OR IGNORE INTO outbox (event_key, event, created, attempts, next_attempt) "
+                    "VALUES (?, ?, ?, 1, ?)",
+                    (hashlib.sha256(text.encode("UTF-8")).hexdigest(), text, now, now + self.backoff_seconds(1)),
+                )
+
+    def seconds_until_due(self) -> Optional[float]:
+        """How long until the next event is due for another attempt, None if there's none"""
+        with self._lock:
+            next_attempt = self._db.execute("SELECT MIN(next_attempt) FROM outbox").fetchone()[0]
+        if next_attempt is None:
+            return None
+        return max(next_attempt - time.time(), 0.0)
+
+    def due(self) -> List[OutboxEntry]:
+        """Events due for another attempt, high priority first"""
+        self._expire()
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, event, attempts FROM outbox WHERE next_attempt <= ? ORDER BY id", (time.time(),)
+            ).fetchall()
+        entries = [OutboxEntry(id=row[0], event=deserialize_event(row[1]), attempts=row[2]) for row in rows]
+        return sorted(entries, key=lambda entry: entry.event.priority.value, reverse=True)
+
+    def remove(self, entry: OutboxEntry):
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM outbox WHERE id = ?", (entry.id,))
+
+    def postpone(self, entries: List[OutboxEntry]):
+        """Schedule the next attempt after another failed one"""
+        now = time.time()
+        with self._lock, self._db:
+            for entry in entries:
+                attempts = entry.attempts + 1
+                self._db.execute(
+                    "UPDATE outbox SET attempts = ?, next_attempt = ? WHERE id = ?",
+                    (attempts, now + self.backoff_seconds(attempts), entry.id),
+                )
+
+    def backoff_seconds(self, attempts: int) -> float:
+        exponent = min(attempts - 1, 16)
+        delay = min(self.max_backoff_seconds, self.min_backoff_seconds * 2**exponent)
+        return random.uniform(delay / 2, delay)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def _expire(self):
+        with self._lock, self._db:
+            expired = self._db.execute(
+                "DELETE FROM outbox WHERE created < ?", (time.time() - self._ttl_seconds,)
+            ).rowcount
+        if expired:
+            logging.warning(f"Gave up on {expired} events that couldn't be sent in time")
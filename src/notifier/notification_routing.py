@@ -0,0 +1,89 @@
+"""Which notifiers receive which events.
+
+By default every notifier receives the events it's configured for (see
+daily_stats, wallet_events etc.). Routing rules narrow that down, e.g.
+high priority events only to Pushover, daily stats only by email.
+"""
+
+# std
+import logging
+from dataclasses import dataclass
+from itertools import product
+from typing import Dict, FrozenSet, List, Mapping, Tuple
+
+# lib
+import confuse
+from confuse import ConfigView
+
+# project
+from . import EventPriority, EventService, EventType, Notifier
+
+routing_rule_template = {
+    "types": confuse.Optional(confuse.StrSeq()),
+    "services": confuse.Optional(confuse.StrSeq()),
+    "priorities": confuse.Optional(confuse.StrSeq()),
+    "notifiers": confuse.StrSeq(),
+}
+
+RouteKey = Tuple[EventType, EventService, EventPriority]
+
+
+@dataclass(frozen=True)
+class RoutingRule:
+    """Events of any of the types, services and priorities go to these notifiers only"""
+
+    types: FrozenSet[EventType]
+    services: FrozenSet[EventService]
+    priorities: FrozenSet[EventPriority]
+    notifiers: FrozenSet[str]
+
+    def matches(self, key: RouteKey) -> bool:
+        event_type, service, priority = key
+        return event_type in self.types and service in self.services and priority in self.priorities
+
+
+def parse_routing_rules(config: ConfigView) -> List[RoutingRule]:
+    """Rules in order of precedence, invalid ones are left out"""
+    rules = []
+    for index, rule_config in enumerate(config.get(confuse.Sequence(routing_rule_template))):
+        try:
+            rules.append(
+                RoutingRule(
+                    types=_parse_names(EventType, rule_config["types"]),
+                    services=_parse_names(EventService, rule_config["services"]),
+                    priorities=_parse_names(EventPriority, rule_config["priorities"]),
+                    notifiers=frozenset(rule_config["notifiers"]),
+                )
+            )
+        except KeyError as name:
+            logging.error(f"Ignoring notification routing rule {index + 1}, unknown name: {name}")
+    return rules
+
+
+def _parse_names(enum, names) -> frozenset:
+    # Any if not restricted
+    if names is None:
+        return frozenset(enum)
+    return frozenset(enum[name.upper()] for name in names)
+
+
+def build_routing_table(notifiers: Mapping[str, Notifier], rules: List[RoutingRule]) -> Dict[RouteKey, Tuple[str, ...]]:
+    """Notifiers for every combination of event type, service and priority
+
+    The first rule matching a combination picks from the notifiers configured
+    to receive such events, if there's none they all receive them.
+    """
+    for rule in rules:
+        for name in rule.notifiers - set(notifiers):
+            logging.warning(f"Notification routing rule refers to {name} notifier, which isn't enabled")
+
+    table: Dict[RouteKey, Tuple[str, ...]] = {}
+    for key in product(EventType, EventService, EventPriority):
+        event_type, service, _ = key
+        subscribed = [name for name, notifier in notifiers.items() if notifier.is_subscribed(event_type, service)]
+        for rule in rules:
+            if rule.matches(key):
+                subscribed = [name for name in subscribed if name in rule.notifiers]
+                break
+        table[key] = tuple(subscribed)
+    return table
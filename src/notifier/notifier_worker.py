@@ -0,0 +1,286 @@
+"""Delivers events to a single notifier on its own thread.
+
+Notifiers make network requests which can take up to their connection
+timeout. With a worker per notifier, a hanging service only delays its
+own notifications, not those of the other notifiers or whoever reported
+the events.
+"""
+
+# std
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from threading import Condition, Thread
+from typing import Deque, List, Optional, Tuple
+
+# project
+from . import Event, EventPriority, Notifier
+from .event_coalescing import coalesce_events, digest_events
+from .notification_outbox import NotificationOutbox
+from .rate_limiter import RateLimitedError, TokenBucket
+
+# Events in the queue and when they were queued
+Batch = Tuple[List[Event], float]
+
+
+@dataclass(frozen=True)
+class NotifierStats:
+    """Snapshot of a notifier's deliveries, latency is from queueing to sent"""
+
+    backlog: int
+    delivered: int
+    failed: int
+    last_latency_seconds: Optional[float]
+    max_latency_seconds: Optional[float]
+    mean_latency_seconds: Optional[float]
+    # Events that failed and are waiting to be retried
+    pending_retries: int
+
+
+class NotifierWorker:
+    """Queue of events for a notifier and the thread sending them
+
+    High priority events skip the queue and are sent before any waiting
+    normal or low priority events.
+
+    Events that couldn't be sent are put into the outbox, if there is one,
+    and retried from there once due. The outbox is left alone on stop().
+    With an outbox, events are sent one by one so that only those that
+    failed are retried, unless the notifier combines them anyway.
+
+    Notifiers with a rate limit send their events one by one as the limit
+    allows. Whatever is queued in the meantime is coalesced into as few
+    events as possible. When the service says it's rate limited anyway,
+    sending pauses for as long as it asks for.
+
+    With a digest window, events are held back for that long after the
+    first one and then summarized, similar events in one notification
+    each. High priority events are sent right away unless configured to
+    be digested as well.
+    """
+
+    # Sending events that takes longer than this is logged
+    slow_send_seconds = 5
+    # How long stop() waits for queued events to be sent
+    stop_timeout_seconds = 10
+
+    def __init__(self, name: str, notifier: Notifier, outbox: Optional[NotificationOutbox] = None):
+        self.name = name
+        self._notifier = notifier
+        self._outbox = outbox
+        self._limiter = TokenBucket(notifier.rate_limit) if notifier.rate_limit is not None else None
+        self._digest_window_seconds = notifier.digest_window_seconds
+        self._digest_high_priority = notifier.digest_high_priority
+        self._high_priority: Deque[Batch] = deque()
+        self._queue: Deque[Batch] = deque()
+        self._condition = Condition()
+
+        self._delivered = 0
+        self._failed = 0
+        self._total_latency_seconds = 0.0
+        self._last_latency_seconds: Optional[float] = None
+        self._max_latency_seconds: Optional[float] = None
+
+        self._is_running = True
+        self._thread = Thread(target=self._deliver_loop, name=f"NotifierWorker-{name}", daemon=True)
+        self._thread.start()
+
+    def submit(self, events: List[Event]):
+        """Queue events for sending, returns right away"""
+        high_priority = [event for event in events if event.priority == EventPriority.HIGH]
+        other = [event for event in events if event.priority != EventPriority.HIGH]
+        queued_at = time.perf_counter()
+        with self._condition:
+            if not self._is_running:
+                logging.warning(f"Not sending {len(events)} events over {self.name}, it's stopped")
+                return
+            if high_priority:
+                self._high_priority.append((high_priority, queued_at))
+            if other:
+                self._queue.append((other, queued_at))
+            self._condition.notify_all()
+
+    @property
+    def backlog(self) -> int:
+        """Number of batches waiting to be sent"""
+        with self._condition:
+            return len(self._high_priority) + len(self._queue)
+
+    def stats(self) -> NotifierStats:
+        with self._condition:
+            sent = self._delivered + self._failed
+            return NotifierStats(
+                backlog=len(self._high_priority) + len(self._queue),
+                delivered=self._delivered,
+                failed=self._failed,
+                last_latency_seconds=self._last_latency_seconds,
+                max_latency_seconds=self._max_latency_seconds,
+                mean_latency_seconds=self._total_latency_seconds / sent if sent else None,
+                pending_retries=len(self._outbox) if self._outbox is not None else 0,
+            )
+
+    def stop(self):
+        """Send what's queued already, giving up after stop_timeout_seconds"""
+        with self._condition:
+            self._is_running = False
+            self._condition.notify_all()
+        self._thread.join(self.stop_timeout_seconds)
+        if self._thread.is_alive():
+            logging.warning(f"Gave up sending {self.backlog} queued batches of events over {self.name}")
+
+    def _deliver_loop(self):
+        while True:
+            with self._condition:
+                while True:
+                    lane: Optional[Deque[Batch]] = None
+                    retry_in = self._seconds_until_retry()
+                    high_priority_in = self._seconds_until_ready(self._high_priority, self._digest_high_priority)
+                    queue_in = self._seconds_until_ready(self._queue, is_digested=True)
+                    is_retry_due = retry_in == 0
+                    throttled_seconds = self._limiter.seconds_until_available() if self._limiter is not None else 0
+                    if throttled_seconds > 0 and 0 in (high_priority_in, queue_in, retry_in):
+                        # Events keep piling up meanwhile and are coalesced once there's room
+                        self._condition.wait(throttled_seconds)
+                        continue
+                    if high_priority_in == 0:
+                        lane = self._high_priority
+                        break
+                    if is_retry_due:
+                        break
+                    if queue_in == 0:
+                        lane = self._queue
+                        break
+                    if not self._is_running:
+                        return
+                    waits = [seconds for seconds in (high_priority_in, queue_in, retry_in) if seconds is not None]
+                    self._condition.wait(min(waits) if waits else None)
+
+                if lane is not None:
+                    events, queued_at = self._take(lane)
+
+            if lane is None:
+                self._retry_due()
+            elif self._limiter is None:
+                self._deliver(events, queued_at)
+            else:
+                self._deliver_limited(lane, events, queued_at)
+
+    def _seconds_until_ready(self, lane: Deque[Batch], is_digested: bool) -> Optional[float]:
+        """How long until the events of the lane are to be sent, None if there are none"""
+        if not lane:
+            return None
+        if not is_digested or not self._digest_window_seconds or not self._is_running:
+            return 0
+        _, queued_at = lane[0]
+        return max(queued_at + self._digest_window_seconds - time.perf_counter(), 0)
+
+    def _take(self, lane: Deque[Batch]) -> Batch:
+        is_digested = self._digest_window_seconds and (lane is self._queue or self._digest_high_priority)
+        if self._limiter is None and not is_digested:
+            return lane.popleft()
+        batches = list(lane)
+        lane.clear()
+        events = [event for batch_events, _ in batches for event in batch_events]
+        queued_at = min(batch_queued_at for _, batch_queued_at in batches)
+        if is_digested:
+            events = digest_events(events)
+        if self._limiter is not None:
+            events = coalesce_events(events, self._notifier.max_message_length)
+        return events, queued_at
+
+    def _deliver(self, events: List[Event], queued_at: float):
+        start = time.perf_counter()
+        if self._outbox is None or self._notifier.combine_events:
+            batches = [events]
+        else:
+            batches = [[event] for event in events]
+        for i, batch in enumerate(batches):
+            success = self._send(batch)
+            self._record_delivery(success, latency_seconds=time.perf_counter() - queued_at)
+            if not success and self._outbox is not None:
+                # Likely still unavailable, don't try the others just yet
+                failed = [event for failed_batch in batches[i:] for event in failed_batch]
+                self._outbox.add(failed)
+                break
+
+        execution_time_seconds = time.perf_counter() - start
+        if execution_time_seconds > self.slow_send_seconds:
+            logging.info(
+                f"Sending events over {self.name} took {execution_time_seconds:0.2f} seconds, "
+                f"{self.backlog} batches waiting"
+            )
+
+    def _deliver_limited(self, lane: Deque[Batch], events: List[Event], queued_at: float):
+        assert self._limiter is not None
+        for i, event in enumerate(events):
+            if not self._limiter.try_acquire():
+                self._requeue(lane, events[i:], queued_at)
+                return
+            try:
+                self._deliver([event], queued_at)
+            except RateLimitedError as e:
+                logging.warning(f"Sending events over {self.name} was rate limited: {e}")
+                self._limiter.pause(e.retry_after_seconds)
+                self._requeue(lane, events[i:], queued_at)
+                return
+
+    def _requeue(self, lane: Deque[Batch], events: List[Event], queued_at: float):
+        """Put events that have to wait for the rate limit back in front of the queue"""
+        with self._condition:
+            lane.appendleft((events, queued_at))
+
+    def _retry_due(self):
+        assert self._outbox is not None
+        entries = self._outbox.due()
+        for i, entry in enumerate(entries):
+            if self._limiter is not None and not self._limiter.try_acquire():
+                return
+            try:
+                success = self._send([entry.event])
+            except RateLimitedError as e:
+                logging.warning(f"Retrying events over {self.name} was rate limited: {e}")
+                assert self._limiter is not None
+                self._limiter.pause(e.retry_after_seconds)
+                return
+            if success:
+                self._outbox.remove(entry)
+                continue
+            # Likely still unavailable, don't try the others just yet
+            remaining = entries[i:]
+            self._outbox.postpone(remaining)
+            return
+
+    def _seconds_until_retry(self) -> Optional[float]:
+        # Retries are left for the next start once stopping
+        if self._outbox is None or not self._is_running:
+            return None
+        return self._outbox.seconds_until_due()
+
+    def _send(self, events: List[Event]) -> bool:
+        """
+        :raises RateLimitedError: If the service asks to slow down and there's a rate limit to adjust
+        """
+        try:
+            success = self._notifier.send_events_to_user(events)
+            if not success:
+                logging.error(f"Failed to send events over {self.name}")
+        except RateLimitedError as e:
+            if self._limiter is not None:
+                raise
+            success = False
+            logging.error(f"Failed to send events over {self.name}: {e}")
+        except Exception as e:
+            success = False
+            logging.error(f"Failed to send events over {self.name}: {e}")
+        return success
+
+    def _record_delivery(self, success: bool, latency_seconds: float):
+        with self._condition:
+            if success:
+                self._delivered += 1
+            else:
+                self._failed += 1
+            self._total_latency_seconds += latency_seconds
+            self._last_latency_seconds = latency_seconds
+            self._max_latency_seconds = max(self._max_latency_seconds or 0.0, latency_seconds)
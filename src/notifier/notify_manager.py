@@ -1,12 +1,14 @@
 # std
 import logging
-import time
-from typing import List, Dict, Type
+from pathlib import Path
+from time import monotonic
+from typing import List, Dict, Optional, Tuple, Type
 
 # lib
 from confuse import ConfigView
 
 # project
+from src.util import prepare_state_dir
 from . import Event, Notifier
 from .grafana_notifier import GrafanaNotifier
 from .keep_alive_monitor import KeepAliveMonitor
@@ -19,21 +21,48 @@ from .telegram_notifier import TelegramNotifier
 from .discord_notifier import DiscordNotifier
 from .slack_notifier import SlackNotifier
 from .ifttt_notifier import IftttNotifier
+from .http_connection_pool import HttpConnectionPool
+from .notification_outbox import NotificationOutbox, notification_outbox_template
+from .notification_routing import RouteKey, build_routing_table, parse_routing_rules
+from .notifier_worker import NotifierStats, NotifierWorker
 
 
 class NotifyManager:
     """This class manages all notifiers and propagates
     events to all of them such that notifications can be
     delivered to multiple services at once.
+
+    Each notifier sends its events on its own worker thread,
+    so that a slow service doesn't hold up the others. Events
+    that couldn't be sent are retried from a per-notifier outbox.
+
+    Which notifiers receive which events is looked up in a routing table
+    that is built once from the notifier configs and the routing rules.
+
+    Every stats_interval_seconds, the delivery stats of each notifier are logged.
     """
 
+    # How often the delivery stats are logged
+    stats_interval_seconds = 600
+
     def __init__(self, config: ConfigView, keep_alive_monitor: KeepAliveMonitor):
         self._keep_alive_monitor = keep_alive_monitor
         self._keep_alive_monitor.set_notify_manager(self)
         self._notifiers: Dict[str, Notifier] = {}
+        self._workers: Dict[str, NotifierWorker] = {}
+        self._outboxes: Dict[str, NotificationOutbox] = {}
+        # Notifiers sending to the same host reuse each other's connections
+        self._http_pool = HttpConnectionPool()
+        self._last_stats_log_time = monotonic()
         self._config = config["notifier"]
         self._notification_title_prefix = config["notification_title_prefix"].get(str)
         self._initialize_notifiers()
+        self._routes: Dict[RouteKey, Tuple[str, ...]] = build_routing_table(
+            self._notifiers, parse_routing_rules(config["notification_routing"])
+        )
+        self._initialize_workers(
+            config["notification_outbox"].get(notification_outbox_template), config["state_dir"].get()
+        )
 
     def _initialize_notifiers(self) -> None:
         key_notifier_mapping: Dict[str, Type[Notifier]] = {
@@ -59,19 +88,60 @@ class NotifyManager:
         if len(self._notifiers.values()) == 0:
             logging.warning("Cannot process user events: 0 notifiers are enabled!")
 
+    def _initialize_workers(self, outbox_config: dict, state_dir: Optional[str]) -> None:
+        outbox_dir = None
+        if outbox_config["enable"] and state_dir is not None:
+            outbox_dir = prepare_state_dir(Path(state_dir), "failed events are lost on restart")
+
+        for key, notifier in self._notifiers.items():
+            notifier.use_http_pool(self._http_pool)
+            outbox = None
+            if outbox_config["enable"]:
+                # Kept in memory only without state directory
+                outbox_path = outbox_dir / f"{key}.outbox.sqlite" if outbox_dir is not None else None
+                outbox = NotificationOutbox(outbox_path, ttl_seconds=outbox_config["ttl_minutes"] * 60)
+                self._outboxes[key] = outbox
+            self._workers[key] = NotifierWorker(key, notifier, outbox)
+
     def process_events(self, events: List[Event]):
-        """Process all keep-alive and user events"""
+        """Process all keep-alive and user events
+
+        Events are queued for the notifiers, this returns without waiting for them to be sent.
+        """
         if not len(events):
             return
 
         self._keep_alive_monitor.process_events(events)
-        for key in self._notifiers.keys():
-            start = time.perf_counter()
-            try:
-                if not self._notifiers[key].send_events_to_user(events):
-                    logging.error(f"Failed to send events over {key}")
-            except Exception as e:
-                logging.error(f"Failed to send events over {key}: {e}")
-            execution_time_seconds = time.perf_counter() - start
-            if execution_time_seconds > 5:
-                logging.info(f"Sending events over {key} took {execution_time_seconds:0.2f} seconds.")
+        events_by_notifier: Dict[str, List[Event]] = {}
+        for event in events:
+            for key in self._routes[(event.type, event.service, event.priority)]:
+                events_by_notifier.setdefault(key, []).append(event)
+        for key, notifier_events in events_by_notifier.items():
+            self._workers[key].submit(notifier_events)
+        self._log_stats_if_due()
+
+    def stats(self) -> Dict[str, NotifierStats]:
+        """Delivery latency and backlog per notifier"""
+        return {key: worker.stats() for key, worker in self._workers.items()}
+
+    def _log_stats_if_due(self):
+        if monotonic() - self._last_stats_log_time < self.stats_interval_seconds:
+            return
+        self._last_stats_log_time = monotonic()
+        for key, stats in self.stats().items():
+            latency = "nothing sent yet"
+            if stats.mean_latency_seconds is not None and stats.max_latency_seconds is not None:
+                latency = f"latency {stats.mean_latency_seconds:.1f}s mean, {stats.max_latency_seconds:.1f}s max"
+            logging.info(
+                f"Notifier {key}: {stats.delivered} delivered, {stats.failed} failed, "
+                f"{stats.backlog} batches queued, {stats.pending_retries} waiting for retry, {latency}"
+            )
+
+    def stop(self):
+        for worker in self._workers.values():
+            worker.stop()
+        for notifier in self._notifiers.values():
+            notifier.close()
+        for outbox in self._outboxes.values():
+            outbox.close()
+        self._http_pool.close()
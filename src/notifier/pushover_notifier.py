@@ -1,5 +1,4 @@
 # std
-import http.client
 import logging
 import urllib.parse
 from typing import List
@@ -26,10 +25,9 @@ class PushoverNotifier(Notifier):
         errors = False
         for event in events:
             if event.type in self._notification_types and event.service in self._notification_services:
-                conn = http.client.HTTPSConnection("api.pushover.net:443", timeout=self._conn_timeout_seconds)
-                conn.request(
+                response = self._http_pool.request(
                     "POST",
-                    "/1/messages.json",
+                    "https://api.pushover.net/1/messages.json",
                     urllib.parse.urlencode(
                         {
                             "token": self.token,
@@ -41,10 +39,8 @@ class PushoverNotifier(Notifier):
                     ),
                     {"Content-type": "application/x-www-form-urlencoded"},
                 )
-                response = conn.getresponse()
                 if response.getcode() != 200:
                     logging.warning(f"Problem sending event to user, code: {response.getcode()}")
                     errors = True
-                conn.close()
 
         return not errors
@@ -0,0 +1,71 @@
+"""Keeps notifiers within the request rate their service allows.
+
+Services like Telegram, Discord and Slack reject requests beyond their
+limits with HTTP 429, telling how long to wait in the Retry-After header.
+"""
+
+# std
+import time
+from dataclasses import dataclass
+from threading import Lock
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    per_minute: float
+    # Requests that can be sent at once after being idle for a while
+    burst: int = 1
+
+
+class RateLimitedError(Exception):
+    """The service rejected a request for exceeding its rate limit"""
+
+    def __init__(self, retry_after_seconds: Optional[float] = None):
+        super().__init__(
+            "Rate limited" + (f", retry after {retry_after_seconds:g} seconds" if retry_after_seconds else "")
+        )
+        self.retry_after_seconds = retry_after_seconds
+
+
+class TokenBucket:
+    """Allows burst requests at once and refills at the rate of the limit"""
+
+    # Waited for after HTTP 429 without any hint how long to wait
+    default_retry_after_seconds = 60.0
+
+    def __init__(self, rate_limit: RateLimit):
+        self._rate_per_second = rate_limit.per_minute / 60
+        self._burst = max(rate_limit.burst, 1)
+        self._tokens = float(self._burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = Lock()
+
+    def try_acquire(self) -> bool:
+        """Take a token for a request if there is one"""
+        with self._lock:
+            self._refill()
+            if time.monotonic() < self._paused_until or self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    def seconds_until_available(self) -> float:
+        with self._lock:
+            self._refill()
+            until_refilled = (1 - self._tokens) / self._rate_per_second if self._tokens < 1 else 0.0
+            until_unpaused = self._paused_until - time.monotonic()
+            return max(until_refilled, until_unpaused, 0.0)
+
+    def pause(self, seconds: Optional[float] = None):
+        """Hold back all requests after the service rejected one"""
+        with self._lock:
+            self._refill()
+            self._tokens = 0.0
+            self._paused_until = time.monotonic() + (seconds or self.default_retry_after_seconds)
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self._burst, self._tokens + (now - self._updated) * self._rate_per_second)
+        self._updated = now
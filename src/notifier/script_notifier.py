@@ -1,10 +1,14 @@
 # std
+import json
 import logging
 import os
+import queue
 import subprocess
-from typing import List
+from threading import Thread
+from typing import IO, List, Optional
 
 # lib
+import confuse
 from confuse import ConfigView, Path
 
 # project
@@ -12,6 +16,20 @@ from . import Notifier, Event
 
 
 class ScriptNotifier(Notifier):
+    """Hands events to a user provided script
+
+    In argv mode (the default) the script is run for each event, with
+    priority, service and message as arguments.
+
+    In persistent mode the script is started once and keeps running. Each
+    event is written to its stdin as a line of JSON with an id, type,
+    priority, service, message and source. The script acknowledges it by
+    writing a line of JSON with the same id and whether it succeeded, e.g.
+    {"id": 1, "ok": true}, to stdout. If there's no acknowledgement within
+    the timeout the script is considered stuck and killed. A script that
+    exited or was killed is started again for the next event.
+    """
+
     def __init__(self, title_prefix: str, config: ConfigView):
         logging.info("Initializing script notifier.")
         super().__init__(title_prefix, config)
@@ -26,13 +44,117 @@ class ScriptNotifier(Notifier):
             else:
                 logging.error(f"Invalid script path. File does not exist: {self.script_path}")
                 self.script_path = None
+        self.mode = config["mode"].get(confuse.Optional(confuse.Choice(["argv", "persistent"]), default="argv"))
+        self.event_timeout_seconds = config["event_timeout_seconds"].get(confuse.Optional(confuse.Number(), default=10))
+
+        self._process: Optional[subprocess.Popen] = None
+        # Lines the running script wrote to stdout, None once it closed stdout
+        self._output: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._next_event_id = 1
 
     def send_events_to_user(self, events: List[Event]) -> bool:
         if self.script_path is None:
             return False
 
+        success = True
         for event in events:
             if event.type in self._notification_types and event.service in self._notification_services:
-                subprocess.run([str(self.script_path), event.priority.name, event.service.name, event.message])
+                if self.mode == "persistent":
+                    success = self._send_to_process(event) and success
+                else:
+                    subprocess.run([str(self.script_path), event.priority.name, event.service.name, event.message])
+
+        return success
+
+    def close(self):
+        """Let the script finish by closing its stdin, kill it if it doesn't"""
+        if self._process is None:
+            return
+        try:
+            assert self._process.stdin is not None
+            self._process.stdin.close()
+            self._process.wait(timeout=self.event_timeout_seconds)
+        except (OSError, subprocess.TimeoutExpired):
+            self._process.kill()
+            self._process.wait()
+        self._process = None
+
+    def _send_to_process(self, event: Event) -> bool:
+        process = self._running_process()
+        event_id = self._next_event_id
+        self._next_event_id += 1
+        line = json.dumps(
+            {
+                "id": event_id,
+                "type": event.type.name,
+                "priority": event.priority.name,
+                "service": event.service.name,
+                "message": event.message,
+                "source": event.source,
+            }
+        )
+        try:
+            assert process.stdin is not None
+            process.stdin.write(line + "\n")
+            process.stdin.flush()
+        except OSError as e:
+            logging.error(f"Failed to hand event to script: {e}")
+            self._kill_process()
+            return False
+
+        return self._wait_for_ack(event_id)
+
+    def _wait_for_ack(self, event_id: int) -> bool:
+        while True:
+            try:
+                line = self._output.get(timeout=self.event_timeout_seconds)
+            except queue.Empty:
+                logging.error(
+                    f"Script didn't acknowledge event within {self.event_timeout_seconds} seconds, killing it"
+                )
+                self._kill_process()
+                return False
+            if line is None:
+                logging.error("Script exited before acknowledging event")
+                self._kill_process()
+                return False
+            try:
+                ack = json.loads(line)
+            except ValueError:
+                ack = None
+            if not isinstance(ack, dict) or ack.get("id") != event_id:
+                # Any other output of the script
+                logging.debug(f"Script: {line.rstrip()}")
+                continue
+            return bool(ack.get("ok", True))
+
+    def _running_process(self) -> subprocess.Popen:
+        if self._process is not None and self._process.poll() is None:
+            return self._process
+        if self._process is not None:
+            logging.warning(f"Script exited with code {self._process.returncode}, restarting it")
+
+        self._process = subprocess.Popen(
+            [str(self.script_path)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            encoding="UTF-8",
+            bufsize=1,
+        )
+        # Output of a previous process must not be mistaken for acknowledgements
+        self._output = queue.Queue()
+        assert self._process.stdout is not None
+        Thread(target=self._read_output, args=(self._process.stdout, self._output), daemon=True).start()
+        return self._process
+
+    def _kill_process(self):
+        if self._process is not None:
+            self._process.kill()
+            self._process.wait()
 
-        return True
+    @staticmethod
+    def _read_output(stdout: IO[str], output: "queue.Queue[Optional[str]]"):
+        # Pipes can't be waited on with a timeout on Windows, hence a thread
+        for line in stdout:
+            output.put(line)
+        output.put(None)
@@ -1,8 +1,6 @@
 # std
-import http.client
 import logging
 import json
-import urllib.parse
 from typing import List
 
 # lib
@@ -10,9 +8,14 @@ from confuse import ConfigView
 
 # project
 from . import Notifier, Event
+from .rate_limiter import RateLimit, RateLimitedError
 
 
 class SlackNotifier(Notifier):
+    # Incoming webhooks allow one message per second with short bursts
+    default_rate_limit = RateLimit(per_minute=60, burst=3)
+    max_message_length = 3900
+
     def __init__(self, title_prefix: str, config: ConfigView):
         logging.info("Initializing Slack notifier.")
         super().__init__(title_prefix, config)
@@ -32,18 +35,16 @@ class SlackNotifier(Notifier):
                     }
                 )
 
-                o = urllib.parse.urlparse(self.webhook_url)
-                conn = http.client.HTTPSConnection(o.netloc, timeout=self._conn_timeout_seconds)
-                conn.request(
+                response = self._http_pool.request(
                     "POST",
-                    o.path,
+                    self.webhook_url,
                     request_body,
                     {"Content-type": "application/json"},
                 )
-                response = conn.getresponse()
+                if response.getcode() == 429:
+                    raise RateLimitedError(response.retry_after_seconds())
                 if response.getcode() != 200:
                     logging.warning(f"Problem sending event to user, code: {response.getcode()}")
                     errors = True
-                conn.close()
 
         return not errors
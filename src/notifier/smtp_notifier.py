@@ -1,12 +1,14 @@
 # std
 import logging
-from typing import List
+import time
+from typing import List, Optional
 import smtplib
 import email.utils
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 
 # lib
+import confuse
 from confuse import ConfigView, OneOf
 
 # project
@@ -26,6 +28,16 @@ smtp_credentials_template = {
 
 
 class SMTPNotifier(Notifier):
+    """Sends events by email
+
+    The connection (including TLS and login) is kept open between
+    notifications. Before reuse it's checked with NOOP, and after being
+    idle for idle_timeout_seconds it's replaced by a new one.
+    """
+
+    # Servers close idle connections after a few minutes, better not reuse them that late
+    idle_timeout_seconds = 120
+
     def __init__(self, title_prefix: str, config: ConfigView):
         logging.info("Initializing Email notifier.")
         super().__init__(title_prefix, config)
@@ -39,49 +51,119 @@ class SMTPNotifier(Notifier):
         self.host = credentials["host"]
         self.port = credentials["port"]
         self.enable_smtp_auth = credentials["enable_smtp_auth"]
+        # All events sent at once end up in a single email
+        self.combine_events = config["combine_events"].get(confuse.Optional(bool, default=False))
+
+        self._server: Optional[smtplib.SMTP] = None
+        self._last_used = 0.0
 
     def send_events_to_user(self, events: List[Event]) -> bool:
+        events = [
+            event
+            for event in events
+            if event.type in self._notification_types and event.service in self._notification_services
+        ]
+        if not events:
+            return True
+        if self.combine_events:
+            messages = [self._create_message(events)]
+        else:
+            messages = [self._create_message([event]) for event in events]
+
         errors = False
-        for event in events:
-            if event.type in self._notification_types and event.service in self._notification_services:
-                subject = self.get_title_for_event(event)
-                text = event.message
-                # Create message container - the correct MIME type is multipart/alternative.
-                msg = MIMEMultipart("alternative")
-                msg["Subject"] = subject
-                msg["From"] = email.utils.formataddr((self.sender_name, self.sender))
-                msg["To"] = self.recipient
-
-                # Record the MIME types of both parts - text/plain and text/html.
-                part1 = MIMEText(text, "plain")
-                part2 = MIMEText(text.replace("\n", "<br />"), "html")
-
-                # Attach parts into message container.
-                # According to RFC 2046, the last part of a multipart message, in this case
-                # the HTML message, is best and preferred.
-                msg.attach(part1)
-                msg.attach(part2)
-
-                # Try to send the message.
-                try:
-                    server = smtplib.SMTP(self.host, self.port, timeout=self._conn_timeout_seconds)
-                    server.ehlo()
-                    server.starttls()
-                    # stmplib docs recommend calling ehlo() before & after starttls()
-                    server.ehlo()
-                    if self.enable_smtp_auth:
-                        try:
-                            server.login(self.username_smtp, self.password_smtp)
-                        except smtplib.SMTPNotSupportedError:
-                            logging.error(
-                                "'enable_smtp_auth' is enabled but your SMTP server does not support it."
-                                + "Trying to continue without auth."
-                            )
-                    server.sendmail(self.sender, self.recipient, msg.as_string())
-                    server.quit()
-                # Display an error message if something goes wrong.
-                except Exception as e:
-                    logging.error("SMTP Notify Error: ", e)
-                    errors = True
+        for msg in messages:
+            # Try to send the message.
+            try:
+                self._send(msg)
+            # Display an error message if something goes wrong.
+            except Exception as e:
+                logging.error(f"SMTP Notify Error: {e}")
+                self.close()
+                errors = True
 
         return not errors
+
+    def close(self):
+        if self._server is None:
+            return
+        try:
+            self._server.quit()
+        except (smtplib.SMTPException, OSError):
+            self._server.close()
+        self._server = None
+
+    def _create_message(self, events: List[Event]) -> MIMEMultipart:
+        # Titles of all but a single event are part of the body, the subject is the most urgent one
+        most_urgent = max(events, key=lambda event: event.priority.value)
+        if len(events) == 1:
+            subject = self.get_title_for_event(most_urgent)
+            text = most_urgent.message
+        else:
+            subject = f"{self.get_title_for_event(most_urgent)} (+{len(events) - 1} more)"
+            text = "\n\n".join(f"{self.get_title_for_event(event)}\n{event.message}" for event in events)
+
+        # Create message container - the correct MIME type is multipart/alternative.
+        msg = MIMEMultipart("alternative")
+        msg["Subject"] = subject
+        msg["From"] = email.utils.formataddr((self.sender_name, self.sender))
+        msg["To"] = self.recipient
+
+        # Record the MIME types of both parts - text/plain and text/html.
+        part1 = MIMEText(text, "plain")
+        part2 = MIMEText(text.replace("\n", "<br />"), "html")
+
+        # Attach parts into message container.
+        # According to RFC 2046, the last part of a multipart message, in this case
+        # the HTML message, is best and preferred.
+        msg.attach(part1)
+        msg.attach(part2)
+        return msg
+
+    def _send(self, msg: MIMEMultipart):
+        server = self._session()
+        try:
+            server.sendmail(self.sender, self.recipient, msg.as_string())
+        except smtplib.SMTPServerDisconnected:
+            # Dropped since it was checked, one more try on a new connection
+            self.close()
+            self._session().sendmail(self.sender, self.recipient, msg.as_string())
+        self._last_used = time.monotonic()
+
+    def _session(self) -> smtplib.SMTP:
+        """The open connection if it's still alive, a new one otherwise"""
+        if self._server is not None:
+            if time.monotonic() - self._last_used > self.idle_timeout_seconds:
+                self.close()
+            else:
+                try:
+                    if self._server.noop()[0] == 250:
+                        return self._server
+                except (smtplib.SMTPException, OSError):
+                    pass
+                logging.debug("SMTP connection was closed, reconnecting")
+                self._server.close()
+                self._server = None
+
+        server = smtplib.SMTP(self.host, self.port, timeout=self._conn_timeout_seconds)
+        try:
+            server.ehlo()
+            self._start_tls(server)
+            if self.enable_smtp_auth:
+                try:
+                    server.login(self.username_smtp, self.password_smtp)
+                except smtplib.SMTPNotSupportedError:
+                    logging.error(
+                        "'enable_smtp_auth' is enabled but your SMTP server does not support it."
+                        + "Trying to continue without auth."
+                    )
+        except Exception:
+            server.close()
+            raise
+        self._server = server
+        return server
+
+    @staticmethod
+    def _start_tls(server: smtplib.SMTP):
+        server.starttls()
+        # stmplib docs recommend calling ehlo() before & after starttls()
+        server.ehlo()
@@ -1,5 +1,4 @@
 # std
-import http.client
 import logging
 import json
 from typing import List
@@ -9,9 +8,14 @@ from confuse import ConfigView
 
 # project
 from . import Notifier, Event
+from .rate_limiter import RateLimit, RateLimitedError
 
 
 class TelegramNotifier(Notifier):
+    # One message per second per chat, 20 per minute in groups
+    default_rate_limit = RateLimit(per_minute=20, burst=3)
+    max_message_length = 4000
+
     def __init__(self, title_prefix: str, config: ConfigView):
         logging.info("Initializing Telegram notifier.")
         super().__init__(title_prefix, config)
@@ -34,17 +38,16 @@ class TelegramNotifier(Notifier):
                         "disable_notification": event.priority == event.priority.LOW,
                     }
                 )
-                conn = http.client.HTTPSConnection("api.telegram.org", timeout=self._conn_timeout_seconds)
-                conn.request(
+                response = self._http_pool.request(
                     "POST",
-                    f"/bot{self.bot_token}/sendMessage",
+                    f"https://api.telegram.org/bot{self.bot_token}/sendMessage",
                     request_body,
                     {"Content-type": "application/json"},
                 )
-                response = conn.getresponse()
+                if response.getcode() == 429:
+                    raise RateLimitedError(response.retry_after_seconds())
                 if response.getcode() != 200:
                     logging.warning(f"Problem sending event to user, code: {response.getcode()}")
                     errors = True
-                conn.close()
 
         return not errors
@@ -1,5 +1,8 @@
+import logging
 import sys
 from enum import Enum
+from pathlib import Path
+from typing import Optional
 
 
 class OS(Enum):
@@ -10,3 +13,19 @@ class OS(Enum):
 
 def is_win_platform() -> bool:
     return sys.platform.startswith("win")
+
+
+def prepare_state_dir(state_dir: Optional[Path], consequence: str) -> Optional[Path]:
+    """Expand and create the state directory, None if there's none or it can't be used
+
+    :param consequence: What happens without the state directory, for the warning
+    """
+    if state_dir is None:
+        return None
+    state_dir = state_dir.expanduser()
+    try:
+        state_dir.mkdir(parents=True, exist_ok=True)
+    except OSError as e:
+        logging.warning(f"Can't use state directory {state_dir}, {consequence}: {e}")
+        return None
+    return state_dir
@@ -0,0 +1,77 @@
+"""Compare summarizing the harvester activity of a large log file with the
+line-by-line pipeline (records, message objects, StatAccumulator.consume)
+and with the columnar backfill (parse_columns, consume_columns).
+
+Run from the repository root:
+    python -m tests.benchmarks.bench_backfill
+"""
+
+# std
+import random
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+from time import perf_counter
+
+# project
+from src.chia_log.backfill import backfill_harvester_activity
+from src.chia_log.handlers.daily_stats.stat_accumulators.search_time_stats import SearchTimeStats
+from src.chia_log.log_record import parse_log_records
+from src.chia_log.mmap_log_reader import MmapLogReader
+from src.chia_log.parsers.harvester_activity_parser import HarvesterActivityParser
+
+LOG_SIZE = 512 * 1024 * 1024
+# A harvester logs one line per signage point, i.e. every ~9 seconds. On a busy
+# node with DEBUG logs that is a small fraction of all lines.
+LINES_PER_HARVESTER_LINE = 200
+
+NOISE_LINES = [
+    "full_node chia.full_node.full_node: DEBUG    Sending peak to peers, new peak height 42",
+    "full_node chia.full_node.mempool_manager: INFO     add_spendbundle took 0.1 seconds",
+    "wallet chia.wallet.wallet_node: DEBUG    Received state for the coin",
+    "farmer chia.farmer.farmer_server: INFO     -> new_signage_point_harvester to peer",
+]
+
+
+def write_logs(path: Path):
+    timestamp = datetime(2023, 2, 5)
+    written = 0
+    with open(path, "w", encoding="UTF-8") as f:
+        while written < LOG_SIZE:
+            timestamp += timedelta(seconds=9)
+            prefix = timestamp.isoformat(timespec="milliseconds")
+            lines = [f"{prefix} {random.choice(NOISE_LINES)}" for _ in range(LINES_PER_HARVESTER_LINE - 1)]
+            lines.append(
+                f"{prefix} harvester chia.harvester.harvester: INFO     1 plots were eligible for farming "
+                f"e25et6cb36... Found 0 proofs. Time: {random.random() * 10:.5f} s. Total 4242 plots"
+            )
+            written += f.write("\n".join(lines) + "\n")
+
+
+def main():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "debug.log"
+        print(f"Writing {LOG_SIZE / 2**20:.0f} MiB of logs...")
+        write_logs(path)
+
+        start = perf_counter()
+        parser = HarvesterActivityParser()
+        stat_acc = SearchTimeStats()
+        with MmapLogReader(path) as reader:
+            for logs in reader.lines():
+                for obj in parser.parse(parse_log_records(logs)):
+                    stat_acc.consume(obj)
+        line_by_line_seconds = perf_counter() - start
+
+        start = perf_counter()
+        bulk_stat_acc = SearchTimeStats()
+        bulk_stat_acc.consume_columns(backfill_harvester_activity([path]))
+        columnar_seconds = perf_counter() - start
+
+        assert stat_acc.get_summary() == bulk_stat_acc.get_summary()
+        for name, seconds in [("line by line", line_by_line_seconds), ("columnar", columnar_seconds)]:
+            print(f"{name:>15}: {seconds:6.2f} s ({LOG_SIZE / 2**20 / seconds:6.0f} MiB/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Compare handling a batch of logs by passing all records to every handler
+with routing the records through the LogDispatcher first. Both include
+tokenizing the logs into records.
+
+Run from the repository root:
+    python -m tests.benchmarks.bench_log_dispatcher
+"""
+
+# std
+import logging
+import random
+from pathlib import Path
+from timeit import timeit
+from typing import List
+
+# lib
+import confuse
+
+# project
+from src.chia_log.log_consumer import LogConsumer
+from src.chia_log.log_handler import LogHandler
+from src.chia_log.log_record import parse_log_records
+from src.notifier import Event
+
+TOTAL_LINES = 100_000
+MATCHING_LINES = [100, 1_000, 10_000, 100_000]
+
+HARVESTER_LINE = (
+    "2023-02-05T17:29:29.434 harvester chia.harvester.harvester: INFO     1 plots were eligible for farming "
+    "e25et6cb36... Found 0 proofs. Time: 0.55515 s. Total 42 plots"
+)
+NOISE_LINES = [
+    "2023-02-05T17:29:29.434 full_node chia.full_node.full_node: DEBUG    Sending peak to peers, new peak height 42",
+    "2023-02-05T17:29:29.434 full_node chia.full_node.mempool_manager: INFO     add_spendbundle took 0.1 seconds",
+    "2023-02-05T17:29:29.434 wallet chia.wallet.wallet_node: DEBUG    Received state for the coin",
+    "2023-02-05T17:29:29.434 farmer chia.farmer.farmer_server: INFO     -> new_signage_point_harvester to peer",
+]
+
+
+class NullLogConsumer(LogConsumer):
+    def stop(self):
+        pass
+
+
+class NullNotifyManager:
+    def process_events(self, events: List[Event]):
+        pass
+
+
+def generate_logs(matching_lines: int) -> str:
+    lines = [HARVESTER_LINE] * matching_lines
+    lines += [random.choice(NOISE_LINES) for _ in range(TOTAL_LINES - matching_lines)]
+    random.shuffle(lines)
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+    config = confuse.Configuration("chiadog", __name__)
+    config.set_file(Path(__file__).resolve().parents[2] / "src/default_config.yaml")
+
+    print(f"{'matching lines':>15} {'all handlers [lines/s]':>24} {'dispatched [lines/s]':>22}")
+    for matching_lines in MATCHING_LINES:
+        logs = generate_logs(matching_lines)
+        log_handler = LogHandler(config, NullLogConsumer(), NullNotifyManager())  # type: ignore
+
+        def all_handlers():
+            records = parse_log_records(logs)
+            for handler in log_handler._active_handlers[None]:
+                handler.handle(records)
+
+        def dispatched():
+            log_handler.consume_logs(parse_log_records(logs))
+
+        all_handlers_seconds = timeit(all_handlers, number=1)
+        dispatched_seconds = timeit(dispatched, number=1)
+        print(
+            f"{matching_lines:>15} {TOTAL_LINES / all_handlers_seconds:>24,.0f} "
+            f"{TOTAL_LINES / dispatched_seconds:>22,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Measure the memory needed to retain parsed harvester activity messages.
+
+Compares the slotted, immutable HarvesterActivityMessage with an
+equivalent plain dataclass (with per-instance __dict__ and without
+interned challenge hashes).
+
+Run from the repository root:
+    python -m tests.benchmarks.bench_message_memory
+"""
+
+# std
+import gc
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, List
+
+# project
+from src.chia_log.log_record import parse_log_records
+from src.chia_log.parsers.harvester_activity_parser import HarvesterActivityParser
+
+MESSAGES = 1_000_000
+# Harvesters log each challenge for every signage point they're eligible for
+SIGNAGE_POINTS_PER_CHALLENGE = 64
+
+
+@dataclass
+class PlainHarvesterActivityMessage:
+    timestamp: datetime
+    eligible_plots_count: int
+    challenge_hash: str
+    found_proofs_count: int
+    search_time_seconds: float
+    total_plots_count: int
+
+
+def generate_logs(count: int) -> str:
+    start = datetime(2023, 2, 5)
+    lines = []
+    for i in range(count):
+        timestamp = (start + timedelta(seconds=9 * i)).isoformat(timespec="milliseconds")
+        challenge = f"{i // SIGNAGE_POINTS_PER_CHALLENGE:010x}"
+        lines.append(
+            f"{timestamp} harvester chia.harvester.harvester: INFO     {i % 5} plots were eligible for farming "
+            f"{challenge}... Found 0 proofs. Time: 0.{i % 1000:03d}15 s. Total 4242 plots"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def measure(create: Callable[[], List]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    messages = create()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del messages
+    return size
+
+
+def main():
+    print(f"Parsing {MESSAGES:,} harvester log lines...")
+    records = parse_log_records(generate_logs(MESSAGES))
+    parser = HarvesterActivityParser()
+
+    def slotted():
+        return parser.parse(records)
+
+    def plain():
+        # Fresh copies of the strings, as they would come from separate regex matches
+        return [
+            PlainHarvesterActivityMessage(
+                timestamp=msg.timestamp,
+                eligible_plots_count=msg.eligible_plots_count,
+                challenge_hash="".join(msg.challenge_hash),
+                found_proofs_count=msg.found_proofs_count,
+                search_time_seconds=msg.search_time_seconds,
+                total_plots_count=msg.total_plots_count,
+            )
+            for msg in parser.parse(records)
+        ]
+
+    for name, create in [("plain dataclass", plain), ("slotted + interned", slotted)]:
+        size = measure(create)
+        print(f"{name:>20}: {size / 2**20:7.1f} MiB per {MESSAGES:,} messages ({size / MESSAGES:.0f} bytes each)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# std
+import unittest
+from pathlib import Path
+from typing import List, Type
+
+# project
+from src.chia_log.log_record import parse_log_records
+from src.chia_log.handlers.daily_stats import HarvesterActivityConsumer, StatAccumulator
+from src.chia_log.handlers.daily_stats.stat_accumulators.eligible_plots_stats import EligiblePlotsStats
+from src.chia_log.handlers.daily_stats.stat_accumulators.found_proof_stats import FoundProofStats
+from src.chia_log.handlers.daily_stats.stat_accumulators.number_plots_stats import NumberPlotsStats
+from src.chia_log.handlers.daily_stats.stat_accumulators.search_time_stats import SearchTimeStats
+from src.chia_log.parsers.harvester_activity_parser import HarvesterActivityParser
+
+
+def summary(stat_acc: HarvesterActivityConsumer) -> str:
+    assert isinstance(stat_acc, StatAccumulator)
+    return stat_acc.get_summary()
+
+
+class TestHarvesterActivityStats(unittest.TestCase):
+    def setUp(self) -> None:
+        self.parser = HarvesterActivityParser()
+        self.example_logs_path = Path(__file__).resolve().parents[3] / "logs/harvester_activity"
+
+    def testColumnsSummaryMatchesMessages(self):
+        for filename in ["nominal.txt", "plots_increased.txt", "plots_decreased.txt", "slow_seek_time.txt"]:
+            with open(self.example_logs_path / filename, encoding="UTF-8") as f:
+                logs = f.read()
+            messages = self.parser.parse(parse_log_records(logs))
+            columns = self.parser.parse_columns(logs)
+
+            stat_acc_types: List[Type[HarvesterActivityConsumer]] = [
+                EligiblePlotsStats,
+                FoundProofStats,
+                NumberPlotsStats,
+                SearchTimeStats,
+            ]
+            for stat_acc_type in stat_acc_types:
+                stat_acc = stat_acc_type()
+                for obj in messages:
+                    stat_acc.consume(obj)
+                bulk_stat_acc = stat_acc_type()
+                bulk_stat_acc.consume_columns(columns)
+                self.assertEqual(summary(stat_acc), summary(bulk_stat_acc), filename)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,6 +3,7 @@ import unittest
 from pathlib import Path
 
 # project
+from src.chia_log.log_record import parse_log_records
 from src.chia_log.handlers.daily_stats.stat_accumulators.signage_point_stats import SignagePointStats
 from src.chia_log.parsers.finished_signage_point_parser import FinishedSignagePointParser
 
@@ -18,7 +19,7 @@ class TestSignagePointStats(unittest.TestCase):
             logs = f.readlines()
 
         for log in logs:
-            objects = self.parser.parse(log)
+            objects = self.parser.parse(parse_log_records(log))
             for obj in objects:
                 self.stat_accumulator.consume(obj)
 
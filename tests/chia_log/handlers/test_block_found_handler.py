@@ -3,6 +3,7 @@ import unittest
 from pathlib import Path
 
 # project
+from src.chia_log.log_record import parse_log_records
 from src.chia_log.handlers import block_handler
 from src.notifier import EventType, EventService, EventPriority
 
@@ -18,7 +19,7 @@ class TestBlockFoundHandler(unittest.TestCase):
 
         expected_number_events = [1, 0]
         for log, number_events in zip(logs, expected_number_events):
-            events = self.handler.handle(log)
+            events = self.handler.handle(parse_log_records(log))
             self.assertEqual(len(events), number_events, "Un-expected number of events")
             if number_events == 1:
                 self.assertEqual(events[0].type, EventType.USER, "Unexpected event type")
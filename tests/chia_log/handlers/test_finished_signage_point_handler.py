@@ -3,6 +3,7 @@ import unittest
 from pathlib import Path
 
 # project
+from src.chia_log.log_record import parse_log_records
 from src.chia_log.handlers import finished_signage_point_handler
 from src.notifier import EventType, EventService, EventPriority
 
@@ -20,7 +21,7 @@ class TestFinishedSignagePointHandler(unittest.TestCase):
         # based on the signage points because it's tightly coupled to
         # the eligible plots check from the harvester
         for log in logs:
-            events = self.handler.handle(log)
+            events = self.handler.handle(parse_log_records(log))
             self.assertEqual(len(events), 0, "Not expecting any events")
 
     def testSkippedSignagePoints(self):
@@ -34,7 +35,7 @@ class TestFinishedSignagePointHandler(unittest.TestCase):
 
         checked = 0
         for log in logs:
-            events = self.handler.handle(log)
+            events = self.handler.handle(parse_log_records(log))
             if len(events) > 0:
                 self.assertEqual(len(events), 1, "Expected a single event")
                 self.assertEqual(events[0].type, EventType.USER, "Unexpected type")
@@ -53,7 +54,7 @@ class TestFinishedSignagePointHandler(unittest.TestCase):
             logs = f.readlines()
 
         for log in logs:
-            events = self.handler.handle(log)
+            events = self.handler.handle(parse_log_records(log))
             self.assertEqual(len(events), 0)
 
     def testNetworkFork(self):
@@ -63,7 +64,7 @@ class TestFinishedSignagePointHandler(unittest.TestCase):
             logs = f.readlines()
 
         for log in logs:
-            events = self.handler.handle(log)
+            events = self.handler.handle(parse_log_records(log))
             self.assertEqual(len(events), 0)
 
     def testNetworkDuplicates(self):
@@ -73,7 +74,7 @@ class TestFinishedSignagePointHandler(unittest.TestCase):
             logs = f.readlines()
 
         for log in logs:
-            events = self.handler.handle(log)
+            events = self.handler.handle(parse_log_records(log))
             self.assertEqual(len(events), 0)
 
 
@@ -3,6 +3,7 @@ import unittest
 from pathlib import Path
 
 # project
+from src.chia_log.log_record import parse_log_records
 from src.chia_log.handlers import harvester_activity_handler
 from src.notifier import EventType, EventService, EventPriority
 
@@ -17,7 +18,7 @@ class TestHarvesterActivityHandler(unittest.TestCase):
             logs = f.readlines()
 
         for log in logs:
-            events = self.handler.handle(log)
+            events = self.handler.handle(parse_log_records(log))
             keepAliveEvents = 0
             for event in events:
                 if event.type == EventType.KEEPALIVE:
@@ -32,7 +33,7 @@ class TestHarvesterActivityHandler(unittest.TestCase):
             logs = f.readlines()
         plotDecreaseEventCount = 0
         for log in logs:
-            events = self.handler.handle(log)
+            events = self.handler.handle(parse_log_records(log))
             for event in events:
                 if event.type == EventType.PLOTDECREASE:
                     plotDecreaseEventCount += 1
@@ -47,7 +48,7 @@ class TestHarvesterActivityHandler(unittest.TestCase):
         plotIncreaseEventCount = 0
 
         for log in logs:
-            events = self.handler.handle(log)
+            events = self.handler.handle(parse_log_records(log))
             for event in events:
                 if event.type == EventType.PLOTINCREASE:
                     plotIncreaseEventCount += 1
@@ -66,7 +67,7 @@ class TestHarvesterActivityHandler(unittest.TestCase):
         lostSyncEventCount = 0
 
         for log in logs:
-            events = self.handler.handle(log)
+            events = self.handler.handle(parse_log_records(log))
             for event in events:
                 if event.type == EventType.USER:
                     lostSyncEventCount += 1
@@ -85,7 +86,7 @@ class TestHarvesterActivityHandler(unittest.TestCase):
             logs = f.readlines()
 
         for log in logs:
-            events = self.handler.handle(log)
+            events = self.handler.handle(parse_log_records(log))
             userEvents = 0
 
             for event in events:
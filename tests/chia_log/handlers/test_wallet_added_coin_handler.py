@@ -7,6 +7,7 @@ import copy
 import confuse
 
 # project
+from src.chia_log.log_record import parse_log_records
 from src.chia_log.handlers.wallet_added_coin_handler import WalletAddedCoinHandler
 from src.notifier import EventType, EventService, EventPriority
 
@@ -34,7 +35,7 @@ class TestWalledAddedCoinHandler(unittest.TestCase):
             logs_after = f.readlines()
 
         for logs in [logs_before, logs_after]:
-            events = self.handler.handle("".join(logs))
+            events = self.handler.handle(parse_log_records("".join(logs)))
             self.assertEqual(1, len(events))
             self.assertEqual(events[0].type, EventType.USER, "Unexpected event type")
             self.assertEqual(events[0].priority, EventPriority.LOW, "Unexpected priority")
@@ -45,7 +46,7 @@ class TestWalledAddedCoinHandler(unittest.TestCase):
         with open(self.example_logs_path / "small_values.txt", encoding="UTF-8") as f:
             logs = f.readlines()
 
-        events = self.handler.handle("".join(logs))
+        events = self.handler.handle(parse_log_records("".join(logs)))
         self.assertEqual(1, len(events))
         self.assertEqual(events[0].type, EventType.USER, "Unexpected event type")
         self.assertEqual(events[0].priority, EventPriority.LOW, "Unexpected priority")
@@ -61,9 +62,9 @@ class TestWalledAddedCoinHandler(unittest.TestCase):
         no_filter_handler = WalletAddedCoinHandler(no_filter_config)
         with open(self.example_logs_path / "small_values.txt", encoding="UTF-8") as f:
             logs = f.readlines()
-        filter_events = filter_handler.handle("".join(logs))
+        filter_events = filter_handler.handle(parse_log_records("".join(logs)))
         self.assertEqual(0, len(filter_events))
-        no_filter_events = no_filter_handler.handle("".join(logs))
+        no_filter_events = no_filter_handler.handle(parse_log_records("".join(logs)))
         self.assertEqual(1, len(no_filter_events))
 
 
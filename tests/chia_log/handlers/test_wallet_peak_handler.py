@@ -9,6 +9,7 @@ from pathlib import Path
 import confuse
 
 # project
+from src.chia_log.log_record import parse_log_records
 from src.chia_log.handlers.wallet_peak_handler import WalletPeakHandler
 from src.notifier import EventType, EventService, EventPriority
 
@@ -50,7 +51,7 @@ class TestWalledPeakHandler(unittest.TestCase):
 
     def testNominal(self):
         for name, log in self.nominal_logs.items():
-            events = self.handler.handle("".join(log))
+            events = self.handler.handle(parse_log_records("".join(log)))
             self.assertEqual(10, len(events), f"Log: {name}")
             self.assertEqual(events[0].type, EventType.KEEPALIVE, "Unexpected event type")
             self.assertEqual(events[0].priority, EventPriority.NORMAL, "Unexpected priority")
@@ -59,7 +60,7 @@ class TestWalledPeakHandler(unittest.TestCase):
 
     def testPartialDelay(self):
         for name, log in self.partial_logs.items():
-            events = self.handler.handle("".join(log))
+            events = self.handler.handle(parse_log_records("".join(log)))
             self.assertEqual(8, len(events), f"Log: {name}")
             self.assertEqual(events[0].type, EventType.KEEPALIVE, "Unexpected event type")
             self.assertEqual(events[0].priority, EventPriority.NORMAL, "Unexpected priority")
@@ -80,7 +81,7 @@ class TestWalledPeakHandler(unittest.TestCase):
 
         with self.assertLogs(level="DEBUG") as cm:
             for name, log in self.fail_logs.items():
-                events = self.handler.handle("".join(log))
+                events = self.handler.handle(parse_log_records("".join(log)))
                 # Only 3 events are up to speed
                 self.assertEqual(2, len(events), f"Wrong amount of keep-alive events, log: {name}")
         self.assertEqual(cm.output, expected_logs)
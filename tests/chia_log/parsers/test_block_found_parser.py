@@ -3,6 +3,7 @@ import unittest
 from pathlib import Path
 
 # project
+from src.chia_log.log_record import parse_log_records
 from src.chia_log.parsers import block_parser
 
 
@@ -18,7 +19,7 @@ class TestBlockFoundParser(unittest.TestCase):
 
     def testBasicParsing(self):
         for logs in [self.nominal_logs]:
-            activity_messages = self.parser.parse(logs)
+            activity_messages = self.parser.parse(parse_log_records(logs))
             self.assertNotEqual(len(activity_messages), 0, "No log messages found")
 
             expected_eligible_block_counts = [1, 0]
@@ -3,6 +3,7 @@ import unittest
 from pathlib import Path
 
 # project
+from src.chia_log.log_record import parse_log_records
 from src.chia_log.parsers import finished_signage_point_parser
 
 
@@ -21,7 +22,7 @@ class TestFinishedSignagePointParser(unittest.TestCase):
     def testBasicParsing(self):
         for logs in [self.nominal_logs, self.nominal_logs_old_format]:
             # Check that important fields are correctly parsed
-            signage_point_messages = self.parser.parse(logs)
+            signage_point_messages = self.parser.parse(parse_log_records(logs))
             self.assertNotEqual(len(signage_point_messages), 0, "No log messages found")
 
             expected_sequence = list(range(62, 65)) + list(range(1, 65)) + list(range(1, 10))
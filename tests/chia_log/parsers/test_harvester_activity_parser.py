@@ -1,8 +1,10 @@
 # std
+import dataclasses
 import unittest
 from pathlib import Path
 
 # project
+from src.chia_log.log_record import parse_log_records
 from src.chia_log.parsers import harvester_activity_parser
 
 
@@ -21,7 +23,7 @@ class TestHarvesterActivityParser(unittest.TestCase):
     def testBasicParsing(self):
         for logs in [self.nominal_logs, self.nominal_logs_old_format]:
             # Check that important fields are correctly parsed
-            activity_messages = self.parser.parse(logs)
+            activity_messages = self.parser.parse(parse_log_records(logs))
             self.assertNotEqual(len(activity_messages), 0, "No log messages found")
 
             expected_eligible_plot_counts = [0, 1, 2, 3, 0]
@@ -47,6 +49,39 @@ class TestHarvesterActivityParser(unittest.TestCase):
                 self.assertLess(seconds_since_last_activity, 10, "Unexpected duration between harvesting events")
                 prev_timestamp = msg.timestamp
 
+    def testMessagesAreCompact(self):
+        activity_messages = self.parser.parse(parse_log_records(self.nominal_logs))
+
+        self.assertFalse(hasattr(activity_messages[0], "__dict__"))
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            activity_messages[0].total_plots_count = 0  # type: ignore
+        # All messages of the same challenge share the challenge hash
+        self.assertIs(activity_messages[0].challenge_hash, activity_messages[1].challenge_hash)
+
+    def testColumnsMatchMessages(self):
+        for logs in [self.nominal_logs, self.nominal_logs_old_format]:
+            activity_messages = self.parser.parse(parse_log_records(logs))
+            columns = self.parser.parse_columns(logs)
+
+            self.assertEqual(len(columns), len(activity_messages))
+            self.assertEqual(
+                list(columns.timestamps),
+                [round(msg.timestamp.timestamp() * 1_000_000) for msg in activity_messages],
+            )
+            self.assertEqual(
+                list(columns.eligible_plots_count), [msg.eligible_plots_count for msg in activity_messages]
+            )
+            self.assertEqual(list(columns.found_proofs_count), [msg.found_proofs_count for msg in activity_messages])
+            self.assertEqual(list(columns.search_time_seconds), [msg.search_time_seconds for msg in activity_messages])
+            self.assertEqual(list(columns.total_plots_count), [msg.total_plots_count for msg in activity_messages])
+
+    def testColumnsIgnoreOtherLoggers(self):
+        logs = (
+            "2023-02-05T17:29:29.434 farmer chia.farmer.farmer: INFO     Message harvester chia.harvester.harvester: "
+            "INFO 1 plots were eligible for farming e25et6cb36... Found 0 proofs. Time: 0.55515 s. Total 42 plots\n"
+        )
+        self.assertEqual(len(self.parser.parse_columns(logs)), 0)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -3,6 +3,7 @@ import unittest
 from pathlib import Path
 
 # project
+from src.chia_log.log_record import parse_log_records
 from src.chia_log.parsers.wallet_added_coin_parser import WalletAddedCoinParser
 
 
@@ -26,7 +27,7 @@ class TestWalletAddedCoinParser(unittest.TestCase):
             self.nominal_logs_after_151,
             self.nominal_logs_after_161,
         ]:
-            added_coins = self.parser.parse(nominal_logs)
+            added_coins = self.parser.parse(parse_log_records(nominal_logs))
             total_mojos = 0
             for coin in added_coins:
                 total_mojos += coin.amount_mojos
@@ -4,6 +4,7 @@ import datetime
 from pathlib import Path
 
 # project
+from src.chia_log.log_record import parse_log_records
 from src.chia_log.parsers.wallet_peak_parser import WalletPeakParser
 
 
@@ -16,7 +17,7 @@ class TestWalletPeakParser(unittest.TestCase):
 
     def testBasicParsing(self):
         for nominal_logs in [self.nominal_logs]:
-            peaks = self.parser.parse(nominal_logs)
+            peaks = self.parser.parse(parse_log_records(nominal_logs))
             for peak in peaks:
                 self.assertIsInstance(peak.peak, int)
                 self.assertIsInstance(peak.peak_time, datetime.datetime)
@@ -0,0 +1,28 @@
+# std
+import unittest
+from pathlib import Path
+
+# project
+from src.chia_log.backfill import backfill_harvester_activity, sort_rotated_logs
+
+
+class TestBackfill(unittest.TestCase):
+    def setUp(self) -> None:
+        self.example_logs_path = Path(__file__).resolve().parent / "logs/harvester_activity"
+
+    def testRotatedLogsAreSortedOldestFirst(self):
+        paths = [Path("debug.log"), Path("debug.log.1"), Path("debug.log.10"), Path("debug.log.2")]
+        self.assertEqual(
+            sort_rotated_logs(paths),
+            [Path("debug.log.10"), Path("debug.log.2"), Path("debug.log.1"), Path("debug.log")],
+        )
+
+    def testBackfillHarvesterActivity(self):
+        columns = backfill_harvester_activity(
+            [self.example_logs_path / "plots_increased.txt", self.example_logs_path / "nominal.txt"]
+        )
+        self.assertEqual(len(columns), 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
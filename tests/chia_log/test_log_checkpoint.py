@@ -0,0 +1,65 @@
+# std
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+# project
+from src.chia_log.log_checkpoint import LogCheckpoint, LogCheckpointStore
+
+
+class TestLogCheckpoint(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.log_path = Path(self.temp_dir.name) / "debug.log"
+        self.log_path.write_text("2023-02-05T17:29:29.434 first line\n2023-02-05T17:29:30.434 second line\n")
+        self.checkpoint_path = Path(self.temp_dir.name) / "debug.log.checkpoint"
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def testMatchesRenamedFile(self):
+        with open(self.log_path, "rb") as f:
+            checkpoint = LogCheckpoint.of(f, offset=35)
+        os.rename(self.log_path, self.log_path.with_name("debug.log.1"))
+
+        with open(self.log_path.with_name("debug.log.1"), "rb") as f:
+            self.assertTrue(checkpoint.matches(f))
+
+    def testDoesNotMatchOtherFile(self):
+        with open(self.log_path, "rb") as f:
+            checkpoint = LogCheckpoint.of(f, offset=35)
+
+        # Same inode but different content, i.e. truncated and rewritten
+        self.log_path.write_text("2023-02-06T00:00:00.000 new line\n")
+        with open(self.log_path, "rb") as f:
+            self.assertFalse(checkpoint.matches(f))
+
+    def testStoreRoundTrip(self):
+        with open(self.log_path, "rb") as f:
+            checkpoint = LogCheckpoint.of(f, offset=35)
+
+        store = LogCheckpointStore(self.checkpoint_path)
+        self.assertIsNone(store.load())
+        store.update(checkpoint)
+        store.flush()
+
+        self.assertEqual(LogCheckpointStore(self.checkpoint_path).load(), checkpoint)
+        self.assertEqual(sorted(os.listdir(self.temp_dir.name)), ["debug.log", "debug.log.checkpoint"])
+
+    def testStoreWritesInBatches(self):
+        store = LogCheckpointStore(self.checkpoint_path)
+        store.flush_interval_seconds = 3600
+        store.update(LogCheckpoint(inode=1, offset=1, fingerprint="", fingerprint_size=0))
+        self.assertFalse(self.checkpoint_path.exists())
+
+        store.flush()
+        self.assertTrue(self.checkpoint_path.exists())
+
+    def testInvalidCheckpointIsIgnored(self):
+        self.checkpoint_path.write_text('{"inode": 1')
+        self.assertIsNone(LogCheckpointStore(self.checkpoint_path).load())
+
+
+if __name__ == "__main__":
+    unittest.main()
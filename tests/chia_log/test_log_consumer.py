@@ -0,0 +1,724 @@
+# std
+import base64
+import os
+import re
+import shlex
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import tempfile
+import unittest
+from pathlib import Path, PurePosixPath, PureWindowsPath
+from queue import Queue
+from time import sleep, monotonic
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# lib
+import confuse
+
+# project
+from src.chia_log.file_watcher import InotifyWatcher
+from src.chia_log.log_consumer import (
+    FileLogConsumer,
+    LogConsumer,
+    LogConsumerSubscriber,
+    MultiLogConsumer,
+    PosixNetworkLogConsumer,
+    SftpLogConsumer,
+    WindowsNetworkLogConsumer,
+    _remote_filter_pattern,
+    create_log_consumer_from_config,
+)
+from src.chia_log.log_record import LogRecord
+from src.chia_log.network_event_loop import ByteChannel, NetworkEventLoop
+from src.chia_log.ssh_session import SshSession
+from src.util import OS
+
+
+def log_line(message: str) -> str:
+    return f"2023-02-05T17:29:29.434 harvester chia.harvester.harvester: INFO     {message}"
+
+
+class CollectingSubscriber(LogConsumerSubscriber):
+    def __init__(self):
+        self.batches: List[List[LogRecord]] = []
+
+    def consume_logs(self, records: List[LogRecord]):
+        self.batches.append(records)
+
+    def lines(self) -> List[str]:
+        return [record.message for batch in self.batches for record in batch]
+
+
+class CatchUpRecordingSubscriber(CollectingSubscriber):
+    def __init__(self, consumer: LogConsumer):
+        super().__init__()
+        self._consumer = consumer
+        self.catching_up: List[bool] = []
+
+    def consume_logs(self, records: List[LogRecord]):
+        self.catching_up.append(self._consumer.is_catching_up)
+        super().consume_logs(records)
+
+
+class DummyLogConsumer(LogConsumer):
+    max_batch_bytes = 200
+
+    def stop(self):
+        pass
+
+    def push(self, logs: str):
+        self._notify_subscribers(logs)
+
+
+class TestLogConsumer(unittest.TestCase):
+    def testBatchesAreBoundedBySize(self):
+        subscriber = CollectingSubscriber()
+        consumer = DummyLogConsumer()
+        consumer.subscribe(subscriber)
+
+        consumer._notify_subscribers_batched(log_line(f"line {i}") + "\n" for i in range(10))
+
+        self.assertEqual(subscriber.lines(), [f"line {i}" for i in range(10)])
+        self.assertEqual([len(batch) for batch in subscriber.batches], [3, 3, 3, 1])
+
+    def testIngestFileOnlyDecodesSubscribedLoggers(self):
+        harvester_subscriber = CollectingSubscriber()
+        harvester_subscriber.loggers = lambda: [("harvester", "harvester.harvester")]  # type: ignore
+        consumer = DummyLogConsumer()
+        consumer.subscribe(harvester_subscriber)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            log_path = Path(temp_dir) / "debug.log.1"
+            log_path.write_text(
+                log_line("line 1\n")
+                + "2023-02-05T17:29:29.434 farmer chia.farmer.farmer: INFO     other logger\n"
+                + log_line("line 2\n")
+            )
+            consumer.ingest_file(log_path)
+            self.assertEqual(harvester_subscriber.lines(), ["line 1", "line 2"])
+
+            # Subscribers without loggers get everything
+            all_subscriber = CollectingSubscriber()
+            consumer.subscribe(all_subscriber)
+            consumer.ingest_file(log_path)
+            self.assertEqual(all_subscriber.lines(), ["line 1", "other logger", "line 2"])
+
+
+class TestMultiLogConsumer(unittest.TestCase):
+    def testMergesTaggedSources(self):
+        full_node, harvester = DummyLogConsumer(), DummyLogConsumer()
+        harvester._is_catching_up = True
+        consumer = MultiLogConsumer({"full-node": full_node, "harvester-1": harvester})
+        subscriber = CatchUpRecordingSubscriber(consumer)
+        consumer.subscribe(subscriber)
+
+        threads = [
+            threading.Thread(target=source.push, args=("".join(log_line(f"line {i}\n") for i in range(100)),))
+            for source in [full_node, harvester]
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(
+            sorted((record.source, len(batch)) for batch in subscriber.batches for record in batch[:1]),
+            [("full-node", 100), ("harvester-1", 100)],
+        )
+        # Answered for the source of the batch at hand
+        by_source = {batch[0].source: flag for batch, flag in zip(subscriber.batches, subscriber.catching_up)}
+        self.assertEqual(by_source, {"full-node": False, "harvester-1": True})
+        self.assertTrue(consumer.is_catching_up)
+
+    def testCreateFromConfig(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config = confuse.Configuration("chiadog", __name__)
+            config.set(
+                {
+                    "chia_logs": {
+                        "file_log_consumer": {"enable": True, "file_path": "unused.log"},
+                        "sources": [
+                            {"name": name, "file_log_consumer": {"file_path": f"{temp_dir}/{name}.log"}}
+                            for name in ["full-node", "harvester-1"]
+                        ],
+                    }
+                }
+            )
+
+            consumer = create_log_consumer_from_config(config["chia_logs"])
+            consumer.stop()
+
+            self.assertIsInstance(consumer, MultiLogConsumer)
+            self.assertEqual(list(consumer._consumers), ["full-node", "harvester-1"])  # type: ignore
+
+
+class SocketSession(SshSession):
+    """Hands out one end of a new socket pair for each command instead of running it on a remote harvester"""
+
+    min_backoff_seconds = 0.01
+
+    def __init__(self):
+        super().__init__("harvester", "chia", 22)
+        self.commands: List[str] = []
+        self.harvesters: "Queue[socket.socket]" = Queue()
+
+    @property
+    def is_connected(self) -> bool:
+        return True
+
+    def exec_command(self, command: str) -> ByteChannel:  # type: ignore
+        self.commands.append(command)
+        remote_socket, harvester = socket.socketpair()
+        self.harvesters.put(harvester)
+        return remote_socket
+
+
+class TestPosixNetworkLogConsumer(unittest.TestCase):
+    def setUp(self) -> None:
+        self.event_loop = NetworkEventLoop()
+        self.sessions = [SocketSession() for _ in range(50)]
+        self.subscriber = CollectingSubscriber()
+        self.consumer = MultiLogConsumer(
+            {
+                f"harvester-{i}": PosixNetworkLogConsumer(
+                    PurePosixPath("debug.log"), session, OS.LINUX, self.event_loop
+                )
+                for i, session in enumerate(self.sessions)
+            }
+        )
+        self.harvesters: List[socket.socket] = []
+
+    def tearDown(self) -> None:
+        self.consumer.stop()
+        self.event_loop.stop()
+        for harvester in self.harvesters:
+            harvester.close()
+
+    def connectHarvester(self, session: SocketSession) -> socket.socket:
+        harvester = session.harvesters.get(timeout=5)
+        self.harvesters.append(harvester)
+        return harvester
+
+    def waitForLines(self, count: int, timeout: float = 5) -> List[str]:
+        deadline = monotonic() + timeout
+        while len(self.subscriber.lines()) < count and monotonic() < deadline:
+            sleep(0.05)
+        return self.subscriber.lines()
+
+    def testFollowsManyHarvestersOnOneThread(self):
+        threads_before = threading.active_count()
+        self.consumer.subscribe(self.subscriber)
+        harvesters = [self.connectHarvester(session) for session in self.sessions]
+
+        # Lines split across reads are put back together
+        for i, harvester in enumerate(harvesters):
+            harvester.sendall(log_line(f"harvester {i}").encode())
+        for harvester in harvesters:
+            harvester.sendall(b" line 1\n" + log_line("line 2\n").encode())
+
+        self.assertEqual(len(self.waitForLines(100)), 100)
+        # The event loop and its workers for blocking calls, regardless of the number of harvesters
+        self.assertLessEqual(threading.active_count(), threads_before + 1 + NetworkEventLoop.max_blocking_workers)
+        lines_by_source: Dict[Optional[str], List[str]] = {}
+        for batch in self.subscriber.batches:
+            for record in batch:
+                lines_by_source.setdefault(record.source, []).append(record.message)
+        self.assertEqual(
+            lines_by_source, {f"harvester-{i}": [f"harvester {i} line 1", "line 2"] for i in range(len(harvesters))}
+        )
+
+    def testThrottlesRemoteWhileSubscribersAreBusy(self):
+        session = SocketSession()
+        consumer = PosixNetworkLogConsumer(PurePosixPath("debug.log"), session, OS.LINUX, self.event_loop)
+        self.addCleanup(consumer.stop)
+        is_released = threading.Event()
+
+        class BusySubscriber(CollectingSubscriber):
+            def consume_logs(self, records: List[LogRecord]):
+                is_released.wait(5)
+                super().consume_logs(records)
+
+        subscriber = BusySubscriber()
+        consumer.subscribe(subscriber)
+        harvester = self.connectHarvester(session)
+        lines = [log_line(f"line {i}\n").encode() for i in range(100000)]
+        sender = threading.Thread(target=harvester.sendall, args=(b"".join(lines),))
+        sender.start()
+        sleep(0.5)
+
+        # Only what was read before the subscriber got busy, the rest waits on the harvester
+        self.assertLessEqual(consumer.bytes_received, PosixNetworkLogConsumer.max_batch_bytes)
+        self.assertTrue(sender.is_alive())
+        is_released.set()
+        sender.join(5)
+        deadline = monotonic() + 5
+        while len(subscriber.lines()) < len(lines) and monotonic() < deadline:
+            sleep(0.05)
+        self.assertEqual(len(subscriber.lines()), len(lines))
+
+    def testDropsOverlongLines(self):
+        self.consumer.subscribe(self.subscriber)
+        harvester = self.connectHarvester(self.sessions[0])
+        remote_consumer: PosixNetworkLogConsumer = self.consumer._consumers["harvester-0"]  # type: ignore
+
+        harvester.sendall(b"x" * 4 * PosixNetworkLogConsumer.max_batch_bytes)
+        harvester.sendall(b"\n" + log_line("line 1\n").encode())
+
+        self.assertEqual(self.waitForLines(1), ["line 1"])
+        self.assertLessEqual(len(remote_consumer._partial_line), PosixNetworkLogConsumer.max_batch_bytes)
+
+    def testResumesAfterReconnect(self):
+        self.consumer.subscribe(self.subscriber)
+        session = self.sessions[0]
+        harvester = self.connectHarvester(session)
+        self.assertIn("i=''; o=0", shlex.split(session.commands[0])[-1])
+
+        line = log_line("line 1\n").encode()
+        harvester.sendall(b"#chiadog:follow 42 100#\n" + line + log_line("incomplete").encode())
+        self.assertEqual(self.waitForLines(1), ["line 1"])
+        harvester.close()
+
+        # Continues after the last complete line
+        harvester = self.connectHarvester(session)
+        self.assertIn(f"i=42; o={100 + len(line)}", shlex.split(session.commands[1])[-1])
+        harvester.sendall(f"#chiadog:follow 42 {100 + len(line)}#\n".encode() + log_line("complete\n").encode())
+        self.assertEqual(self.waitForLines(2), ["line 1", "complete"])
+
+    def testFiltersRemotely(self):
+        session = SocketSession()
+        consumer = PosixNetworkLogConsumer(
+            PurePosixPath("debug.log"), session, OS.LINUX, self.event_loop, remote_filter=True
+        )
+        self.subscriber.loggers = lambda: [("harvester", "harvester.harvester")]  # type: ignore
+        consumer.subscribe(self.subscriber)
+        harvester = self.connectHarvester(session)
+
+        pattern = re.compile(_remote_filter_pattern(self.subscriber.loggers()))
+        self.assertIn(shlex.quote(pattern.pattern), shlex.split(session.commands[0])[-1])
+        self.assertTrue(pattern.search(log_line("1 plots were eligible")))
+        self.assertFalse(pattern.search(log_line("1 plots were eligible").replace("INFO ", "DEBUG")))
+        self.assertFalse(pattern.search(log_line("1 plots were eligible").replace("harvester", "farmer")))
+
+        line = log_line("line 1\n").encode()
+        harvester.sendall(b"#chiadog:follow 42 0#\n" + line + b"#chiadog:dropped 3 300#\n" + line)
+        self.assertEqual(self.waitForLines(2), ["line 1", "line 1"])
+        consumer.stop()
+
+        self.assertEqual(consumer.remote_lines_dropped, 3)
+        self.assertEqual(consumer.remote_bytes_dropped, 300)
+        self.assertEqual(consumer.bytes_received, 2 * len(line) + 46)
+        # Dropped lines still count towards the offset to resume from
+        self.assertIn(f"i=42; o={2 * len(line) + 300}", shlex.split(consumer._follow_command())[-1])
+
+    def testStopClosesChannel(self):
+        session = SocketSession()
+        # Has the event loop to itself and stops it along with the consumer
+        consumer = PosixNetworkLogConsumer(PurePosixPath("debug.log"), session, OS.LINUX)
+        consumer.subscribe(self.subscriber)
+        harvester = self.connectHarvester(session)
+        consumer.stop()
+
+        assert consumer._future is not None
+        self.assertTrue(consumer._future.done())
+        harvester.settimeout(5)
+        self.assertEqual(harvester.recv(1), b"")
+
+
+# Like the tail of BSD and busybox (unlike GNU tail), only exits on a closed pipe once it writes to it
+_LAZY_TAIL = """#!{python}
+import sys, time
+
+with open(sys.argv[-1], "rb") as f:
+    f.seek(int(sys.argv[2]) - 1)
+    while True:
+        data = f.read()
+        if data:
+            sys.stdout.buffer.write(data)
+            sys.stdout.buffer.flush()
+        time.sleep(0.1)
+"""
+
+
+@unittest.skipUnless(sys.platform.startswith("linux"), "Requires /proc")
+class TestPosixFollowScript(unittest.TestCase):
+    """Runs the remote follow script locally"""
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.log_path = Path(self.temp_dir.name) / "debug.log"
+        self.log_path.write_text(log_line("line 1\n"))
+        tail_path = Path(self.temp_dir.name) / "tail"
+        tail_path.write_text(_LAZY_TAIL.format(python=sys.executable))
+        tail_path.chmod(0o755)
+        self.event_loop = NetworkEventLoop()
+        self.addCleanup(self.event_loop.stop)
+
+    def startScript(self) -> subprocess.Popen:
+        consumer = PosixNetworkLogConsumer(
+            PurePosixPath(self.log_path), SocketSession(), OS.LINUX, self.event_loop, remote_filter=True
+        )
+        self.addCleanup(consumer.stop)
+        consumer.rotation_check_seconds = 0.2  # type: ignore
+        consumer.rotation_drain_seconds = 0.2  # type: ignore
+        subscriber = CollectingSubscriber()
+        subscriber.loggers = lambda: [("harvester", "harvester.harvester")]  # type: ignore
+        consumer.subscribe(subscriber)
+        process = subprocess.Popen(
+            consumer._follow_command(),
+            shell=True,
+            stdout=subprocess.PIPE,
+            start_new_session=True,
+            env={**os.environ, "PATH": f"{self.temp_dir.name}:{os.environ['PATH']}"},
+        )
+        self.addCleanup(process.wait)
+        self.addCleanup(os.killpg, process.pid, signal.SIGKILL)
+        return process
+
+    def runningTails(self, session_id: int) -> int:
+        count = 0
+        for pid in filter(str.isdigit, os.listdir("/proc")):
+            try:
+                if os.getsid(int(pid)) == session_id and Path(f"/proc/{pid}/comm").read_text().strip() == "tail":
+                    count += 1
+            except (OSError, ProcessLookupError):
+                pass
+        return count
+
+    def testStopsTailOfRotatedFile(self):
+        process = self.startScript()
+        sleep(0.5)
+        self.assertEqual(self.runningTails(process.pid), 1)
+
+        for i in range(3):
+            self.log_path.rename(self.log_path.with_name(f"debug.log.{i + 1}"))
+            self.log_path.write_text(log_line(f"rotated {i}\n"))
+            sleep(1)
+
+        self.assertEqual(self.runningTails(process.pid), 1)
+        os.killpg(process.pid, signal.SIGKILL)
+        output, _ = process.communicate()
+        # The markers pass the filter
+        self.assertEqual(output.count(b"#chiadog:follow "), 4)
+
+
+class TestWindowsNetworkLogConsumer(unittest.TestCase):
+    def testFollowsRotation(self):
+        event_loop = NetworkEventLoop()
+        session = SocketSession()
+        consumer = WindowsNetworkLogConsumer(PureWindowsPath("C:\\debug.log"), session, OS.WINDOWS, event_loop)
+        subscriber = CollectingSubscriber()
+        consumer.subscribe(subscriber)
+        harvester = session.harvesters.get(timeout=5)
+
+        # The old file ended in an incomplete line and the marker arrives in two reads
+        marker = b"#chiadog:follow 1337 0#\n"
+        harvester.sendall(log_line("line 1\n").encode() + log_line("incomplete").encode() + marker[:5])
+        sleep(0.2)
+        line = log_line("line 2\n").encode()
+        harvester.sendall(marker[5:] + line)
+
+        deadline = monotonic() + 5
+        while len(subscriber.lines()) < 2 and monotonic() < deadline:
+            sleep(0.05)
+        consumer.stop()
+        event_loop.stop()
+        harvester.close()
+
+        self.assertEqual(subscriber.lines(), ["line 1", "line 2"])
+        script = base64.b64decode(consumer._follow_command().split()[-1]).decode("utf-16-le")
+        self.assertIn("$id = '1337'", script)
+        # Identified by file index, NTFS carries creation times over to recreated files
+        self.assertIn("GetFileInformationByHandle", script)
+        self.assertIn(f"$offset = {len(line)}", script)
+
+
+class LocalSftpFile:
+    """The subset of paramiko.SFTPFile used by the SftpLogConsumer, on a local file"""
+
+    def __init__(self, path: Path):
+        self._file = open(path, "rb")
+
+    def __enter__(self) -> "LocalSftpFile":
+        return self
+
+    def __exit__(self, *args):
+        self._file.close()
+
+    def stat(self) -> os.stat_result:
+        return os.fstat(self._file.fileno())
+
+    def readv(self, chunks: List[Tuple[int, int]]) -> Iterator[bytes]:
+        for offset, length in chunks:
+            self._file.seek(offset)
+            yield self._file.read(length)
+
+
+class LocalSftpClient:
+    def __init__(self, directory: Path):
+        self._directory = directory
+
+    def open(self, path: str, mode: str) -> LocalSftpFile:
+        return LocalSftpFile(self._directory / path)
+
+    def close(self):
+        pass
+
+
+class LocalSftpSession(SshSession):
+    """Opens SFTP sessions on a local directory instead of a remote harvester"""
+
+    def __init__(self, directory: Path):
+        super().__init__("harvester", "chia", 22)
+        self._directory = directory
+
+    @property
+    def is_connected(self) -> bool:
+        return True
+
+    def open_sftp(self) -> LocalSftpClient:  # type: ignore
+        return LocalSftpClient(self._directory)
+
+
+class TestSftpLogConsumer(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.log_dir = Path(self.temp_dir.name)
+        self.log_path = self.log_dir / "debug.log"
+        self.log_path.write_text("old line that should be skipped\n")
+        self.event_loop = NetworkEventLoop()
+        self.consumer: Optional[SftpLogConsumer] = None
+
+    def tearDown(self) -> None:
+        if self.consumer:
+            self.consumer.stop()
+        self.event_loop.stop()
+        self.temp_dir.cleanup()
+
+    def startConsumer(self) -> CollectingSubscriber:
+        subscriber = CollectingSubscriber()
+        self.consumer = SftpLogConsumer("~/debug.log", LocalSftpSession(self.log_dir), self.log_dir, self.event_loop)
+        self.consumer.poll_interval_seconds = 0.05
+        self.consumer.subscribe(subscriber)
+        # Give the consumer a moment to find the end of the file
+        sleep(0.3)
+        return subscriber
+
+    def appendLines(self, path: Path, lines: List[str]):
+        with open(path, "a", encoding="UTF-8") as f:
+            for line in lines:
+                f.write(log_line(line) + "\n")
+
+    def waitForLines(self, subscriber: CollectingSubscriber, count: int, timeout: float = 5) -> List[str]:
+        deadline = monotonic() + timeout
+        while len(subscriber.lines()) < count and monotonic() < deadline:
+            sleep(0.05)
+        return subscriber.lines()
+
+    def testReadsNewLinesAcrossRotation(self):
+        subscriber = self.startConsumer()
+        self.appendLines(self.log_path, ["line 1", "line 2"])
+        self.assertEqual(self.waitForLines(subscriber, 2), ["line 1", "line 2"])
+
+        # Written just before the rotation and not polled yet
+        with open(self.log_path, "a", encoding="UTF-8") as f:
+            f.write(log_line("line 3\n") + log_line("incomplete"))
+            f.flush()
+            self.log_path.rename(self.log_path.with_name("debug.log.1"))
+            f.write(" line 4\n")
+        self.appendLines(self.log_path, ["line 5"])
+
+        self.assertEqual(
+            self.waitForLines(subscriber, 5), ["line 1", "line 2", "line 3", "incomplete line 4", "line 5"]
+        )
+
+    def testContinuesAfterRestart(self):
+        subscriber = self.startConsumer()
+        self.appendLines(self.log_path, ["line 1"])
+        self.assertEqual(self.waitForLines(subscriber, 1), ["line 1"])
+        assert self.consumer is not None
+        self.consumer.stop()
+
+        self.appendLines(self.log_path, ["line 2"])
+        subscriber = self.startConsumer()
+        self.assertEqual(self.waitForLines(subscriber, 1), ["line 2"])
+        self.assertFalse(self.consumer.is_catching_up)
+
+
+class TestFileLogConsumer(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.log_path = Path(self.temp_dir.name) / "debug.log"
+        self.log_path.write_text("old line that should be skipped\n")
+        self.consumer: Optional[FileLogConsumer] = None
+
+    def tearDown(self) -> None:
+        if self.consumer:
+            self.consumer.stop()
+            self.consumer._thread.join()
+        self.temp_dir.cleanup()
+
+    def startConsumer(self, watch_mode: str, state_dir: Optional[Path] = None) -> CollectingSubscriber:
+        subscriber = CollectingSubscriber()
+        self.consumer = FileLogConsumer(self.log_path, watch_mode=watch_mode, state_dir=state_dir)
+        self.consumer.subscribe(subscriber)
+        # Give the consumer thread a moment to open the file at its end
+        sleep(0.2 if watch_mode == "inotify" else 1.5)
+        return subscriber
+
+    def appendLines(self, path: Path, lines: List[str]):
+        with open(path, "a", encoding="UTF-8") as f:
+            for line in lines:
+                f.write(log_line(line) + "\n")
+
+    def waitForLines(self, subscriber: CollectingSubscriber, count: int, timeout: float) -> List[str]:
+        deadline = monotonic() + timeout
+        while len(subscriber.lines()) < count and monotonic() < deadline:
+            sleep(0.05)
+        return subscriber.lines()
+
+    @unittest.skipUnless(InotifyWatcher.is_supported(), "Requires inotify")
+    def testInotifyDeliversNewLines(self):
+        subscriber = self.startConsumer("inotify")
+        start = monotonic()
+        self.appendLines(self.log_path, ["line 1", "line 2"])
+
+        self.assertEqual(self.waitForLines(subscriber, 2, timeout=5), ["line 1", "line 2"])
+        # Woken up by the write instead of the one second polling interval
+        self.assertLess(monotonic() - start, 0.9)
+
+    @unittest.skipUnless(InotifyWatcher.is_supported(), "Requires inotify")
+    def testInotifyDeliversBatches(self):
+        subscriber = self.startConsumer("inotify")
+        self.appendLines(self.log_path, [f"line {i}" for i in range(1000)])
+
+        self.assertEqual(len(self.waitForLines(subscriber, 1000, timeout=5)), 1000)
+        self.assertLess(len(subscriber.batches), 10)
+
+    @unittest.skipUnless(InotifyWatcher.is_supported(), "Requires inotify")
+    def testInotifyHoldsBackPartialLines(self):
+        subscriber = self.startConsumer("inotify")
+        with open(self.log_path, "a", encoding="UTF-8") as f:
+            f.write(log_line("incomplete"))
+        sleep(0.3)
+        self.assertEqual(subscriber.lines(), [])
+
+        with open(self.log_path, "a", encoding="UTF-8") as f:
+            f.write(" line\n")
+        self.assertEqual(self.waitForLines(subscriber, 1, timeout=5), ["incomplete line"])
+
+    @unittest.skipUnless(InotifyWatcher.is_supported(), "Requires inotify")
+    def testInotifyFollowsRotation(self):
+        subscriber = self.startConsumer("inotify")
+        self.appendLines(self.log_path, ["before rotation"])
+        self.waitForLines(subscriber, 1, timeout=5)
+
+        os.rename(self.log_path, self.log_path.with_name("debug.log.1"))
+        self.appendLines(self.log_path.with_name("debug.log.1"), ["written to rotated file"])
+        self.appendLines(self.log_path, ["after rotation"])
+
+        self.assertEqual(
+            self.waitForLines(subscriber, 3, timeout=5),
+            ["before rotation", "written to rotated file", "after rotation"],
+        )
+
+    def stopConsumer(self):
+        assert self.consumer is not None
+        self.consumer.stop()
+        self.consumer._thread.join()
+        self.consumer = None
+
+    @unittest.skipUnless(InotifyWatcher.is_supported(), "Requires inotify")
+    def testInotifyContinuesAfterRestart(self):
+        state_dir = Path(self.temp_dir.name) / "state"
+        subscriber = self.startConsumer("inotify", state_dir)
+        self.appendLines(self.log_path, ["before restart"])
+        self.waitForLines(subscriber, 1, timeout=5)
+        self.stopConsumer()
+
+        self.appendLines(self.log_path, ["while stopped"])
+        subscriber = self.startConsumer("inotify", state_dir)
+        self.appendLines(self.log_path, ["after restart"])
+
+        self.assertEqual(self.waitForLines(subscriber, 2, timeout=5), ["while stopped", "after restart"])
+
+    @unittest.skipUnless(InotifyWatcher.is_supported(), "Requires inotify")
+    def testInotifyFingerprintsFileOnce(self):
+        subscriber = self.startConsumer("inotify", Path(self.temp_dir.name) / "state")
+        self.appendLines(self.log_path, [f"line {i}" for i in range(20)])
+        self.waitForLines(subscriber, 20, timeout=5)
+        assert self.consumer is not None and self.consumer._checkpoint is not None
+        fingerprint = self.consumer._checkpoint.fingerprint
+
+        # Only the offset is updated once the head of the file is fingerprinted
+        with open(self.log_path, "r+b") as f:
+            f.write(b"X")
+        self.appendLines(self.log_path, ["line 20"])
+        self.waitForLines(subscriber, 21, timeout=5)
+
+        self.assertEqual(self.consumer._checkpoint.fingerprint, fingerprint)
+        self.assertEqual(self.consumer._checkpoint.offset, self.log_path.stat().st_size)
+
+    @unittest.skipUnless(InotifyWatcher.is_supported(), "Requires inotify")
+    def testInotifyWithoutStateDirNeedsNoOffsetFile(self):
+        self.startConsumer("inotify")
+        assert self.consumer is not None
+
+        self.assertIsNone(self.consumer._offset_path)
+
+    @unittest.skipUnless(InotifyWatcher.is_supported(), "Requires inotify")
+    def testInotifyCatchesUpAfterRestart(self):
+        state_dir = Path(self.temp_dir.name) / "state"
+        subscriber = self.startConsumer("inotify", state_dir)
+        self.appendLines(self.log_path, ["before restart"])
+        self.waitForLines(subscriber, 1, timeout=5)
+        self.stopConsumer()
+
+        self.appendLines(self.log_path, [f"backlog {i}" for i in range(1000)])
+        catching_up: List[bool] = []
+        subscriber = CollectingSubscriber()
+        self.consumer = FileLogConsumer(self.log_path, watch_mode="inotify", state_dir=state_dir)
+        self.consumer.subscribe(subscriber)
+        subscriber.consume_logs = lambda records: catching_up.append(self.consumer.is_catching_up)  # type: ignore
+        deadline = monotonic() + 5
+        while (not catching_up or self.consumer.is_catching_up) and monotonic() < deadline:
+            sleep(0.05)
+
+        self.assertTrue(all(catching_up))
+        self.assertFalse(self.consumer.is_catching_up)
+        self.assertEqual(self.consumer.lag_bytes, 0)
+
+        batches = len(catching_up)
+        self.appendLines(self.log_path, ["live"])
+        while len(catching_up) == batches and monotonic() < deadline:
+            sleep(0.05)
+        self.assertEqual(catching_up[batches:], [False])
+
+    @unittest.skipUnless(InotifyWatcher.is_supported(), "Requires inotify")
+    def testInotifyDrainsFileRotatedWhileStopped(self):
+        state_dir = Path(self.temp_dir.name) / "state"
+        subscriber = self.startConsumer("inotify", state_dir)
+        self.appendLines(self.log_path, ["before restart"])
+        self.waitForLines(subscriber, 1, timeout=5)
+        self.stopConsumer()
+
+        self.appendLines(self.log_path, ["before rotation"])
+        os.rename(self.log_path, self.log_path.with_name("debug.log.1"))
+        self.appendLines(self.log_path, ["after rotation"])
+        subscriber = self.startConsumer("inotify", state_dir)
+
+        self.assertEqual(self.waitForLines(subscriber, 2, timeout=5), ["before rotation", "after rotation"])
+
+    def testPollingDeliversNewLines(self):
+        subscriber = self.startConsumer("polling")
+        self.appendLines(self.log_path, ["line 1", "line 2"])
+
+        self.assertEqual(self.waitForLines(subscriber, 2, timeout=5), ["line 1", "line 2"])
+        self.assertEqual(len(subscriber.batches), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
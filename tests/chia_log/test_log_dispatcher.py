@@ -0,0 +1,45 @@
+# std
+import unittest
+
+# project
+from src.chia_log.log_dispatcher import LogDispatcher
+from src.chia_log.log_record import parse_log_records
+
+
+class TestLogDispatcher(unittest.TestCase):
+    def setUp(self) -> None:
+        self.dispatcher: LogDispatcher[str] = LogDispatcher()
+        self.dispatcher.register("harvester", [("harvester", "harvester.harvester")])
+        self.dispatcher.register(
+            "wallet", [("wallet", "wallet.wallet_state_manager"), ("wallet", "wallet.wallet_node")]
+        )
+        self.dispatcher.register("full_node", [("full_node", "full_node.full_node")])
+
+    def testRoutesByServiceAndModule(self):
+        records = parse_log_records(
+            "2023-02-05T17:29:29.434 harvester chia.harvester.harvester: INFO     harvester line\n"
+            "2023-02-05T17:29:29.434 my-host.lan harvester chia.harvester.harvester: INFO     with hostname\n"
+            "10:39:36.535 harvester src.harvester.harvester : INFO     old format\n"
+            "2023-02-05T17:29:29.434+02:00 full_node chia.full_node.full_node: INFO     full node line\n"
+            "2023-02-05T17:29:29.434 full_node chia.full_node.mempool_manager: INFO     other module\n"
+            "2023-02-05T17:29:29.434 daemon chia.daemon.server: INFO     other service\n"
+        )
+        routed = self.dispatcher.dispatch(records)
+
+        self.assertEqual(set(routed.keys()), {"harvester", "full_node"})
+        self.assertEqual(
+            [record.message for record in routed["harvester"]], ["harvester line", "with hostname", "old format"]
+        )
+        self.assertEqual([record.message for record in routed["full_node"]], ["full node line"])
+
+    def testMultipleRegistrations(self):
+        self.dispatcher.register("all_wallet", [("wallet", "wallet.wallet_node")])
+        self.dispatcher.register("all_wallet", [("wallet", "wallet.wallet_node")])
+        records = parse_log_records("15:37:11.668 wallet chia.wallet.wallet_node    : INFO     request coin: x\n")
+        routed = self.dispatcher.dispatch(records)
+
+        self.assertEqual(routed, {"wallet": records, "all_wallet": records})
+
+
+if __name__ == "__main__":
+    unittest.main()
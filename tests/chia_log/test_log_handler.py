@@ -0,0 +1,99 @@
+# std
+import unittest
+from pathlib import Path
+from typing import List
+
+# lib
+import confuse
+
+# project
+from src.chia_log.log_consumer import LogConsumer
+from src.chia_log.log_handler import LogHandler
+from src.chia_log.log_record import LogRecord, parse_log_records
+from src.notifier import Event, EventType
+
+
+class DummyLogConsumer(LogConsumer):
+    def stop(self):
+        pass
+
+    def push(self, logs: str):
+        self._notify_subscribers(logs)
+
+    def push_records(self, records: List[LogRecord]):
+        for subscriber in self._subscribers:
+            subscriber.consume_logs(records)
+
+
+class DummyNotifyManager:
+    def __init__(self):
+        self.calls: List[List[Event]] = []
+
+    def process_events(self, events: List[Event]):
+        self.calls.append(events)
+
+
+class TestLogHandler(unittest.TestCase):
+    def setUp(self) -> None:
+        config_dir = Path(__file__).resolve().parents[2]
+        self.config = confuse.Configuration("chiadog", __name__)
+        self.config.set_file(config_dir / "src/default_config.yaml")
+        self.example_logs_path = Path(__file__).resolve().parent / "logs"
+
+        self.log_consumer = DummyLogConsumer()
+        self.notify_manager = DummyNotifyManager()
+        LogHandler(
+            config=self.config,
+            log_consumer=self.log_consumer,
+            notify_manager=self.notify_manager,  # type: ignore
+        )
+
+    def tearDown(self) -> None:
+        self.config.clear()
+
+    def testProcessesBatchOnce(self):
+        with open(self.example_logs_path / "harvester_activity/nominal.txt", encoding="UTF-8") as f:
+            harvester_logs = f.read()
+        with open(self.example_logs_path / "wallet_peak/nominal.txt", encoding="UTF-8") as f:
+            wallet_logs = f.read()
+
+        self.log_consumer.push(harvester_logs + wallet_logs)
+
+        self.assertEqual(len(self.notify_manager.calls), 1)
+        keep_alive_services = {
+            event.service for event in self.notify_manager.calls[0] if event.type == EventType.KEEPALIVE
+        }
+        self.assertEqual(len(keep_alive_services), 2)
+
+    def testKeepsStatePerSource(self):
+        with open(self.example_logs_path / "harvester_activity/nominal.txt", encoding="UTF-8") as f:
+            logs = f.read()
+
+        # Farming events of two harvesters an hour apart - not a gap for either of them
+        harvester_1_records = parse_log_records(logs)
+        harvester_2_records = parse_log_records(logs.replace("10:", "11:"))
+        for source, records in [("harvester-1", harvester_1_records), ("harvester-2", harvester_2_records)]:
+            for record in records:
+                record.source = source
+        self.log_consumer.push_records(harvester_1_records + harvester_2_records)
+
+        events = self.notify_manager.calls[0]
+        self.assertNotIn(EventType.USER, [event.type for event in events])
+        self.assertEqual({event.source for event in events}, {"harvester-1", "harvester-2"})
+
+    def testSuppressesRealtimeEventsWhileCatchingUp(self):
+        with open(self.example_logs_path / "harvester_activity/lost_sync_temporary.txt", encoding="UTF-8") as f:
+            logs = f.read()
+
+        self.log_consumer._is_catching_up = True
+        self.log_consumer.push(logs)
+        self.log_consumer._is_catching_up = False
+        self.log_consumer.push(logs)
+
+        catch_up_events, live_events = self.notify_manager.calls
+        self.assertNotIn(EventType.USER, [event.type for event in catch_up_events])
+        self.assertIn(EventType.USER, [event.type for event in live_events])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+# std
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# project
+from src.chia_log.log_record import parse_log_records
+
+
+class TestParseLogRecords(unittest.TestCase):
+    def setUp(self) -> None:
+        self.example_logs_path = Path(__file__).resolve().parent / "logs"
+
+    def testPrefixFields(self):
+        records = parse_log_records(
+            "2023-02-05T17:29:29.434+02:00 my-host.lan harvester chia.harvester.harvester: "
+            "INFO     1 plots were eligible\n"
+            "10:39:36.535 harvester src.harvester.harvester : WARNING  old format\n"
+        )
+
+        self.assertEqual(len(records), 2)
+        self.assertEqual(records[0].timestamp.utcoffset(), timedelta(hours=2))
+        self.assertEqual(records[0].timestamp.replace(tzinfo=None), datetime(2023, 2, 5, 17, 29, 29, 434000))
+        self.assertEqual(records[0].hostname, "my-host.lan")
+        self.assertEqual(records[0].service, "harvester")
+        self.assertEqual(records[0].module, "harvester.harvester")
+        self.assertEqual(records[0].level, "INFO")
+        self.assertEqual(records[0].message, "1 plots were eligible")
+
+        self.assertIsNone(records[1].hostname)
+        self.assertEqual(records[1].module, "harvester.harvester")
+        self.assertEqual(records[1].level, "WARNING")
+        self.assertEqual(records[1].message, "old format")
+
+    def testMultiLineMessages(self):
+        with open(self.example_logs_path / "wallet_added_coin/nominal-after-1.4.0.txt", encoding="UTF-8") as f:
+            logs = f.read()
+        records = parse_log_records(logs)
+
+        self.assertEqual(len(records), 2)
+        self.assertEqual(records[0].message.count("\n"), 2)
+        self.assertTrue(records[1].message.endswith("} at 424242"))
+        self.assertTrue(records[0].message.startswith("Adding record to state manager coin: {'amount': 250000000000,"))
+
+    def testSkipsDebugAndGarbage(self):
+        records = parse_log_records(
+            "garbage\n"
+            "2023-02-05T17:29:29.434 harvester chia.harvester.harvester: DEBUG    debug line\n"
+            " continuation of debug line\n"
+            "2023-02-05T17:29:29.434 harvester chia.harvester.harvester: INFO     info line\r\n"
+        )
+
+        self.assertEqual([record.message for record in records], ["info line"])
+
+    def testByteOffsets(self):
+        first = "2023-02-05T17:29:29.434 full_node chia.full_node.full_node: INFO     ⏲️  Finished signage point 1/64\n"
+        second = (
+            "2023-02-05T17:29:30.434 full_node chia.full_node.full_node: INFO     ⏲️  Finished signage point 2/64\n"
+        )
+        records = parse_log_records(first + second, offset=100)
+
+        self.assertEqual(records[0].offset, 100)
+        self.assertEqual(records[1].offset, 100 + len(first.encode("utf-8")))
+        self.assertIsNone(parse_log_records(first)[0].offset)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+# std
+import tempfile
+import unittest
+from pathlib import Path
+
+# project
+from src.chia_log.mmap_log_reader import MmapLogReader
+
+HARVESTER_LINE = (
+    "2023-02-05T17:29:29.434 harvester chia.harvester.harvester: INFO     1 plots were eligible for farming "
+    "e25et6cb36... Found 0 proofs. Time: 0.55515 s. Total 42 plots\n"
+)
+WALLET_LINES = (
+    "2023-02-05T17:29:30.434 wallet chia.wallet.wallet_state_manager: INFO     Adding coin: {\n"
+    "    'amount': 250000000000,\n"
+    "}\n"
+)
+OTHER_LINES = [
+    "2023-02-05T17:29:29.434 full_node chia.full_node.full_node: INFO     🌱 Updated peak to height 42\n",
+    "2023-02-05T17:29:29.434 harvester chia.harvester.harvester: DEBUG    Looking up qualities\n",
+    "2023-02-05T17:29:29.434 farmer chia.farmer.farmer_server: INFO     harvester chia.harvester.harvester: INFO\n",
+]
+
+
+class TestMmapLogReader(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.log_path = Path(self.temp_dir.name) / "debug.log.1"
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def testChunksContainCompleteLines(self):
+        logs = "".join(f"line {i}\n" for i in range(100)) + "no newline"
+        self.log_path.write_text(logs)
+
+        with MmapLogReader(self.log_path) as reader:
+            reader.chunk_size = 64
+            chunks = [bytes(chunk) for chunk in reader.chunks()]
+
+        self.assertGreater(len(chunks), 1)
+        self.assertTrue(all(len(chunk) <= 64 and chunk.endswith(b"\n") for chunk in chunks[:-1]))
+        self.assertEqual(b"".join(chunks), logs.encode())
+
+    def testEmptyFile(self):
+        self.log_path.write_text("")
+        with MmapLogReader(self.log_path) as reader:
+            self.assertEqual(list(reader.chunks()), [])
+            self.assertEqual(list(reader.lines([("harvester", "harvester.harvester")])), [])
+
+    def testLinesOfEnabledLoggers(self):
+        self.log_path.write_text(
+            "".join(OTHER_LINES) + HARVESTER_LINE + WALLET_LINES + "".join(OTHER_LINES) + HARVESTER_LINE.strip()
+        )
+
+        with MmapLogReader(self.log_path) as reader:
+            harvester_logs = "".join(reader.lines([("harvester", "harvester.harvester")]))
+            wallet_logs = "".join(reader.lines([("wallet", "wallet.wallet_state_manager")]))
+            all_logs = "".join(reader.lines())
+
+        self.assertEqual(harvester_logs, HARVESTER_LINE * 2)
+        self.assertEqual(wallet_logs, WALLET_LINES)
+        self.assertEqual(all_logs, self.log_path.read_text())
+
+    def testNoLinesWithoutLoggers(self):
+        # Without any logger to look for, the regex would come down to " : " and match this continuation line
+        self.log_path.write_text("".join(OTHER_LINES) + WALLET_LINES + "farmer_reward : 0\n")
+
+        with MmapLogReader(self.log_path) as reader:
+            self.assertEqual(list(reader.lines([])), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,165 @@
+# std
+import threading
+import time
+import unittest
+from datetime import datetime
+from typing import List
+
+# project
+from src.chia_log.log_consumer import LogConsumer, LogConsumerSubscriber
+from src.chia_log.log_record import LogRecord
+from src.chia_log.queued_log_consumer import QueuedLogConsumer
+
+
+class DummyLogConsumer(LogConsumer):
+    def __init__(self):
+        super().__init__()
+        self.is_stopped = False
+
+    def stop(self):
+        self.is_stopped = True
+
+    def push(self, message: str, is_catching_up: bool = False):
+        self._is_catching_up = is_catching_up
+        record = LogRecord(datetime.now(), None, "harvester", "harvester_server", "INFO", message)
+        for subscriber in self._subscribers:
+            subscriber.consume_logs([record])
+
+
+class BlockingSubscriber(LogConsumerSubscriber):
+    """Records what it gets, but only once released"""
+
+    def __init__(self, consumer: LogConsumer):
+        self.consumer = consumer
+        self.released = threading.Event()
+        self.received = threading.Semaphore(0)
+        self.messages: List[str] = []
+        self.catching_up: List[bool] = []
+        self.threads: List[threading.Thread] = []
+
+    def consume_logs(self, records: List[LogRecord]):
+        self.released.wait()
+        self.messages.extend(record.message for record in records)
+        self.catching_up.append(self.consumer.is_catching_up)
+        self.threads.append(threading.current_thread())
+        self.received.release()
+
+    def wait_for(self, count: int) -> bool:
+        return all(self.received.acquire(timeout=5) for _ in range(count))
+
+
+class FailingSubscriber(LogConsumerSubscriber):
+    def consume_logs(self, records: List[LogRecord]):
+        raise ValueError("Handler failed")
+
+
+class TestQueuedLogConsumer(unittest.TestCase):
+    def setUp(self) -> None:
+        self.log_consumer = DummyLogConsumer()
+
+    def makeQueue(self, **kwargs) -> QueuedLogConsumer:
+        queue = QueuedLogConsumer(self.log_consumer, **kwargs)
+        self.addCleanup(queue.stop)
+        return queue
+
+    def testDeliversOnWorkerThread(self):
+        queue = self.makeQueue()
+        subscriber = BlockingSubscriber(queue)
+        queue.subscribe(subscriber)
+
+        # Reading doesn't wait for the handlers
+        for i in range(3):
+            self.log_consumer.push(f"message {i}")
+        self.assertEqual(queue.stats().enqueued, 3)
+
+        subscriber.released.set()
+        self.assertTrue(subscriber.wait_for(3))
+        self.assertEqual(subscriber.messages, ["message 0", "message 1", "message 2"])
+        self.assertNotIn(threading.current_thread(), subscriber.threads)
+
+    def testKeepsDeliveringAfterSubscriberFailed(self):
+        queue = self.makeQueue(max_batches=1)
+        subscriber = BlockingSubscriber(queue)
+        subscriber.released.set()
+        queue.subscribe(FailingSubscriber())
+        queue.subscribe(subscriber)
+
+        with self.assertLogs(level="ERROR"):
+            for i in range(3):
+                self.log_consumer.push(f"message {i}")
+            self.assertTrue(subscriber.wait_for(3))
+
+        self.assertEqual(subscriber.messages, ["message 0", "message 1", "message 2"])
+
+    def testBlocksWhenFull(self):
+        queue = self.makeQueue(max_batches=2)
+        subscriber = BlockingSubscriber(queue)
+        queue.subscribe(subscriber)
+
+        pushed = threading.Event()
+
+        def push_all():
+            for i in range(4):
+                self.log_consumer.push(f"message {i}")
+            pushed.set()
+
+        reader = threading.Thread(target=push_all)
+        reader.start()
+        # One batch is being delivered, two are queued and the last one waits
+        self.assertFalse(pushed.wait(0.2))
+
+        subscriber.released.set()
+        self.assertTrue(pushed.wait(5))
+        reader.join()
+        self.assertTrue(subscriber.wait_for(4))
+
+        stats = queue.stats()
+        self.assertEqual(subscriber.messages, [f"message {i}" for i in range(4)])
+        self.assertEqual(stats.dropped, 0)
+        self.assertEqual(stats.max_depth, 2)
+        self.assertEqual((stats.enqueued, stats.dequeued), (4, 4))
+
+    def testDropsOldestWhenFull(self):
+        queue = self.makeQueue(max_batches=2, drop_oldest=True)
+        subscriber = BlockingSubscriber(queue)
+        queue.subscribe(subscriber)
+
+        self.log_consumer.push("message 0")
+        # Wait until the worker took the first batch
+        while queue.stats().depth:
+            time.sleep(0.01)
+        for i in range(1, 5):
+            self.log_consumer.push(f"message {i}")
+
+        subscriber.released.set()
+        self.assertTrue(subscriber.wait_for(3))
+
+        stats = queue.stats()
+        self.assertEqual(subscriber.messages, ["message 0", "message 3", "message 4"])
+        self.assertEqual(stats.dropped, 2)
+        self.assertEqual(stats.enqueued, 5)
+
+    def testCarriesCatchingUpPerBatch(self):
+        queue = self.makeQueue()
+        subscriber = BlockingSubscriber(queue)
+        queue.subscribe(subscriber)
+
+        self.log_consumer.push("historical", is_catching_up=True)
+        self.log_consumer.push("live", is_catching_up=False)
+        subscriber.released.set()
+        self.assertTrue(subscriber.wait_for(2))
+
+        self.assertEqual(subscriber.catching_up, [True, False])
+
+    def testStopsWrappedConsumer(self):
+        queue = QueuedLogConsumer(self.log_consumer)
+        queue.subscribe(BlockingSubscriber(queue))
+        queue.stop()
+
+        self.assertTrue(self.log_consumer.is_stopped)
+        self.log_consumer.push("after stop")
+        self.assertEqual(queue.stats().enqueued, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
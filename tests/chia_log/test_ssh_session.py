@@ -0,0 +1,43 @@
+# std
+import unittest
+
+# lib
+import paramiko
+
+# project
+from src.chia_log.ssh_session import SshSession, SshSessionManager, SshSessionState
+
+
+class UnreachableSshSession(SshSession):
+    def _create_client(self) -> paramiko.client.SSHClient:
+        raise OSError("No route to host")
+
+
+class TestSshSession(unittest.TestCase):
+    def testBackoffGrowsWithFailures(self):
+        session = UnreachableSshSession("harvester", "chia", 22)
+        delays = []
+        for _ in range(12):
+            with self.assertRaises(OSError):
+                session.connect()
+            delays.append(session.backoff_seconds())
+
+        self.assertEqual(session.state, SshSessionState.DISCONNECTED)
+        self.assertEqual(session.reconnect_count, 0)
+        # Jittered between half and the full exponential delay, capped at the maximum
+        for failures, delay in enumerate(delays, start=1):
+            expected = min(SshSession.max_backoff_seconds, SshSession.min_backoff_seconds * 2 ** (failures - 1))
+            self.assertGreaterEqual(delay, expected / 2)
+            self.assertLessEqual(delay, expected)
+
+    def testManagerSharesSessionsPerHost(self):
+        manager = SshSessionManager()
+        session = manager.session("harvester", "chia", 22)
+
+        self.assertIs(manager.session("harvester", "chia", 22), session)
+        self.assertIsNot(manager.session("harvester-2", "chia", 22), session)
+        self.assertEqual(len(manager.sessions), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
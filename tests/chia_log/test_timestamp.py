@@ -0,0 +1,49 @@
+# std
+import unittest
+from datetime import date, datetime, timedelta, timezone
+
+# lib
+from dateutil import parser as dateutil_parser
+
+# project
+from src.chia_log.timestamp import parse_timestamp
+
+
+class TestParseTimestamp(unittest.TestCase):
+    def testMatchesDateutil(self):
+        for value in [
+            "2023-02-05T17:29:29.434",
+            "2023-02-05T17:29:29.434+02:00",
+            "2023-02-05T17:29:29.434-05:30",
+            "2023-02-05T17:29:29.434000",
+            "2023-02-05T17:29:29",
+            "17:29:29.434",
+            # Not produced by chia, handled by the dateutil fallback
+            "2023-02-05 17:29:29.434",
+            "2023-02-05T17:29:29.4Z",
+        ]:
+            self.assertEqual(parse_timestamp(value), dateutil_parser.parse(value), value)
+
+    def testTimezoneAwareness(self):
+        naive = parse_timestamp("2023-02-05T17:29:29.434")
+        self.assertIsNone(naive.tzinfo)
+
+        aware = parse_timestamp("2023-02-05T17:29:29.434+02:00")
+        self.assertEqual(aware.utcoffset(), timedelta(hours=2))
+        self.assertEqual(aware, datetime(2023, 2, 5, 15, 29, 29, 434000, tzinfo=timezone.utc))
+
+    def testTimeOnlyIsToday(self):
+        self.assertEqual(
+            parse_timestamp("10:39:36.535"),
+            datetime.combine(date.today(), datetime.min.time()).replace(
+                hour=10, minute=39, second=36, microsecond=535000
+            ),
+        )
+
+    def testInvalid(self):
+        with self.assertRaises(ValueError):
+            parse_timestamp("")
+
+
+if __name__ == "__main__":
+    unittest.main()
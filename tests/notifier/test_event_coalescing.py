@@ -0,0 +1,56 @@
+# std
+import unittest
+
+# project
+from src.notifier import Event, EventPriority, EventService, EventType
+from src.notifier.event_coalescing import coalesce_events, digest_events
+from .dummy_events import DummyEvents
+
+
+class TestEventCoalescing(unittest.TestCase):
+    def testJoinsSimilarEvents(self):
+        events = (
+            DummyEvents.get_low_priority_events()
+            + DummyEvents.get_high_priority_events()
+            + DummyEvents.get_low_priority_events()
+        )
+
+        coalesced = coalesce_events(events)
+        self.assertEqual([event.priority.name for event in coalesced], ["LOW", "HIGH"])
+        self.assertEqual(
+            coalesced[0].message.splitlines(), [event.message for event in events if event.priority.name == "LOW"]
+        )
+
+    def testSplitsLongMessages(self):
+        events = DummyEvents.get_low_priority_events() * 3
+        max_length = len(events[0].message) * 2 + 1
+
+        coalesced = coalesce_events(events, max_message_length=max_length)
+        self.assertEqual(len(coalesced), 3)
+        self.assertTrue(all(len(event.message) <= max_length for event in coalesced))
+        self.assertEqual("\n".join(event.message for event in coalesced), "\n".join(e.message for e in events))
+
+    def testDigestsSimilarMessages(self):
+        messages = [
+            "Seeking plots took too long: 12.5 seconds!",
+            "Seeking plots took too long: 31.25 seconds!",
+            "Experiencing networking issues? Skipped 5 signage points!",
+            "Seeking plots took too long: 7.0 seconds!",
+        ]
+        events = [Event(EventType.USER, EventPriority.NORMAL, EventService.HARVESTER, message) for message in messages]
+        events += DummyEvents.get_high_priority_events()
+
+        digested = digest_events(events)
+        self.assertEqual(len(digested), 2)
+        self.assertEqual(
+            digested[0].message.splitlines(),
+            [
+                "Seeking plots took too long: 7.0 to 31.25 seconds! (3 times)",
+                "Experiencing networking issues? Skipped 5 signage points!",
+            ],
+        )
+        self.assertEqual(digested[1], DummyEvents.get_high_priority_events()[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
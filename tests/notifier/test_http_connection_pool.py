@@ -0,0 +1,100 @@
+# std
+import threading
+import time
+import unittest
+from http.client import HTTPMessage
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List
+
+# project
+from src.notifier.http_connection_pool import HttpConnectionPool, HttpResponse
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Connections (client ports) requests arrived on
+    connections: List[int] = []
+    # Close the connection without announcing it, like a server side idle timeout
+    close_after_response = False
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.connections.append(self.client_address[1])
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.close_connection = self.close_after_response
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestHttpConnectionPool(unittest.TestCase):
+    def setUp(self) -> None:
+        KeepAliveHandler.connections = []
+        KeepAliveHandler.close_after_response = False
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/messages"
+        self.pool = HttpConnectionPool(timeout_seconds=5)
+
+    def tearDown(self) -> None:
+        self.pool.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def testReusesConnection(self):
+        for i in range(5):
+            response = self.pool.request("POST", self.url, f"message {i}")
+            self.assertEqual(response.status, 200)
+            self.assertEqual(response.body, f"message {i}".encode())
+
+        self.assertEqual(self.pool.connections_opened, 1)
+        self.assertEqual(self.pool.requests_sent, 5)
+        self.assertEqual(len(set(KeepAliveHandler.connections)), 1)
+
+    def testDetectsConnectionClosedByServer(self):
+        KeepAliveHandler.close_after_response = True
+        self.pool.request("POST", self.url, "first")
+        time.sleep(0.1)
+        response = self.pool.request("POST", self.url, "second")
+
+        self.assertEqual(response.body, b"second")
+        self.assertEqual(self.pool.connections_opened, 2)
+
+    def testRetriesWhenReusedConnectionFails(self):
+        # Closed by the server just as the request goes out, too late to notice beforehand
+        self.pool._is_dropped = lambda conn: False  # type: ignore
+        KeepAliveHandler.close_after_response = True
+        self.pool.request("POST", self.url, "first")
+        time.sleep(0.1)
+        response = self.pool.request("POST", self.url, "second")
+
+        self.assertEqual(response.body, b"second")
+        self.assertEqual(self.pool.connections_opened, 2)
+
+    def testDropsConnectionsIdleForTooLong(self):
+        self.pool.idle_timeout_seconds = 0
+        self.pool.request("POST", self.url, "first")
+        self.pool.request("POST", self.url, "second")
+
+        self.assertEqual(self.pool.connections_opened, 2)
+
+    def testParsesRetryAfter(self):
+        headers = HTTPMessage()
+        headers["Retry-After"] = "7"
+        self.assertEqual(HttpResponse(status=429, headers=headers, body=b"").retry_after_seconds(), 7)
+
+        body = b'{"ok": false, "error_code": 429, "parameters": {"retry_after": 12}}'
+        self.assertEqual(HttpResponse(status=429, headers=HTTPMessage(), body=body).retry_after_seconds(), 12)
+        self.assertIsNone(HttpResponse(status=429, headers=HTTPMessage(), body=b"Too many").retry_after_seconds())
+
+    def testRejectsOtherSchemes(self):
+        with self.assertRaises(ValueError):
+            self.pool.request("POST", "ftp://127.0.0.1/messages", "message")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -101,3 +101,35 @@ class TestKeepAliveMonitor(unittest.TestCase):
 
         # Check that high priority event did not fire before keep-alive signal stopped
         self.assertGreater(seconds_elapsed, 2 * self.threshold_seconds - 1)
+
+    def testSources(self):
+        self.config.set(
+            {"keep_alive_monitor": {"enable_remote_ping": False, "notify_threshold_seconds": {"HARVESTER": 1}}}
+        )
+        sources = {"full-node": None, "harvester-1": ["HARVESTER"], "harvester-2": ["HARVESTER"]}
+        keep_alive_monitor = KeepAliveMonitor(self.config, sources=sources)
+        received_events: List[Event] = []
+        keep_alive_monitor.set_notify_manager(DummyNotifyManager(received_events.extend))
+
+        keep_alive_events = [
+            Event(
+                type=EventType.KEEPALIVE,
+                priority=EventPriority.NORMAL,
+                service=EventService.HARVESTER,
+                message="",
+                source=source,
+            )
+            for source in ["full-node", "harvester-1"]
+        ]
+        # Past the WALLET threshold, which none of the sources sends keep-alive events for
+        for _ in range(25):
+            keep_alive_monitor.process_events(keep_alive_events)
+            sleep(0.2)
+        keep_alive_monitor.stop()
+
+        # Only harvester-2 is expected to run a harvester and never sent a keep-alive event
+        self.assertGreater(len(received_events), 0)
+        self.assertEqual(
+            {(event.source, event.service) for event in received_events}, {("harvester-2", EventService.HARVESTER)}
+        )
+        self.assertIn("HARVESTER (harvester-2) is unhealthy", received_events[0].message)
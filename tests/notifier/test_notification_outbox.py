@@ -0,0 +1,85 @@
+# std
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+# project
+from src.notifier.notification_outbox import NotificationOutbox, deserialize_event, serialize_event
+from .dummy_events import DummyEvents
+
+
+class TestNotificationOutbox(unittest.TestCase):
+    def setUp(self) -> None:
+        self.state_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.state_dir.name) / "pushover.outbox.sqlite"
+
+    def tearDown(self) -> None:
+        self.state_dir.cleanup()
+
+    def makeOutbox(self, **kwargs) -> NotificationOutbox:
+        outbox = NotificationOutbox(self.path, **kwargs)
+        outbox.min_backoff_seconds = 0
+        self.addCleanup(outbox.close)
+        return outbox
+
+    def testSerializesEvents(self):
+        event = DummyEvents.get_high_priority_events()[0]
+        event.source = "harvester-1"
+
+        self.assertEqual(deserialize_event(serialize_event(event)), event)
+
+    def testSurvivesRestart(self):
+        events = DummyEvents.get_low_priority_events()
+        self.makeOutbox().add(events)
+
+        outbox = self.makeOutbox()
+        self.assertEqual(len(outbox), 2)
+        self.assertEqual([entry.event for entry in outbox.due()], events)
+
+    def testDeduplicatesPendingEvents(self):
+        outbox = self.makeOutbox()
+        outbox.add(DummyEvents.get_normal_priority_events())
+        outbox.add(DummyEvents.get_normal_priority_events())
+
+        self.assertEqual(len(outbox), 1)
+
+    def testHighPriorityFirst(self):
+        outbox = self.makeOutbox()
+        outbox.add(DummyEvents.get_low_priority_events() + DummyEvents.get_high_priority_events())
+
+        priorities = [entry.event.priority.name for entry in outbox.due()]
+        self.assertEqual(priorities, ["HIGH", "LOW", "LOW"])
+
+    def testPostponesWithBackoff(self):
+        outbox = self.makeOutbox()
+        outbox.min_backoff_seconds = 60
+        outbox.add(DummyEvents.get_normal_priority_events())
+        remaining = outbox.seconds_until_due()
+        assert remaining is not None
+        self.assertGreater(remaining, 20)
+        self.assertEqual(outbox.due(), [])
+
+    def testRemovesSentEvents(self):
+        outbox = self.makeOutbox()
+        outbox.add(DummyEvents.get_normal_priority_events())
+        (entry,) = outbox.due()
+        outbox.postpone([entry])
+        (entry,) = outbox.due()
+        self.assertEqual(entry.attempts, 2)
+
+        outbox.remove(entry)
+        self.assertEqual(len(outbox), 0)
+        self.assertIsNone(outbox.seconds_until_due())
+
+    def testExpiresOldEvents(self):
+        outbox = self.makeOutbox(ttl_seconds=0.05)
+        outbox.add(DummyEvents.get_normal_priority_events())
+        time.sleep(0.1)
+
+        self.assertEqual(outbox.due(), [])
+        self.assertEqual(len(outbox), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+# std
+import unittest
+from typing import List
+
+# lib
+import confuse
+
+# project
+from src.notifier import Event, EventPriority, EventService, EventType, Notifier
+from src.notifier.notification_routing import build_routing_table, parse_routing_rules
+
+
+class DummyNotifier(Notifier):
+    def __init__(self, daily_stats: bool = False, wallet_events: bool = False):
+        config = confuse.Configuration("chiadog", __name__)
+        config.set(
+            {
+                "daily_stats": daily_stats,
+                "wallet_events": wallet_events,
+                "decreasing_plot_events": False,
+                "increasing_plot_events": False,
+            }
+        )
+        super().__init__(title_prefix="Test", config=config)
+
+    def send_events_to_user(self, events: List[Event]) -> bool:
+        return True
+
+
+class TestNotificationRouting(unittest.TestCase):
+    def setUp(self) -> None:
+        self.notifiers = {
+            "pushover": DummyNotifier(),
+            "smtp": DummyNotifier(daily_stats=True),
+            "telegram": DummyNotifier(daily_stats=True, wallet_events=True),
+        }
+
+    def parseRules(self, rules):
+        config = confuse.Configuration("chiadog", __name__)
+        config.set({"notification_routing": rules})
+        return parse_routing_rules(config["notification_routing"])
+
+    def testWithoutRulesByNotifierConfig(self):
+        table = build_routing_table(self.notifiers, [])
+
+        key = (EventType.USER, EventService.HARVESTER, EventPriority.HIGH)
+        self.assertEqual(table[key], ("pushover", "smtp", "telegram"))
+        key = (EventType.DAILY_STATS, EventService.DAILY, EventPriority.LOW)
+        self.assertEqual(table[key], ("smtp", "telegram"))
+        key = (EventType.USER, EventService.WALLET, EventPriority.LOW)
+        self.assertEqual(table[key], ("telegram",))
+
+    def testKeepAliveEventsGoNowhere(self):
+        table = build_routing_table(self.notifiers, [])
+
+        for service in EventService:
+            for priority in EventPriority:
+                self.assertEqual(table[(EventType.KEEPALIVE, service, priority)], ())
+
+    def testFirstMatchingRuleApplies(self):
+        rules = self.parseRules(
+            [
+                {"priorities": ["HIGH"], "notifiers": ["pushover"]},
+                {"types": ["daily_stats"], "notifiers": ["smtp"]},
+                {"services": ["HARVESTER", "FARMER"], "notifiers": ["pushover", "telegram"]},
+            ]
+        )
+        table = build_routing_table(self.notifiers, rules)
+
+        self.assertEqual(table[(EventType.USER, EventService.FULL_NODE, EventPriority.HIGH)], ("pushover",))
+        self.assertEqual(table[(EventType.DAILY_STATS, EventService.DAILY, EventPriority.LOW)], ("smtp",))
+        self.assertEqual(table[(EventType.USER, EventService.FARMER, EventPriority.NORMAL)], ("pushover", "telegram"))
+        self.assertEqual(
+            table[(EventType.USER, EventService.FULL_NODE, EventPriority.NORMAL)], ("pushover", "smtp", "telegram")
+        )
+
+    def testRulesDontOverrideNotifierConfig(self):
+        rules = self.parseRules([{"types": ["DAILY_STATS"], "notifiers": ["pushover"]}])
+        table = build_routing_table(self.notifiers, rules)
+
+        self.assertEqual(table[(EventType.DAILY_STATS, EventService.DAILY, EventPriority.LOW)], ())
+
+    def testIgnoresInvalidRules(self):
+        with self.assertLogs(level="ERROR"):
+            rules = self.parseRules(
+                [
+                    {"priorities": ["URGENT"], "notifiers": ["pushover"]},
+                    {"priorities": ["LOW"], "notifiers": ["smtp"]},
+                ]
+            )
+
+        self.assertEqual(len(rules), 1)
+        self.assertEqual(rules[0].priorities, frozenset([EventPriority.LOW]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,193 @@
+# std
+import threading
+import time
+import unittest
+from typing import List, Optional, Set
+
+# lib
+import confuse
+
+# project
+from src.notifier import Event, Notifier
+from src.notifier.notification_outbox import NotificationOutbox
+from src.notifier.notifier_worker import NotifierWorker
+from src.notifier.rate_limiter import RateLimit, RateLimitedError
+from .dummy_events import DummyEvents
+
+
+class RecordingNotifier(Notifier):
+    """Sends nothing, records what it's given once released"""
+
+    def __init__(self):
+        config = confuse.Configuration("chiadog", __name__)
+        config.set(
+            {
+                "daily_stats": False,
+                "wallet_events": False,
+                "decreasing_plot_events": False,
+                "increasing_plot_events": False,
+            }
+        )
+        super().__init__(title_prefix="Test", config=config)
+        self.released = threading.Event()
+        self.sent = threading.Semaphore(0)
+        self.batches: List[List[Event]] = []
+        self.fail = False
+        self.failing_messages: Set[str] = set()
+        self.rate_limited_once: Optional[float] = None
+
+    def send_events_to_user(self, events: List[Event]) -> bool:
+        self.released.wait()
+        if self.rate_limited_once is not None:
+            retry_after, self.rate_limited_once = self.rate_limited_once, None
+            raise RateLimitedError(retry_after)
+        self.batches.append(events)
+        self.sent.release()
+        if self.fail or any(event.message in self.failing_messages for event in events):
+            raise ConnectionError("Service unavailable")
+        return True
+
+    def wait_for(self, count: int) -> bool:
+        return all(self.sent.acquire(timeout=5) for _ in range(count))
+
+
+class TestNotifierWorker(unittest.TestCase):
+    def setUp(self) -> None:
+        self.notifier = RecordingNotifier()
+        self.worker = NotifierWorker("recording", self.notifier)
+        self.addCleanup(self.worker.stop)
+        self.addCleanup(self.notifier.released.set)
+
+    def testSubmitDoesNotWaitForSending(self):
+        start = time.perf_counter()
+        for _ in range(3):
+            self.worker.submit(DummyEvents.get_normal_priority_events())
+        self.assertLess(time.perf_counter() - start, 1)
+
+        self.notifier.released.set()
+        self.assertTrue(self.notifier.wait_for(3))
+        stats = self.worker.stats()
+        self.assertEqual((stats.backlog, stats.delivered, stats.failed), (0, 3, 0))
+        self.assertIsNotNone(stats.mean_latency_seconds)
+
+    def testHighPrioritySkipsQueue(self):
+        self.worker.submit(DummyEvents.get_low_priority_events())
+        # Wait until the worker is busy sending the first batch
+        while self.worker.backlog:
+            time.sleep(0.01)
+        self.worker.submit(DummyEvents.get_normal_priority_events())
+        self.worker.submit(DummyEvents.get_low_priority_events() + DummyEvents.get_high_priority_events())
+        self.assertEqual(self.worker.backlog, 3)
+
+        self.notifier.released.set()
+        self.assertTrue(self.notifier.wait_for(4))
+        priorities = [batch[0].priority.name for batch in self.notifier.batches]
+        self.assertEqual(priorities, ["LOW", "HIGH", "NORMAL", "LOW"])
+
+    def testCountsFailures(self):
+        self.notifier.fail = True
+        self.notifier.released.set()
+        self.worker.submit(DummyEvents.get_normal_priority_events())
+        self.assertTrue(self.notifier.wait_for(1))
+        self.worker.stop()
+
+        self.assertEqual(self.worker.stats().failed, 1)
+
+    def testRetriesFailedEventsFromOutbox(self):
+        outbox = NotificationOutbox()
+        outbox.min_backoff_seconds = 0.1
+        worker = NotifierWorker("retrying", self.notifier, outbox)
+        self.addCleanup(worker.stop)
+        self.notifier.fail = True
+        self.notifier.released.set()
+
+        worker.submit(DummyEvents.get_low_priority_events())
+        # The first event, the second one is left for later, and a retry of the first one
+        self.assertTrue(self.notifier.wait_for(2))
+        self.notifier.fail = False
+        self.assertTrue(self.notifier.wait_for(2))
+        worker.stop()
+
+        self.assertEqual(len(outbox), 0)
+        self.assertEqual(len(self.notifier.batches[-1]), 1)
+        self.assertEqual(worker.stats().pending_retries, 0)
+
+    def testRetriesOnlyFailedEvents(self):
+        outbox = NotificationOutbox()
+        worker = NotifierWorker("retrying", self.notifier, outbox)
+        self.addCleanup(worker.stop)
+        self.notifier.failing_messages.add("Low priority notification 2.")
+        self.notifier.released.set()
+
+        worker.submit(DummyEvents.get_low_priority_events())
+        self.assertTrue(self.notifier.wait_for(2))
+        worker.stop()
+
+        self.assertEqual([len(batch) for batch in self.notifier.batches], [1, 1])
+        self.assertEqual(len(outbox), 1)
+        stats = worker.stats()
+        self.assertEqual((stats.delivered, stats.failed), (1, 1))
+
+    def testCoalescesEventsWhileThrottled(self):
+        self.notifier.rate_limit = RateLimit(per_minute=600, burst=1)
+        worker = NotifierWorker("limited", self.notifier)
+        self.addCleanup(worker.stop)
+
+        worker.submit(DummyEvents.get_low_priority_events())
+        while worker.backlog:
+            time.sleep(0.01)
+        for _ in range(4):
+            worker.submit(DummyEvents.get_low_priority_events())
+        self.notifier.released.set()
+        # The first batch right away, all others together after waiting for the limit
+        self.assertTrue(self.notifier.wait_for(2))
+        worker.stop()
+
+        self.assertEqual([len(batch) for batch in self.notifier.batches], [1, 1])
+        self.assertEqual(len(self.notifier.batches[1][0].message.splitlines()), 8)
+
+    def testPausesWhenRateLimited(self):
+        self.notifier.rate_limit = RateLimit(per_minute=6000, burst=5)
+        self.notifier.rate_limited_once = 0.3
+        self.notifier.released.set()
+        worker = NotifierWorker("limited", self.notifier)
+        self.addCleanup(worker.stop)
+
+        start = time.perf_counter()
+        worker.submit(DummyEvents.get_normal_priority_events())
+        self.assertTrue(self.notifier.wait_for(1))
+
+        self.assertGreaterEqual(time.perf_counter() - start, 0.3)
+        self.assertEqual(worker.stats().failed, 0)
+
+    def testDigestsEventsWithinWindow(self):
+        self.notifier.digest_window_seconds = 0.3
+        self.notifier.released.set()
+        worker = NotifierWorker("digest", self.notifier)
+        self.addCleanup(worker.stop)
+
+        for _ in range(3):
+            worker.submit(DummyEvents.get_low_priority_events())
+        worker.submit(DummyEvents.get_high_priority_events())
+        # High priority events aren't held back
+        self.assertTrue(self.notifier.wait_for(1))
+        self.assertEqual(self.notifier.batches[0][0].priority.name, "HIGH")
+        self.assertEqual(worker.backlog, 3)
+
+        self.assertTrue(self.notifier.wait_for(1))
+        (digest,) = self.notifier.batches[1]
+        self.assertEqual(digest.message, "Low priority notification 1 to 2. (6 times)")
+
+    def testStopSendsQueuedEvents(self):
+        for _ in range(2):
+            self.worker.submit(DummyEvents.get_normal_priority_events())
+        self.notifier.released.set()
+        self.worker.stop()
+
+        self.assertEqual(len(self.notifier.batches), 2)
+        self.worker.submit(DummyEvents.get_normal_priority_events())
+        self.assertEqual(self.worker.backlog, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
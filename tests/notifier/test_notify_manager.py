@@ -0,0 +1,40 @@
+# std
+import unittest
+from typing import List
+
+# lib
+import confuse
+
+# project
+from src.notifier import Event
+from src.notifier.notify_manager import NotifyManager
+from .dummy_events import DummyEvents
+
+
+class DummyKeepAliveMonitor:
+    def set_notify_manager(self, notify_manager):
+        pass
+
+    def process_events(self, events: List[Event]):
+        pass
+
+
+class TestNotifyManager(unittest.TestCase):
+    def setUp(self) -> None:
+        self.config = confuse.Configuration("chiadog", __name__)
+        self.config.set_file("src/default_config.yaml")
+        self.config.set({"state_dir": None, "notifier": {"script": {"enable": True}}})
+        self.notify_manager = NotifyManager(self.config, DummyKeepAliveMonitor())  # type: ignore
+        self.addCleanup(self.notify_manager.stop)
+
+    def testLogsStatsPeriodically(self):
+        self.notify_manager.stats_interval_seconds = 0
+        with self.assertLogs(level="INFO") as cm:
+            self.notify_manager.process_events(DummyEvents.get_high_priority_events())
+
+        self.assertIn("Notifier script: ", "\n".join(cm.output))
+        self.assertEqual(list(self.notify_manager.stats().keys()), ["script"])
+
+
+if __name__ == "__main__":
+    unittest.main()
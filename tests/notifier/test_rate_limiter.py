@@ -0,0 +1,31 @@
+# std
+import time
+import unittest
+
+# project
+from src.notifier.rate_limiter import RateLimit, TokenBucket
+
+
+class TestTokenBucket(unittest.TestCase):
+    def testAllowsBurstThenRate(self):
+        bucket = TokenBucket(RateLimit(per_minute=600, burst=3))
+
+        self.assertEqual([bucket.try_acquire() for _ in range(4)], [True, True, True, False])
+        self.assertGreater(bucket.seconds_until_available(), 0)
+        self.assertLessEqual(bucket.seconds_until_available(), 0.1)
+        time.sleep(0.11)
+        self.assertTrue(bucket.try_acquire())
+        self.assertFalse(bucket.try_acquire())
+
+    def testPausesAfterRejection(self):
+        bucket = TokenBucket(RateLimit(per_minute=6000, burst=5))
+        bucket.pause(0.2)
+
+        self.assertFalse(bucket.try_acquire())
+        self.assertGreater(bucket.seconds_until_available(), 0.1)
+        time.sleep(0.2)
+        self.assertTrue(bucket.try_acquire())
+
+
+if __name__ == "__main__":
+    unittest.main()
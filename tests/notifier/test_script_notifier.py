@@ -1,5 +1,6 @@
 # std
 import unittest
+from dataclasses import replace
 
 # lib
 import confuse
@@ -38,3 +39,54 @@ class TestScriptNotifier(unittest.TestCase):
     def testHighPriorityNotifications(self):
         success = self.notifier.send_events_to_user(events=DummyEvents.get_high_priority_events())
         self.assertTrue(success)
+
+
+class TestPersistentScriptNotifier(unittest.TestCase):
+    def setUp(self) -> None:
+        self.config = confuse.Configuration("chiadog", __name__)
+        self.config.set(
+            {
+                "enable": True,
+                "daily_stats": True,
+                "wallet_events": True,
+                "decreasing_plot_events": True,
+                "increasing_plot_events": True,
+                "script_path": "tests/persistent_script.py",
+                "mode": "persistent",
+                "event_timeout_seconds": 2,
+            }
+        )
+        self.notifier = ScriptNotifier(
+            title_prefix="Test",
+            config=self.config,
+        )
+        self.addCleanup(self.notifier.close)
+
+    def testKeepsScriptRunning(self):
+        self.assertTrue(self.notifier.send_events_to_user(events=DummyEvents.get_low_priority_events()))
+        process = self.notifier._process
+        self.assertTrue(self.notifier.send_events_to_user(events=DummyEvents.get_high_priority_events()))
+
+        self.assertIs(self.notifier._process, process)
+
+    def testReportsFailedEvents(self):
+        event = DummyEvents.get_normal_priority_events()[0]
+
+        self.assertFalse(self.notifier.send_events_to_user(events=[replace(event, message="fail")]))
+        self.assertTrue(self.notifier.send_events_to_user(events=[event]))
+
+    def testRestartsCrashedScript(self):
+        event = DummyEvents.get_normal_priority_events()[0]
+
+        self.assertFalse(self.notifier.send_events_to_user(events=[replace(event, message="crash")]))
+        self.assertTrue(self.notifier.send_events_to_user(events=[event]))
+
+    def testKillsStuckScript(self):
+        event = DummyEvents.get_normal_priority_events()[0]
+        self.assertFalse(self.notifier.send_events_to_user(events=[replace(event, message="hang")]))
+        process = self.notifier._process
+        assert process is not None
+        self.assertIsNotNone(process.poll())
+
+        self.assertTrue(self.notifier.send_events_to_user(events=[event]))
+        self.assertIsNot(self.notifier._process, process)
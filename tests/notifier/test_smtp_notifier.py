@@ -1,6 +1,12 @@
 # std
+import email
+import email.policy
 import os
+import smtplib
+import socketserver
+import threading
 import unittest
+from typing import List
 
 # lib
 import confuse
@@ -69,3 +75,128 @@ class TestSMTPNotifier(unittest.TestCase):
     def testSTMPHighPriorityNotifications(self):
         success = self.notifier.send_events_to_user(events=DummyEvents.get_high_priority_events())
         self.assertTrue(success)
+
+
+class SMTPStandInHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP to receive mail, without TLS or authentication"""
+
+    def handle(self):
+        server = self.server
+        assert isinstance(server, SMTPStandIn)
+        server.connections += 1
+        self.reply("220 localhost stand-in")
+        while True:
+            line = self.rfile.readline().decode("ascii").strip()
+            if not line:
+                return
+            command = line.split(" ", 1)[0].upper()
+            if command in ("EHLO", "HELO"):
+                self.reply("250 localhost")
+            elif command in ("MAIL", "RCPT", "RSET", "NOOP"):
+                self.reply("250 OK")
+            elif command == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                data = []
+                for data_line in iter(self.rfile.readline, b".\r\n"):
+                    data.append(data_line)
+                server.messages.append(email.message_from_bytes(b"".join(data), policy=email.policy.default))
+                self.reply("250 OK")
+                if server.drop_after_message:
+                    return
+            elif command == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+
+    def reply(self, line: str):
+        self.wfile.write(line.encode("ascii") + b"\r\n")
+
+
+class SMTPStandIn(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), SMTPStandInHandler)
+        self.connections = 0
+        self.messages: List[email.message.EmailMessage] = []
+        # Close the connection without notice, like a server timing out an idle connection
+        self.drop_after_message = False
+
+
+class PlainSMTPNotifier(SMTPNotifier):
+    @staticmethod
+    def _start_tls(server: smtplib.SMTP):
+        pass
+
+
+class TestSMTPNotifierSession(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = SMTPStandIn()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        self.config = confuse.Configuration("chiadog", __name__)
+        self.config.set(
+            {
+                "enable": True,
+                "daily_stats": True,
+                "wallet_events": True,
+                "decreasing_plot_events": True,
+                "increasing_plot_events": True,
+                "credentials": {
+                    "sender": "chia@example.com",
+                    "sender_name": "chiadog",
+                    "recipient": "you@example.com",
+                    "enable_smtp_auth": False,
+                    "username_smtp": None,
+                    "password_smtp": None,
+                    "host": "127.0.0.1",
+                    "port": self.server.server_address[1],
+                },
+            }
+        )
+
+    def makeNotifier(self) -> SMTPNotifier:
+        notifier = PlainSMTPNotifier(title_prefix="Test", config=self.config)
+        self.addCleanup(notifier.close)
+        return notifier
+
+    def testReusesConnection(self):
+        notifier = self.makeNotifier()
+        for _ in range(5):
+            self.assertTrue(notifier.send_events_to_user(DummyEvents.get_low_priority_events()))
+
+        self.assertEqual(len(self.server.messages), 10)
+        self.assertEqual(self.server.connections, 1)
+
+    def testReconnectsAfterServerClosedConnection(self):
+        notifier = self.makeNotifier()
+        self.server.drop_after_message = True
+        self.assertTrue(notifier.send_events_to_user(DummyEvents.get_normal_priority_events()))
+        self.assertTrue(notifier.send_events_to_user(DummyEvents.get_normal_priority_events()))
+
+        self.assertEqual(len(self.server.messages), 2)
+        self.assertEqual(self.server.connections, 2)
+
+    def testReconnectsAfterIdleTimeout(self):
+        notifier = self.makeNotifier()
+        notifier.idle_timeout_seconds = 0
+        self.assertTrue(notifier.send_events_to_user(DummyEvents.get_normal_priority_events()))
+        self.assertTrue(notifier.send_events_to_user(DummyEvents.get_normal_priority_events()))
+
+        self.assertEqual(self.server.connections, 2)
+
+    def testCombinesEventsInOneEmail(self):
+        self.config["combine_events"] = True
+        notifier = self.makeNotifier()
+        events = DummyEvents.get_low_priority_events() + DummyEvents.get_high_priority_events()
+        self.assertTrue(notifier.send_events_to_user(events))
+
+        (message,) = self.server.messages
+        self.assertIn("HARVESTER (+2 more)", message["Subject"])
+        plain_text = message.get_body(("plain",))
+        assert plain_text is not None
+        for event in events:
+            self.assertIn(event.message, plain_text.get_content())
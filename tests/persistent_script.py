@@ -0,0 +1,16 @@
+#!/usr/bin/env python3
+"""Persistent script notifier: acknowledges events read from stdin, one JSON line each"""
+
+# std
+import json
+import sys
+import time
+
+for line in sys.stdin:
+    event = json.loads(line)
+    if "crash" in event["message"]:
+        sys.exit(1)
+    if "hang" in event["message"]:
+        time.sleep(60)
+    print(f"Script notifier received {event['priority']} event: {event['message']}", flush=True)
+    print(json.dumps({"id": event["id"], "ok": "fail" not in event["message"]}), flush=True)